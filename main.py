@@ -16,6 +16,8 @@ TIMER.stop("start_kivy")
 logger.timing(f"Loading Kivy took: {TIMER.get_time('start_kivy')}")
 
 from managers.device.device_manager import DM
+from managers.device.status_page import StatusPage
+from src.utils.background_service import publish_app_state
 from src.utils.wrappers import android_only, log_time
 
 Window.clearcolor = (0.93, 0.93, 0.93, 1.0)
@@ -101,6 +103,7 @@ class TaskApp(App, EventDispatcher):
         super().__init__(**kwargs)        
         self.active_popup = None
         self._need_updates: str | None = None
+        self.in_foreground: bool = False
     
     def build(self):
         """
@@ -160,12 +163,14 @@ class TaskApp(App, EventDispatcher):
     def on_stop(self):
         super().on_stop()
         logger.debug("App is stopping")
+        self._set_app_state(False)
         # from profiler.profiler import profiler
         # profiler.stop()
     
     def on_pause(self):
         super().on_pause()
         logger.debug("App is pausing")
+        self._set_app_state(False)
         return True
     
     def on_start(self):
@@ -174,6 +179,8 @@ class TaskApp(App, EventDispatcher):
         """
         super().on_start()
         logger.info("App is starting")
+        self._set_app_state(True)
+        Clock.schedule_interval(self._refresh_app_state, StatusPage.APP_REFRESH_INTERVAL)
         Clock.schedule_once(self.load_app, 0.1)
 
     def on_resume(self):
@@ -182,6 +189,7 @@ class TaskApp(App, EventDispatcher):
         """
         super().on_resume()
         logger.debug("App is resuming")
+        self._set_app_state(True)
 
         self.audio_manager.stop_alarm()
         self.communication_manager.send_action(DM.ACTION.STOP_ALARM)
@@ -200,6 +208,22 @@ class TaskApp(App, EventDispatcher):
             self._need_updates = None
             logger.debug("_need_updates is not None: Updated")
             
+    def _set_app_state(self, in_foreground: bool) -> None:
+        """
+        Pushes a foreground state transition to the Service.
+        - Publishes it on the StatusPage
+        - Broadcasts it once the CommunicationManager is loaded, which wakes the Service loop
+        """
+        self.in_foreground = in_foreground
+        publish_app_state(in_foreground)
+        if DM.LOADED.COMMUNICATION_MANAGER:
+            self.communication_manager.send_app_state_action(in_foreground)
+    
+    def _refresh_app_state(self, *args) -> None:
+        """Re-publishes the foreground state, so the Service does not consider it stale."""
+        if self.in_foreground:
+            publish_app_state(True)
+            
     ###############################################
     ################### MISC ######################
     @log_time("ServicePermissions")
@@ -60,6 +60,14 @@ class Paths(Dirs):
         self.DELETE_INACTIVE_IMG: Final[str] = os.path.join(self.IMG, "delete_inactive_64.png")
         # Task file
         self.TASK_FILE: Final[str] = os.path.join(self.ASSETS, "task_file.json")
+        self.TASK_JOURNAL_FILE: Final[str] = os.path.join(self.ASSETS, "task_file.journal")
+        self.TASK_SHARD_DIR: Final[str] = os.path.join(self.ASSETS, "task_shards")
+        self.TASK_DB_FILE: Final[str] = os.path.join(self.ASSETS, "task_file.db")
+        self.TASK_BINARY_FILE: Final[str] = os.path.join(self.ASSETS, "task_file.bin")
+        self.TASK_BINARY_JOURNAL_FILE: Final[str] = os.path.join(self.ASSETS, "task_file.bin.journal")
+        self.TASK_CHANGE_LOG_FILE: Final[str] = os.path.join(self.ASSETS, "task_file.changes")
+        self.TASK_VERSION_FILE: Final[str] = os.path.join(self.ASSETS, "task_file.version")
+        self.TASK_ARCHIVE_DIR: Final[str] = os.path.join(self.ASSETS, "task_archive")
         self.GPS_FILE: Final[str] = os.path.join(self.ASSETS, "gps_file.json")
         self.TARGET_PRESET_FILE: Final[str] = os.path.join(self.ASSETS, "target_preset_file.json")
         # Screenshot
@@ -71,6 +79,7 @@ class Paths(Dirs):
         self.SERVICE_TASK_FILE: Final[str] = self._get_storage_path(is_android, "app/src/assets/task_file.json")
         # Both
         self.SERVICE_HEARTBEAT_FLAG: Final[str] = self._get_storage_path(is_android, "app/service/service_heartbeat.flag")
+        self.STATUS_PAGE_FILE: Final[str] = self._get_storage_path(is_android, "app/service/status_page.bin")
         
 
 
@@ -124,6 +133,9 @@ class Actions:
         self.STOP_ALARM: Final[str] = "STOP_ALARM"
         self.UPDATE_TASKS: Final[str] = "UPDATE_TASKS"
 
+        # Lifecycle - App to Service
+        self.APP_STATE: Final[str] = "APP_STATE"
+
         # GPS - Service & App
         self.GET_LOCATION_ONCE: Final[str] = "GET_LOCATION_ONCE"
         self.START_LOCATION_MONITORING: Final[str] = "START_LOCATION_MONITORING"
@@ -215,7 +227,12 @@ class Settings:
         self.ALARM_NAME_MIN_LENGTH: int = 4
         self.ALARM_NAME_MAX_LENGTH: int = 20
         # Both
-        self.HEARTBEAT_SEDCONDS: int = 120
+        self.SERVICE_HEARTBEAT_INTERVAL: int = 60       # Service publishes its heartbeat
+        self.SERVICE_JOB_JITTER: int = 10               # Service jobs may run late to share a wake-up
+        self.HEARTBEAT_MARGIN: int = 20                 # Service loop start and scheduling delays
+        # Service is considered running while its last heartbeat is younger
+        self.HEARTBEAT_SEDCONDS: int = (self.SERVICE_HEARTBEAT_INTERVAL + self.SERVICE_JOB_JITTER
+                                        + self.HEARTBEAT_MARGIN)
         # GPS
         self.DEFAULT_LAT: float = 51.543368
         self.DEFAULT_LON: float = 3.603933
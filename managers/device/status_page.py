@@ -0,0 +1,182 @@
+import mmap
+import os
+import struct
+import threading
+import time
+
+from typing import Any
+
+from managers.device.device_manager import DM
+from src.utils.logger import logger
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, pages are only initialized by one process at a time in practice
+    fcntl = None
+
+
+class StatusPage:
+
+    MAGIC: bytes = b"BGTS"
+    LAYOUT_VERSION: int = 2
+    HEADER: struct.Struct = struct.Struct("<4sH2x")
+    SEQUENCE: struct.Struct = struct.Struct("<I4x")
+    MAX_READ_RETRIES: int = 100
+
+    SECTION_SERVICE: str = "service"
+    SECTION_APP: str = "app"
+    # Field name and struct format per section, each section has a single writing process
+    SECTIONS: dict[str, tuple[tuple[str, str], ...]] = {
+        SECTION_SERVICE: (
+            ("heartbeat", "d"),                # Epoch seconds
+            ("current_task_id", "36s"),
+            ("current_task_deadline", "d"),    # Epoch seconds, 0 if there is no current Task
+            ("store_version", "Q"),            # TaskStoreVersion the Service's Tasks reflect
+            ("latitude", "d"),
+            ("longitude", "d"),
+            ("location_time", "d"),            # Epoch seconds, 0 if there is no location
+            ("gps_state", "B"),
+        ),
+        SECTION_APP: (
+            ("foreground", "B"),
+            ("state_time", "d"),               # Epoch seconds of the last transition or refresh, 0 if never published
+        ),
+    }
+
+    GPS_OFF: int = 0
+    GPS_WAITING: int = 1                       # Postponed until its start after time
+    GPS_MONITORING: int = 2
+
+    APP_REFRESH_INTERVAL: int = 60             # = 60 seconds, the App re-publishes its foreground state
+
+    """
+    Small fixed layout status file, memory mapped by the App and the Service.
+    - Holds the state one process publishes for the other, like the Service heartbeat, current Task and location,
+      and the App's foreground state.
+    - Every section has one writing process and is written with seqlock versioning:
+      its sequence is odd while a write is in progress, readers retry until they read the same even sequence twice.
+    - Reading is a memory read, no file open or JSON parse.
+    - The file is mapped on first use, read() returns None and update() False if it cannot be mapped.
+    - A file with another layout version is re-initialized, its contents are only a cache of live state.
+    """
+    def __init__(self, page_path: str):
+        self.page_path: str = page_path
+        self._lock: threading.Lock = threading.Lock()
+        self._mmap: mmap.mmap | None = None
+        self._failed: bool = False
+        self._structs: dict[str, struct.Struct] = {}
+        self._offsets: dict[str, int] = {}
+
+        offset = StatusPage.HEADER.size
+        for section, fields in StatusPage.SECTIONS.items():
+            self._structs[section] = struct.Struct("<" + "".join(field_format for _, field_format in fields))
+            self._offsets[section] = offset
+            # Sections start 8 byte aligned
+            offset += StatusPage.SEQUENCE.size + (self._structs[section].size + 7) // 8 * 8
+        self.size: int = offset
+
+    def read(self, section: str) -> dict[str, Any] | None:
+        """Returns a consistent copy of a section, or None if the page is not available or kept changing."""
+        page = self._get_mmap()
+        if page is None:
+            return None
+
+        offset = self._offsets[section]
+        section_struct = self._structs[section]
+        for _ in range(StatusPage.MAX_READ_RETRIES):
+            sequence = StatusPage.SEQUENCE.unpack_from(page, offset)[0]
+            if not sequence % 2:
+                values = section_struct.unpack_from(page, offset + StatusPage.SEQUENCE.size)
+                if StatusPage.SEQUENCE.unpack_from(page, offset)[0] == sequence:
+                    return self._decode(section, values)
+
+            # Let a preempted writer finish its write
+            time.sleep(0)
+
+        logger.error(f"Error reading status page section {section}: writer did not finish")
+        return None
+
+    def update(self, section: str, **fields: Any) -> bool:
+        """Sets fields of a section, only the process that owns the section may call it. Returns False if not available."""
+        page = self._get_mmap()
+        if page is None:
+            return False
+
+        offset = self._offsets[section]
+        section_struct = self._structs[section]
+        with self._lock:
+            current = self._decode(section, section_struct.unpack_from(page, offset + StatusPage.SEQUENCE.size))
+            current.update(fields)
+            values = self._encode(section, current)
+
+            sequence = StatusPage.SEQUENCE.unpack_from(page, offset)[0]
+            StatusPage.SEQUENCE.pack_into(page, offset, (sequence + 1) & 0xFFFFFFFF)
+            section_struct.pack_into(page, offset + StatusPage.SEQUENCE.size, *values)
+            StatusPage.SEQUENCE.pack_into(page, offset, (sequence + 2) & 0xFFFFFFFF)
+
+        return True
+
+    def get_location(self) -> tuple[float, float] | None:
+        """Returns the last location published by the Service, or None."""
+        status = self.read(StatusPage.SECTION_SERVICE)
+        if not status or not status["location_time"]:
+            return None
+        return status["latitude"], status["longitude"]
+
+    def _decode(self, section: str, values: tuple) -> dict[str, Any]:
+        status = {}
+        for (name, _), value in zip(StatusPage.SECTIONS[section], values):
+            status[name] = value.rstrip(b"\0").decode("ascii") if isinstance(value, bytes) else value
+        return status
+
+    def _encode(self, section: str, status: dict[str, Any]) -> list[Any]:
+        values = []
+        for name, field_format in StatusPage.SECTIONS[section]:
+            value = status[name]
+            if field_format.endswith("s"):
+                values.append((value or "").encode("ascii"))
+            else:
+                values.append(value or 0)
+        return values
+
+    def _get_mmap(self) -> mmap.mmap | None:
+        if self._mmap is not None or self._failed:
+            return self._mmap
+
+        with self._lock:
+            if self._mmap is None and not self._failed:
+                try:
+                    self._mmap = self._open()
+                except Exception as e:
+                    logger.error(f"Error mapping status page: {e}")
+                    self._failed = True
+
+        return self._mmap
+
+    def _open(self) -> mmap.mmap:
+        os.makedirs(os.path.dirname(self.page_path), exist_ok=True)
+        fd = os.open(self.page_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            # Never shrink, the other process may still map an older and larger layout
+            if os.fstat(fd).st_size < self.size:
+                os.ftruncate(fd, self.size)
+
+            page = mmap.mmap(fd, self.size)
+            magic, layout_version = StatusPage.HEADER.unpack_from(page, 0)
+            if magic != StatusPage.MAGIC or layout_version != StatusPage.LAYOUT_VERSION:
+                page[:] = bytes(self.size)
+                StatusPage.HEADER.pack_into(page, 0, StatusPage.MAGIC, StatusPage.LAYOUT_VERSION)
+                logger.debug(f"Initialized status page layout {StatusPage.LAYOUT_VERSION}")
+            return page
+
+        finally:
+            # mmap keeps a duplicate of fd, so closing alone would not release the fcntl lock
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+
+STATUS_PAGE = StatusPage(DM.PATH.STATUS_PAGE_FILE)
@@ -3,10 +3,14 @@ import math
 from datetime import datetime, timedelta
 
 from managers.tasks.task import Task
+from managers.tasks.task_changeset import TaskChangeset
 from managers.tasks.task_file_manager import TaskFileManager
+from managers.tasks.task_index import TaskIndex
+from managers.tasks.task_scheduler import TaskScheduler
 
 from managers.device.device_manager import DM
 
+from src.utils.clock import WallClock, WALL_CLOCK
 from src.utils.logger import logger
 
 
@@ -21,11 +25,12 @@ class ExpiryManager(TaskFileManager):
     - Is extended upon my AppExpiryManager and ServiceExpiryManager.
     - Mainly handles expiry related logic.
     """	
-    def __init__(self):
-        super().__init__()
+    def __init__(self, clock: WallClock = WALL_CLOCK):
+        super().__init__(clock)
         self.task_file_path: str
+        self.task_index: TaskIndex = TaskIndex()
         self.expired_task: Task | None = None
-        self.active_tasks: list[Task] = self._get_active_tasks()
+        self.scheduler: TaskScheduler = TaskScheduler(self._get_active_tasks())
         self.current_task: Task | None = self.get_current_task()
     
     def snooze_task(self, action: str, task_id: str) -> int | bool:
@@ -36,7 +41,12 @@ class ExpiryManager(TaskFileManager):
         - Adds action's snooze time.
         - Adds time to avoid overlapping with other Tasks.
         - ExpiryManager handles updating Managers.
+        All writes are committed as one unit of work.
         """
+        with self.task_repository.unit_of_work():
+            return self._snooze_task(action, task_id)
+    
+    def _snooze_task(self, action: str, task_id: str) -> int | bool:
         # Check is expired Task or foreground notification Task
         # If expired Task -> is_old_task = True
         result = self._get_snoozed_task(task_id)
@@ -50,18 +60,25 @@ class ExpiryManager(TaskFileManager):
         total_snooze_time = self._get_snooze_time(snoozed_task, action, is_expired_task)
         snoozed_task.expired = False
         new_timestamp = snoozed_task.timestamp + timedelta(seconds=total_snooze_time)
+        if snoozed_task.recurrence is not None:
+            # Only this occurrence is snoozed, the rule stays as is
+            snoozed_task.set_override(snoozed_task.get_occurrence(), {"timestamp": new_timestamp.isoformat()})
         
         # If snoozed to new date, remove from old and add to new DateGroup
         # Otherwise just save changes
         if not self._has_changed_task_groups(snoozed_task, new_timestamp, total_snooze_time):
-            self._save_task_changes(snoozed_task.task_id, {
+            snoozed_task.snooze_time += total_snooze_time
+            changes = {
                 "timestamp": new_timestamp.isoformat(),
-                "snooze_time": snoozed_task.snooze_time + total_snooze_time,
+                "snooze_time": snoozed_task.snooze_time,
                 "expired": False
-            })
+            }
+            if snoozed_task.recurrence is not None:
+                changes["overrides"] = dict(snoozed_task.overrides)
+            self._save_task_changes(snoozed_task.task_id, changes, date_key=snoozed_task.get_date_key())
         
         logger.trace(f"Snoozed: {DM.get_task_log(snoozed_task)}")
-        logger.trace(f"Added: {total_snooze_time/60:.1f}m for a total of {snoozed_task.snooze_time + total_snooze_time/60:.1f}m")
+        logger.trace(f"Added: {total_snooze_time/60:.1f}m for a total of {snoozed_task.snooze_time/60:.1f}m")
 
         self._handle_snoozed_task(snoozed_task)
     
@@ -69,10 +86,15 @@ class ExpiryManager(TaskFileManager):
         """
         Cancels a Task by ID.
         - Finds the Task.
-        - Sets a Task as expired.
         - Clears the expired Task.
+        - Sets a Task as expired, a recurring Task moves on to its next occurrence.
         - ExpiryManager handles updating Managers.
+        All writes are committed as one unit of work.
         """
+        with self.task_repository.unit_of_work():
+            self._cancel_task(task_id)
+    
+    def _cancel_task(self, task_id: str) -> None:
         logger.debug(f"Cancelling Task with ID: {DM.get_task_id_log(task_id)}")
         
         cancelled_task = self.get_active_task_by_id(task_id)
@@ -84,23 +106,69 @@ class ExpiryManager(TaskFileManager):
             logger.critical(f"Tried to cancel old Task - should not happen: {task_id}")
             return
         
-        # Save changes to file
-        self._save_task_changes(cancelled_task.task_id, {"expired": True})
-
         # Clear expired task if it was cancelled
         if cancelled_task == self.expired_task:
             self.expired_task = None
         
+        # Save changes to file
+        self.complete_task(cancelled_task)
+        
         self._handle_cancelled_task(cancelled_task)
         logger.trace(f"Cancelled Task: {DM.get_task_log(cancelled_task)}")
     
+    def complete_task(self, task: Task) -> None:
+        """
+        Marks a Task as done and saves it.
+        - A recurring Task moves on to its next occurrence and is re-scheduled.
+        - Other Tasks, and recurring Tasks that ended, are set as expired.
+        """
+        with self.task_repository.unit_of_work():
+            if task.recurrence is not None and self._advance_recurring_task(task):
+                return
+            
+            task.expired = True
+            self._save_task_changes(task.task_id, {"expired": True}, date_key=task.get_date_key())
+    
+    def _advance_recurring_task(self, task: Task) -> bool:
+        """
+        Moves a recurring Task to its next occurrence, only that occurrence is materialized.
+        - Saves the new timestamp, moving the Task to another TaskGroup if the date changed.
+        - Re-schedules the Task.
+        Returns False if the recurrence ended.
+        """
+        old_date_key = task.get_date_key()
+        if not task.advance_occurrence():
+            return False
+        
+        if task == self.expired_task:
+            self.expired_task = None
+        
+        if old_date_key != task.get_date_key():
+            self._remove_from_task_groups(task, old_date_key)
+            self._add_to_task_groups(task)
+            self.task_index.move(task, old_date_key)
+        else:
+            self._save_task_changes(task.task_id, {
+                "timestamp": task.timestamp.isoformat(),
+                "snooze_time": task.snooze_time,
+                "expired": False,
+                "overrides": dict(task.overrides)
+            }, date_key=old_date_key)
+            self.task_index.update_timestamp(task)
+        
+        if self._is_schedulable(task):
+            self.scheduler.reschedule(task)
+        
+        logger.trace(f"Recurring Task moved to next occurrence: {DM.get_task_log(task)}")
+        return True
+    
     def is_task_expired(self) -> bool:
         """Returns True if the current Task is expired."""
         try:
             if not self.current_task:
                 return False
             
-            return datetime.now() >= self.current_task.timestamp
+            return self.clock.now() >= self.current_task.timestamp
         
         except Exception as e:
             logger.error(f"Error parsing timestamp: {e}")
@@ -109,18 +177,16 @@ class ExpiryManager(TaskFileManager):
     def handle_task_expired(self) -> Task | None:
         """
         Handles Task expiration by setting it as the expired Task and getting the next current Task.
-        Refreshes active and current Tasks.
+        Pops the current Task from the scheduler, does not re-load Tasks.
         Returns the expired Task (for notifications/alarms).
         """
         if not self.current_task:
             return None
         
-        # Store current Task as expired before refreshing
-        self.expired_task = self.current_task
-        # Re-load Tasks but don't reset expired Task
-        self.refresh_active_tasks()
+        # Store current Task as expired and get the next one
+        self.expired_task = self.scheduler.pop()
         self.refresh_current_task()
-        logger.trace(f"Task expired, Tasks refreshed")
+        logger.trace(f"Task expired, current Task refreshed")
 
         return self.expired_task
     
@@ -165,7 +231,7 @@ class ExpiryManager(TaskFileManager):
     def _get_time_since_expiry(self, snoozed_task: Task, is_expired_task: bool) -> int:
         """Returns the time since the snoozed Task expired."""
         task_expiration = snoozed_task.timestamp
-        now = datetime.now()
+        now = self.clock.now()
 
         if now > task_expiration or is_expired_task:
             # Snoozed through Task notification
@@ -186,40 +252,74 @@ class ExpiryManager(TaskFileManager):
             return ExpiryManager.SNOOZE_B_SECONDS
     
     def _get_overlap_time(self, snoozed_task: Task, snooze_seconds: int, time_since_expiry: int) -> int:
-        """Returns the extra overlap time needed to avoid overlapping with other Tasks."""
+        """
+        Returns the extra overlap time needed to avoid overlapping with other Tasks.
+        Looks up the first free SNOOZE_OVERLAP_TIME step in the scheduler's TaskSlotIndex.
+        """
         new_snooze = snooze_seconds + time_since_expiry
         new_timestamp = snoozed_task.timestamp + timedelta(seconds=new_snooze)
         
-        overlap_time = 0
-        while self._has_time_overlap(new_timestamp):
-            logger.debug(f"Task {snoozed_task.task_id} would overlap with another task, adding {ExpiryManager.SNOOZE_OVERLAP_TIME} seconds")
-            overlap_time += ExpiryManager.SNOOZE_OVERLAP_TIME
-            new_timestamp = snoozed_task.timestamp + timedelta(seconds=new_snooze + overlap_time)
+        free_timestamp = self.scheduler.slots.first_free(new_timestamp, ExpiryManager.SNOOZE_OVERLAP_TIME)
+        overlap_time = int((free_timestamp - new_timestamp).total_seconds())
+        if overlap_time:
+            logger.debug(f"Task {snoozed_task.task_id} would overlap with another task, adding {overlap_time} seconds")
         
         return overlap_time
 
     def _has_time_overlap(self, timestamp: datetime) -> bool:
         """Returns True if the timestamp overlaps with another Task."""
-        for task in self.active_tasks:
-            if task.timestamp == timestamp:
-                return True
-        
-        return False
+        return self.scheduler.slots.is_taken(timestamp)
 
     def refresh_active_tasks(self) -> None:
-        """Re-loads active Tasks to get the latest data."""
-        self.active_tasks = self._get_active_tasks()
+        """Re-loads active Tasks from the Task file to get the latest data."""
+        store_version = self.get_store_version()
+        self.scheduler.load(self._get_active_tasks())
+        self.set_synced_version(store_version)
 
     def refresh_current_task(self) -> None:
         """Re-loads the current Task to get the latest data."""
         self.current_task = self.get_current_task()
     
     def _refresh_tasks(self) -> None:
-        """Re-loads Tasks, re-load current and reset expired Task."""
+        """
+        Re-loads Tasks, re-load current and reset expired Task.
+        Only needed when the other process changed the Task file.
+        """
         self.expired_task = None
         self.refresh_active_tasks()
         self.refresh_current_task()
     
+    def _refresh_task(self, task: Task, removed: bool = False) -> None:
+        """
+        Re-schedules a single changed Task, re-load current and reset expired Task.
+        Used after this process changed a Task, does not read the Task file.
+        """
+        self.expired_task = None
+        if removed or not self._is_schedulable(task):
+            self.scheduler.remove(task.task_id)
+        else:
+            self.scheduler.reschedule(task)
+        
+        self.refresh_current_task()
+    
+    def _refresh_changed_tasks(self, changeset: TaskChangeset) -> None:
+        """
+        Re-schedules the Tasks of a changeset, re-load current and reset expired Task.
+        The TaskIndex already holds the changed Tasks, does not read the Task file.
+        """
+        self.expired_task = None
+        for _, task_id in changeset.removed:
+            self.scheduler.remove(task_id)
+        
+        for task_id in changeset.get_changed_ids():
+            task = self.task_index.get(task_id)
+            if task is None or not self._is_schedulable(task):
+                self.scheduler.remove(task_id)
+            else:
+                self.scheduler.reschedule(task)
+        
+        self.refresh_current_task()
+    
     def clear_expired_task(self) -> None:
         """Clears the expired Task without saving changes."""
         if self.expired_task:
@@ -228,10 +328,7 @@ class ExpiryManager(TaskFileManager):
     def get_current_task(self) -> Task | None:
         """Returns the first Task that is not expired and is not the current expired Task."""
         try:
-            if not self.active_tasks or len(self.active_tasks) == 0:
-                return None
-            
-            return self.active_tasks[0]
+            return self.scheduler.peek()
 
         except Exception as e:
             logger.error(f"Error getting current Task: {e}")
@@ -239,29 +336,26 @@ class ExpiryManager(TaskFileManager):
     
     def _get_active_tasks(self) -> list[Task]:
         """
-        Returns a list of Tasks that are not marked as expired.
-        Tasks are sorted by effective time (earliest first).
+        Returns a list of Tasks that are not marked as expired, to be loaded into the scheduler.
+        Only reads TaskGroups that contain non-expired Tasks.
+        Tasks are loaded through the TaskIndex, so known Tasks keep their object.
         """
-        task_data = self.get_task_data()
+        task_data = self.get_active_task_data()
         active_tasks = []
 
         # Load Tasks
-        for tasks_data in task_data.values():
-            tasks = [Task.to_class(task_dict) for task_dict in tasks_data if not task_dict["message"].startswith("Track:")]
-            # Make Task objects and filter by expired
-            non_expired_tasks = [
-                task for task in tasks 
-                if not task.expired
-                and not (self.expired_task
-                and task.task_id == self.expired_task.task_id)
-            ]
-            active_tasks.extend(non_expired_tasks)
-        
-        # Sort by timestamp
-        active_tasks.sort(key=lambda task: task.timestamp)
+        for date_key, tasks_data in task_data.items():
+            tasks = self.task_index.load_group(date_key, tasks_data)
+            active_tasks.extend(task for task in tasks if self._is_schedulable(task))
 
         return active_tasks
     
+    def _is_schedulable(self, task: Task) -> bool:
+        """Returns True if the Task is not expired, not a tracking Task and not the expired Task."""
+        return not task.expired \
+               and not task.message.startswith("Track:") \
+               and not (self.expired_task and task.task_id == self.expired_task.task_id)
+    
     def get_active_task_by_id(self, task_id: str) -> Task | None:
         """Get a Task object by its ID."""
         # First check expired Task
@@ -269,27 +363,34 @@ class ExpiryManager(TaskFileManager):
             return self.expired_task
         
         # Then check active Tasks
-        for task in self.active_tasks:
-            if task.task_id == task_id:
-                return task
-        
-        return None
+        return self.scheduler.get(task_id)
     
     def get_any_task_by_id(self, task_id: str) -> Task | None:
-        """Searches for the expired Task"""
-        tasks_data = self.get_task_data()
-        for task_data in tasks_data.values():
-            for task in task_data:
-                if task["task_id"] == task_id:
-                    return Task.to_class(task)
-        return None
+        """
+        Searches for the expired Task.
+        - Checks the TaskIndex first.
+        - Only reads the Task file if the Task was never loaded.
+        """
+        task = self.task_index.get(task_id)
+        if task is not None:
+            return task
+        
+        result = self.find_task_data(task_id)
+        if result is None:
+            return None
+        
+        date_key, task_data = result
+        task = Task.to_class(task_data)
+        self.task_index.add(task, date_key)
+        return task
     
     def _log_expiry_tasks(self) -> None:
         logger.debug(f"Current task: {DM.get_task_log(self.current_task) if self.current_task else None}")
         logger.debug(f"Expired task: {DM.get_task_log(self.expired_task) if self.expired_task else None}")
         logger.debug("Active tasks:")
-        for task in self.active_tasks[:3]:
+        for task in self.scheduler.nsmallest(3):
             logger.debug(f"  {DM.get_task_log(task)}")
+        logger.debug(f"Task cache: {self.task_cache.get_stats()}")
     
     def _has_changed_task_groups(self, task: Task, new_timestamp: datetime, total_snooze_time: int) -> bool:
         """Handles moving a task to a different date group if needed. Returns True if moved, False otherwise."""
@@ -303,6 +404,8 @@ class ExpiryManager(TaskFileManager):
             task.snooze_time += total_snooze_time
             self._remove_from_task_groups(task, old_date_key)
             self._add_to_task_groups(task)
+            self.task_index.move(task, old_date_key)
             return True
         
+        self.task_index.update_timestamp(task)
         return False
@@ -1,15 +1,30 @@
+import json
 import uuid
 
 from datetime import datetime, timedelta
 from functools import lru_cache
+from typing import Iterator
 
 from managers.device.device_manager import DM
+from managers.tasks.task_recurrence import TaskRecurrence
 
 
 class Task:
-    """Represents a Task"""
+
+    __slots__ = ("task_id", "message", "alarm_name", "sound", "vibrate", "expired", "snooze_time",
+                 "recurrence", "overrides", "_timestamp", "_raw_timestamp", "_date_key")
+
+    """
+    Represents a Task.
+    - Uses __slots__, no per-instance __dict__.
+    - The timestamp is backed by an ISO string and only parsed to a datetime when accessed.
+    - The datetime and date_key are cached until the timestamp is set again.
+    - A recurring Task has a TaskRecurrence, its timestamp is the current occurrence.
+      Snoozed and cancelled single occurrences are sparse overrides, keyed by the occurrence's ISO string.
+    """
     def __init__(self, task_id=None, message="", timestamp=None, alarm_name=None,
-                 sound="off", vibrate="off", expired=False, snooze_time=False):
+                 sound="off", vibrate="off", expired=False, snooze_time=False,
+                 recurrence: TaskRecurrence | None = None, overrides: dict[str, dict] | None = None):
         self.task_id = task_id if task_id else str(uuid.uuid4())
         self.message = message
         self.timestamp = timestamp if timestamp else datetime.now()
@@ -18,40 +33,80 @@ class Task:
         self.vibrate = vibrate
         self.expired = expired
         self.snooze_time = snooze_time
+        self.recurrence = recurrence
+        self.overrides = overrides if overrides is not None else ({} if recurrence else None)
+
+    @property
+    def timestamp(self) -> datetime:
+        """Parses the backing ISO string on first access."""
+        if self._timestamp is None:
+            self._timestamp = datetime.fromisoformat(self._raw_timestamp)
+        return self._timestamp
+
+    @timestamp.setter
+    def timestamp(self, timestamp: datetime | str) -> None:
+        """Accepts a datetime or, without parsing it, an ISO string."""
+        if isinstance(timestamp, str):
+            self._set_raw_timestamp(timestamp)
+            return
+
+        self._timestamp = timestamp
+        self._raw_timestamp = None
+        self._date_key = None
+
+    def _set_raw_timestamp(self, raw_timestamp: str) -> None:
+        self._timestamp = None
+        self._raw_timestamp = raw_timestamp
+        self._date_key = None
 
     def to_dict(self) -> dict:
         """Convert Task to dictionary."""
-        timestamp = self.timestamp if type(self.timestamp) == datetime else datetime.fromisoformat(self.timestamp)
         return {
             "task_id": self.task_id,
-            "timestamp": timestamp,
+            "timestamp": self.timestamp,
             "message": self.message,
             "alarm_name": self.alarm_name,
             "sound": self.sound,
             "vibrate": self.vibrate,
             "expired": self.expired,
-            "snooze_time": self.snooze_time
+            "snooze_time": self.snooze_time,
+            "recurrence": self.recurrence,
+            "overrides": self.overrides
         }
     
     @classmethod
     def to_class(cls, data: dict) -> "Task":
-        """Convert dictionary to Task object."""
-        return Task(
-            task_id=data["task_id"],
-            timestamp=datetime.fromisoformat(data["timestamp"]),
-            message=data["message"],
-            alarm_name=data["alarm_name"],
-            sound=data["sound"],
-            vibrate=data["vibrate"],
-            expired=data["expired"],
-            snooze_time=data["snooze_time"]
-        )
+        """Convert dictionary to Task object, the timestamp is parsed when first accessed."""
+        task = cls.__new__(cls)
+        task.task_id = data["task_id"]
+        task.update_from_json(data)
+        return task
+
+    def update_from_json(self, data: dict) -> None:
+        """Update Task attributes in place from a JSON dictionary."""
+        self._set_raw_timestamp(data["timestamp"])
+        self.message = data["message"]
+        self.alarm_name = data["alarm_name"]
+        self.sound = data["sound"]
+        self.vibrate = data["vibrate"]
+        self.expired = data["expired"]
+        self.snooze_time = data["snooze_time"]
+        self.set_recurrence_json(data.get("recurrence"), data.get("overrides"))
+
+    def set_recurrence_json(self, recurrence: dict | None, overrides: dict | None) -> None:
+        """Sets the recurrence and overrides from their JSON, as stored by to_json."""
+        self.recurrence = TaskRecurrence.from_json(recurrence) if recurrence else None
+        self.overrides = dict(overrides) if self.recurrence else None
 
     def to_json(self) -> dict:
-        """Convert Task object to JSON dictionary."""
-        return {
+        """
+        Convert Task object to JSON dictionary.
+        recurrence and overrides are only included for recurring Tasks.
+        """
+        data = {
             "task_id": self.task_id,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": self._raw_timestamp if self._timestamp is None and self._raw_timestamp is not None
+                         else self.timestamp.isoformat(),
             "message": self.message,
             "alarm_name": self.alarm_name,
             "sound": self.sound,
@@ -59,6 +114,78 @@ class Task:
             "expired": self.expired,
             "snooze_time": self.snooze_time
         }
+        if self.recurrence is not None:
+            data["recurrence"] = self.recurrence.to_json()
+            data["overrides"] = dict(self.overrides)
+        return data
+
+    def get_occurrence(self) -> datetime:
+        """Returns the occurrence the timestamp belongs to, differs from the timestamp if it was snoozed."""
+        if self.overrides:
+            timestamp = self.timestamp.isoformat()
+            for occurrence, override in self.overrides.items():
+                if override.get("timestamp") == timestamp:
+                    return datetime.fromisoformat(occurrence)
+        return self.timestamp
+
+    def get_occurrences(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """
+        Yields the timestamps from start up to end at which the Task is due, in occurrence order.
+        - Starts with the current timestamp, overrides are applied to later occurrences.
+        - Occurrences before the current occurrence are done and skipped.
+        """
+        if start <= self.timestamp < end:
+            yield self.timestamp
+        if self.recurrence is None:
+            return
+
+        current = self.get_occurrence()
+        for occurrence in self.recurrence.occurrences(max(start, current)):
+            if occurrence >= end:
+                return
+            if occurrence <= current:
+                continue
+
+            override = self.overrides.get(occurrence.isoformat())
+            if override is None:
+                yield occurrence
+            elif not override.get("cancelled"):
+                timestamp = datetime.fromisoformat(override["timestamp"])
+                if start <= timestamp < end:
+                    yield timestamp
+
+    def advance_occurrence(self) -> bool:
+        """
+        Moves a recurring Task to its next occurrence that is not cancelled.
+        - Resets the expired and snooze state.
+        - Drops the overrides of the passed occurrences.
+        Returns False if the recurrence ended, the Task is left unchanged.
+        """
+        current = self.get_occurrence()
+        for occurrence in self.recurrence.occurrences(current):
+            if occurrence <= current:
+                continue
+            key = occurrence.isoformat()
+            override = self.overrides.get(key, {})
+            if override.get("cancelled"):
+                continue
+
+            self.overrides = {occurrence_key: value for occurrence_key, value in self.overrides.items()
+                              if occurrence_key >= key}
+            self.timestamp = datetime.fromisoformat(override["timestamp"]) if "timestamp" in override else occurrence
+            self.expired = False
+            self.snooze_time = 0
+            return True
+
+        return False
+
+    def set_override(self, occurrence: datetime, override: dict | None) -> None:
+        """Sets or clears the override of a single occurrence of a recurring Task."""
+        key = occurrence.isoformat()
+        if override:
+            self.overrides[key] = override
+        else:
+            self.overrides.pop(key, None)
 
     @staticmethod
     def to_date_str(timestamp: datetime) -> str:
@@ -116,14 +243,50 @@ class Task:
         """
         Used by TaskManager to group Tasks by date and save to JSON as key.
         Format: YYYY-MM-DD
+        Cached, taken from an unparsed ISO string without parsing it.
         """
-        return (self.timestamp).date().isoformat()
+        if self._date_key is None:
+            if self._timestamp is None and self._raw_timestamp is not None and self._raw_timestamp[10:11] == "T":
+                self._date_key = self._raw_timestamp[:10]
+            else:
+                self._date_key = self.timestamp.date().isoformat()
+        return self._date_key
 
 
 class TaskGroup:
+    """
+    The Tasks of one day.
+    - Caches the JSON of its Tasks and their serialized fragment for saving.
+    - dirty is set when the TaskGroup or one of its Tasks changed, the caches are rebuilt on the next save.
+    """
     def __init__(self, date_str: str, tasks: list[Task]):
         self.date_str = date_str
         self.tasks = tasks
+        self.dirty: bool = True
+        self._tasks_json: list[dict] | None = None
+        self._fragment: str | None = None
+    
+    def mark_dirty(self) -> None:
+        """Marks the cached JSON as outdated."""
+        self.dirty = True
+    
+    def get_tasks_json(self) -> list[dict]:
+        """
+        Returns the JSON dictionaries of the Tasks, cached until the TaskGroup is marked dirty.
+        The returned list is shared with the cache and must not be mutated.
+        """
+        if self.dirty or self._tasks_json is None:
+            self._tasks_json = [task.to_json() for task in self.tasks]
+            self._fragment = None
+            self.dirty = False
+        return self._tasks_json
+    
+    def get_fragment(self) -> str:
+        """Returns the Tasks serialized as json.dumps(tasks_json, indent=2), cached until the TaskGroup is marked dirty."""
+        tasks_json = self.get_tasks_json()
+        if self._fragment is None:
+            self._fragment = json.dumps(tasks_json, indent=2)
+        return self._fragment
     
     @staticmethod
     def get_task_group_header_text(date_str: str) -> str:
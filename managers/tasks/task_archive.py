@@ -0,0 +1,100 @@
+import gzip
+import json
+import os
+import threading
+
+from collections import OrderedDict
+from datetime import date
+from typing import Any
+
+from src.utils.logger import logger
+
+
+class TaskArchive:
+
+    MAX_CACHED_MONTHS: int = 3
+    SEGMENT_SUFFIX: str = ".jsonl.gz"
+
+    """
+    Compressed archive of TaskGroups that left the TASK_HISTORY_DAYS window.
+    - One segment per month, gzip compressed JSON lines of {"date_key": ..., "tasks": [...]}.
+    - Archiving appends a new gzip member, existing data is never re-written.
+    - A TaskGroup that is archived again replaces the earlier line on read.
+    - Months are decoded on demand, the last MAX_CACHED_MONTHS are kept in an LRU.
+    """
+    def __init__(self, archive_dir: str):
+        self.archive_dir: str = archive_dir
+        self._lock: threading.Lock = threading.Lock()
+        self._months: OrderedDict[str, dict[str, list[dict[str, Any]]]] = OrderedDict()
+
+    def archive(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        """Appends TaskGroups to the segments of their months."""
+        by_month: dict[str, list[str]] = {}
+        for date_key in sorted(data.keys()):
+            line = json.dumps({"date_key": date_key, "tasks": data[date_key]}, separators=(",", ":"))
+            by_month.setdefault(date_key[:7], []).append(line)
+
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with self._lock:
+            for month, lines in by_month.items():
+                with gzip.open(self._get_segment_path(month), "at", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                self._months.pop(month, None)
+
+        logger.debug(f"Archived {len(data)} TaskGroups in {len(by_month)} months")
+
+    def get_months(self) -> list[str]:
+        """Returns the archived months [YYYY-MM], earliest first."""
+        try:
+            return sorted(name[:-len(TaskArchive.SEGMENT_SUFFIX)] for name in os.listdir(self.archive_dir)
+                          if name.endswith(TaskArchive.SEGMENT_SUFFIX))
+        except FileNotFoundError:
+            return []
+
+    def get_month(self, year: int, month: int) -> dict[str, list[dict[str, Any]]]:
+        """
+        Returns the archived TaskGroups of a month by date key.
+        Returned data is shared with the LRU and must not be mutated.
+        """
+        month_key = f"{year:04d}-{month:02d}"
+        with self._lock:
+            groups = self._months.get(month_key)
+            if groups is not None:
+                self._months.move_to_end(month_key)
+                return groups
+
+            groups = self._read_segment(month_key)
+            self._months[month_key] = groups
+            if len(self._months) > TaskArchive.MAX_CACHED_MONTHS:
+                self._months.popitem(last=False)
+            return groups
+
+    def get_task_group_data(self, day: date) -> list[dict[str, Any]] | None:
+        """Returns the archived Task dicts of a day, or None."""
+        return self.get_month(day.year, day.month).get(day.isoformat())
+
+    def has_tasks(self, day: date) -> bool:
+        """Returns True if the day has archived Tasks."""
+        return bool(self.get_task_group_data(day))
+
+    def _read_segment(self, month_key: str) -> dict[str, list[dict[str, Any]]]:
+        groups = {}
+        path = self._get_segment_path(month_key)
+        if not os.path.exists(path):
+            return groups
+
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        groups[entry["date_key"]] = entry["tasks"]
+
+        except (OSError, EOFError, json.JSONDecodeError) as e:
+            # A partly written last member only loses the lines after the error
+            logger.error(f"Error reading Task archive {month_key}: {e}")
+
+        return groups
+
+    def _get_segment_path(self, month_key: str) -> str:
+        return os.path.join(self.archive_dir, f"{month_key}{TaskArchive.SEGMENT_SUFFIX}")
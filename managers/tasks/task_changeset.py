@@ -0,0 +1,193 @@
+import json
+import os
+
+from typing import Any
+
+from managers.tasks.task_index import TaskIndex
+from managers.tasks.task_journal import TaskJournal
+from src.utils.logger import logger
+
+
+class TaskChangeLog:
+
+    MAX_SIZE: int = 256 * 1024   # = 256 KB
+
+    """
+    Append-only feed of the changes written by the App and the Service, one JSON line per write.
+    - Journal records are logged as they are written to the TaskStore.
+    - A snapshot write only logs a marker with the writer's pid.
+    - A version is (inode, offset), reading from a version returns everything written after it.
+    - Each entry also carries the TaskStoreVersion of its commit.
+    - Once the log is too large it is replaced, readers of the old log get a version mismatch.
+    - Appends happen inside the TaskStoreVersion lock, so a rotation never races an append.
+    """
+    def __init__(self, log_path: str):
+        self.log_path: str = log_path
+
+    def get_version(self) -> tuple[int, int]:
+        """Returns the current end of the log."""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            self._write_line("")
+            stat = os.stat(self.log_path)
+
+        return stat.st_ino, stat.st_size
+
+    def append_records(self, records: list[dict[str, Any]], store_version: int = 0) -> None:
+        self._append({"pid": os.getpid(), "version": store_version, "records": records})
+
+    def append_snapshot(self, store_version: int = 0) -> None:
+        self._append({"pid": os.getpid(), "version": store_version, "snapshot": True})
+
+    def read_after_store_version(self, store_version: int) -> list[dict[str, Any]] | None:
+        """
+        Returns the entries committed after a TaskStoreVersion.
+        Returns None if the log no longer reaches back that far.
+        """
+        result = self.read_since((self.get_version()[0], 0))
+        if result is None:
+            return None
+
+        entries = result[1]
+        if not entries or entries[0].get("version", 0) > store_version + 1:
+            return None
+        return [entry for entry in entries if entry.get("version", 0) > store_version]
+
+    def read_since(self, version: tuple[int, int] | None) -> tuple[tuple[int, int], list[dict[str, Any]]] | None:
+        """
+        Returns the new version and the entries written since version.
+        Returns None on a version mismatch, when the log was replaced since.
+        """
+        if version is None:
+            return None
+
+        try:
+            with open(self.log_path, "rb") as f:
+                stat = os.fstat(f.fileno())
+                inode, offset = version
+                if stat.st_ino != inode or stat.st_size < offset:
+                    return None
+
+                f.seek(offset)
+                content = f.read()
+
+        except FileNotFoundError:
+            return None
+
+        # Only complete lines, a line that is still being written is read next time
+        end = content.rfind(b"\n") + 1
+        entries = []
+        for line in content[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.error(f"Error reading Task change log line: {e}")
+                return None
+
+        return (inode, offset + end), entries
+
+    def _append(self, entry: dict[str, Any]) -> None:
+        try:
+            if os.path.getsize(self.log_path) >= TaskChangeLog.MAX_SIZE:
+                self._rotate()
+        except FileNotFoundError:
+            pass
+
+        self._write_line(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def _write_line(self, line: str) -> None:
+        """Appends a line in a single write, so lines of the App and Service never interleave."""
+        fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+    def _rotate(self) -> None:
+        """Replaces the log with an empty one."""
+        temp_path = f"{self.log_path}.tmp"
+        with open(temp_path, "w"):
+            pass
+        os.replace(temp_path, self.log_path)
+
+
+class TaskChangeset:
+    """
+    Task deltas, coalesced from journal records against the current TaskIndex.
+    - added: [(date_key, task_json)]
+    - updated: [(date_key, task_json)]
+    - moved: [(old_date_key, new_date_key, task_json)]
+    - removed: [(date_key, task_id)]
+    - is_complete is False if a record touches a Task that is not indexed.
+    """
+    def __init__(self):
+        self.added: list[tuple[str, dict[str, Any]]] = []
+        self.updated: list[tuple[str, dict[str, Any]]] = []
+        self.moved: list[tuple[str, str, dict[str, Any]]] = []
+        self.removed: list[tuple[str, str]] = []
+        self.is_complete: bool = True
+
+    def __len__(self) -> int:
+        return len(self.added) + len(self.updated) + len(self.moved) + len(self.removed)
+
+    def get_changed_ids(self) -> list[str]:
+        """Returns the IDs of all added, updated and moved Tasks."""
+        return [task_json["task_id"] for _, task_json in self.added + self.updated] \
+             + [task_json["task_id"] for _, _, task_json in self.moved]
+
+    @staticmethod
+    def from_records(records: list[dict[str, Any]], task_index: TaskIndex) -> "TaskChangeset":
+        """Replays the records on the indexed state of the Tasks they touch and compares the result."""
+        changeset = TaskChangeset()
+        # task_id -> (date_key, task_json), or None if removed
+        state: dict[str, tuple[str, dict[str, Any]] | None] = {}
+
+        def get_current(task_id: str) -> tuple[str, dict[str, Any]] | None:
+            if task_id in state:
+                return state[task_id]
+            entry = task_index.get_entry(task_id)
+            return (entry[0], entry[1].to_json()) if entry else None
+
+        for record in records:
+            op = record.get("op")
+            if op == TaskJournal.OP_ADD:
+                task_json = record["task"]
+                state[task_json["task_id"]] = (record["date_key"], dict(task_json))
+
+            elif op == TaskJournal.OP_UPDATE:
+                current = get_current(record["task_id"])
+                if current is None:
+                    changeset.is_complete = False
+                    continue
+                state[record["task_id"]] = (current[0], {**current[1], **record["changes"]})
+
+            elif op == TaskJournal.OP_REMOVE:
+                current = get_current(record["task_id"])
+                if current is not None and current[0] == record["date_key"]:
+                    state[record["task_id"]] = None
+
+            elif op == TaskJournal.OP_DROP:
+                task_ids = set(task_index.get_task_ids(record["date_key"]))
+                task_ids.update(state.keys())
+                for task_id in task_ids:
+                    current = get_current(task_id)
+                    if current is not None and current[0] == record["date_key"]:
+                        state[task_id] = None
+
+        for task_id, current in state.items():
+            entry = task_index.get_entry(task_id)
+            old_date_key = entry[0] if entry else None
+            if current is None:
+                if old_date_key is not None:
+                    changeset.removed.append((old_date_key, task_id))
+            elif old_date_key is None:
+                changeset.added.append(current)
+            elif old_date_key == current[0]:
+                changeset.updated.append(current)
+            else:
+                changeset.moved.append((old_date_key, current[0], current[1]))
+
+        return changeset
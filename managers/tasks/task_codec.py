@@ -0,0 +1,289 @@
+import json
+import struct
+import uuid
+
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+
+class TaskCodec:
+
+    MAGIC: bytes = b"BGTK"
+    SCHEMA_VERSION: int = 2
+    READ_VERSIONS: frozenset[int] = frozenset((1, 2))
+
+    # magic, schema version, enum count, reserved, TaskGroup count, Task count, string count, string bytes
+    HEADER: struct.Struct = struct.Struct("<4sBBHIIII")
+    # date_key string index, Task count
+    GROUP: struct.Struct = struct.Struct("<II")
+    # flags, sound enum, vibrate enum, task_id, epoch seconds, microseconds, message, alarm_name, snooze_time
+    RECORD: struct.Struct = struct.Struct("<BBB16sqIIIq")
+    # Extras section [schema 2]: count, then the string index of each extras JSON in record order
+    EXTRA_COUNT: struct.Struct = struct.Struct("<I")
+
+    FLAG_UUID_ID: int = 1           # task_id is a canonical UUID, stored as 16 bytes
+    FLAG_MICROSECONDS: int = 2      # Timestamp has microseconds
+    FLAG_RAW_TIMESTAMP: int = 4     # Timestamp is not canonical isoformat, stored as string
+    FLAG_EXPIRED: int = 8
+    FLAG_NO_ALARM: int = 16         # alarm_name is None
+    FLAG_BOOL_SNOOZE: int = 32      # snooze_time is a bool (Task default False)
+    FLAG_EXTRAS: int = 64           # Optional fields are stored as JSON in the extras section
+
+    FIELDS: frozenset[str] = frozenset(("task_id", "timestamp", "message", "alarm_name",
+                                        "sound", "vibrate", "expired", "snooze_time"))
+    EXTRA_FIELDS: frozenset[str] = frozenset(("recurrence", "overrides"))
+    EPOCH: datetime = datetime(1970, 1, 1)
+
+    """
+    Compact binary encoding of the Task file layout {date_key: [task_dict, ...]}.
+    - Header with magic, schema version and counts.
+    - String table for date keys, messages, alarm names and non-UUID IDs.
+    - sound and vibrate are interned as one byte enums, their values lead the string table.
+    - Timestamps are naive epoch seconds, microseconds only if present.
+    - Optional fields of recurring Tasks are stored as JSON strings in a trailing extras section.
+    - Schema 1 files, without extras section, are still read.
+    - Lossless, decode(encode(data)) == data, encode raises ValueError otherwise.
+    """
+    @staticmethod
+    def encode(data: dict[str, list[dict[str, Any]]]) -> bytes:
+        """Returns the binary encoding of the Task data."""
+        strings: list[str] = []
+        string_ids: dict[str, int] = {}
+
+        def intern(value: str) -> int:
+            if not isinstance(value, str):
+                raise ValueError(f"Expected str, got {type(value)=}")
+            string_id = string_ids.get(value)
+            if string_id is None:
+                string_id = string_ids[value] = len(strings)
+                strings.append(value)
+            return string_id
+
+        # Enums first, so their string index fits in one byte
+        for tasks_data in data.values():
+            for task_data in tasks_data:
+                intern(task_data["sound"])
+                intern(task_data["vibrate"])
+        enum_count = len(strings)
+        if enum_count > 255:
+            raise ValueError(f"Too many sound/vibrate values: {enum_count}")
+
+        groups = bytearray()
+        records = bytearray()
+        extra_ids = []
+        record_count = 0
+        for date_key, tasks_data in data.items():
+            groups += TaskCodec.GROUP.pack(intern(date_key), len(tasks_data))
+            for task_data in tasks_data:
+                records += TaskCodec._encode_record(task_data, intern, extra_ids)
+                record_count += 1
+
+        encoded_strings = [string.encode("utf-8") for string in strings]
+        string_blob = b"".join(encoded_strings)
+        header = TaskCodec.HEADER.pack(TaskCodec.MAGIC, TaskCodec.SCHEMA_VERSION, enum_count, 0,
+                                       len(data), record_count, len(strings), len(string_blob))
+        lengths = struct.pack(f"<{len(strings)}I", *(len(string) for string in encoded_strings))
+        extras = TaskCodec.EXTRA_COUNT.pack(len(extra_ids)) + struct.pack(f"<{len(extra_ids)}I", *extra_ids)
+        return b"".join((header, lengths, string_blob, bytes(groups), bytes(records), extras))
+
+    @staticmethod
+    def _encode_record(task_data: dict[str, Any], intern: Callable[[str], int], extra_ids: list[int]) -> bytes:
+        keys = task_data.keys()
+        if not keys >= TaskCodec.FIELDS or not keys - TaskCodec.FIELDS <= TaskCodec.EXTRA_FIELDS:
+            raise ValueError(f"Unexpected Task fields: {sorted(keys)}")
+
+        flags = 0
+        extra_keys = keys - TaskCodec.FIELDS
+        if extra_keys:
+            # Original key order, so decoding gives back an equal dict
+            extras = {key: task_data[key] for key in keys if key in extra_keys}
+            extra_ids.append(intern(json.dumps(extras, separators=(",", ":"))))
+            flags |= TaskCodec.FLAG_EXTRAS
+        task_id = task_data["task_id"]
+        try:
+            task_id_bytes = uuid.UUID(task_id).bytes
+            if str(uuid.UUID(bytes=task_id_bytes)) != task_id:
+                raise ValueError
+            flags |= TaskCodec.FLAG_UUID_ID
+        except (ValueError, TypeError, AttributeError):
+            task_id_bytes = struct.pack("<I12x", intern(task_id))
+
+        timestamp = task_data["timestamp"]
+        microseconds = 0
+        try:
+            moment = datetime.fromisoformat(timestamp)
+            if moment.tzinfo is not None or moment.isoformat() != timestamp:
+                raise ValueError
+            delta = moment - TaskCodec.EPOCH
+            seconds = delta.days * 86400 + delta.seconds
+            if delta.microseconds:
+                microseconds = delta.microseconds
+                flags |= TaskCodec.FLAG_MICROSECONDS
+        except (ValueError, TypeError):
+            seconds = intern(timestamp)
+            flags |= TaskCodec.FLAG_RAW_TIMESTAMP
+
+        expired = task_data["expired"]
+        if not isinstance(expired, bool):
+            raise ValueError(f"Expected bool expired, got {type(expired)=}")
+        if expired:
+            flags |= TaskCodec.FLAG_EXPIRED
+
+        alarm_name = task_data["alarm_name"]
+        if alarm_name is None:
+            flags |= TaskCodec.FLAG_NO_ALARM
+            alarm_id = 0
+        else:
+            alarm_id = intern(alarm_name)
+
+        snooze_time = task_data["snooze_time"]
+        if isinstance(snooze_time, bool):
+            flags |= TaskCodec.FLAG_BOOL_SNOOZE
+        elif not isinstance(snooze_time, int):
+            raise ValueError(f"Expected int snooze_time, got {type(snooze_time)=}")
+
+        return TaskCodec.RECORD.pack(flags, intern(task_data["sound"]), intern(task_data["vibrate"]),
+                                     task_id_bytes, seconds, microseconds,
+                                     intern(task_data["message"]), alarm_id, int(snooze_time))
+
+    @staticmethod
+    def read_records(blob: bytes) -> tuple[list[str], list[tuple[str, list[tuple]]]]:
+        """
+        Returns the string table and the raw records per date key, without building Task dicts.
+        Records with FLAG_EXTRAS end with the string index of their extras JSON.
+        Raises ValueError if the data is not valid.
+        """
+        if len(blob) < TaskCodec.HEADER.size:
+            raise ValueError("Task data too short")
+
+        magic, version, _, _, group_count, record_count, string_count, string_size = \
+            TaskCodec.HEADER.unpack_from(blob, 0)
+        if magic != TaskCodec.MAGIC:
+            raise ValueError("Not a binary Task file")
+        if version not in TaskCodec.READ_VERSIONS:
+            raise ValueError(f"Unsupported Task file schema version: {version}")
+
+        groups_offset = TaskCodec.HEADER.size + 4 * string_count + string_size
+        records_offset = groups_offset + group_count * TaskCodec.GROUP.size
+        extras_offset = records_offset + record_count * TaskCodec.RECORD.size
+        extra_ids = ()
+        if version >= 2:
+            if len(blob) < extras_offset + TaskCodec.EXTRA_COUNT.size:
+                raise ValueError("Task file is truncated or corrupt")
+            extra_count, = TaskCodec.EXTRA_COUNT.unpack_from(blob, extras_offset)
+            extra_ids_offset = extras_offset + TaskCodec.EXTRA_COUNT.size
+            if len(blob) != extra_ids_offset + 4 * extra_count:
+                raise ValueError("Task file is truncated or corrupt")
+            extra_ids = struct.unpack_from(f"<{extra_count}I", blob, extra_ids_offset)
+        elif len(blob) != extras_offset:
+            raise ValueError("Task file is truncated or corrupt")
+
+        offset = TaskCodec.HEADER.size
+        lengths = struct.unpack_from(f"<{string_count}I", blob, offset)
+        if sum(lengths) != string_size:
+            raise ValueError("Task file string table is corrupt")
+
+        offset += 4 * string_count
+        strings = []
+        for length in lengths:
+            strings.append(blob[offset:offset + length].decode("utf-8"))
+            offset += length
+
+        groups = list(TaskCodec.GROUP.iter_unpack(blob[groups_offset:records_offset]))
+        records = list(TaskCodec.RECORD.iter_unpack(blob[records_offset:extras_offset]))
+        if sum(count for _, count in groups) != record_count:
+            raise ValueError("Task file is truncated or corrupt")
+
+        # Append the extras string index to the records that have extras
+        extra_positions = [i for i, record in enumerate(records) if record[0] & TaskCodec.FLAG_EXTRAS]
+        if len(extra_positions) != len(extra_ids):
+            raise ValueError("Task file extras are corrupt")
+        for i, extra_id in zip(extra_positions, extra_ids):
+            records[i] += (extra_id,)
+
+        grouped_records = []
+        start = 0
+        for date_key_id, task_count in groups:
+            grouped_records.append((strings[date_key_id], records[start:start + task_count]))
+            start += task_count
+
+        return strings, grouped_records
+
+    @staticmethod
+    def decode(blob: bytes) -> dict[str, list[dict[str, Any]]]:
+        """Returns the Task data from its binary encoding, raises ValueError if it is not valid."""
+        strings, grouped_records = TaskCodec.read_records(blob)
+        decode_record = TaskCodec._get_record_decoder(strings)
+        return {date_key: [decode_record(record) for record in records]
+                for date_key, records in grouped_records}
+
+    @staticmethod
+    def _get_record_decoder(strings: list[str]) -> Callable[[tuple], dict[str, Any]]:
+        """
+        Returns a function that turns a raw record into a Task dict.
+        Date and time of day strings are cached, as many Tasks share them.
+        """
+        day_strings: dict[int, str] = {}
+        time_strings: dict[int, str] = {}
+
+        def to_isoformat(seconds: int, microseconds: int) -> str:
+            days, day_seconds = divmod(seconds, 86400)
+            day_string = day_strings.get(days)
+            if day_string is None:
+                day_string = day_strings[days] = f"{(TaskCodec.EPOCH + timedelta(days=days)).date().isoformat()}T"
+
+            time_string = time_strings.get(day_seconds)
+            if time_string is None:
+                hours, rest = divmod(day_seconds, 3600)
+                time_string = time_strings[day_seconds] = f"{hours:02d}:{rest // 60:02d}:{rest % 60:02d}"
+
+            if microseconds:
+                return f"{day_string}{time_string}.{microseconds:06d}"
+            return day_string + time_string
+
+        def decode_record(record: tuple) -> dict[str, Any]:
+            flags, sound, vibrate, task_id, seconds, microseconds, message, alarm_id, snooze_time = record[:9]
+            if flags & TaskCodec.FLAG_UUID_ID:
+                task_id = task_id.hex()
+                task_id = f"{task_id[:8]}-{task_id[8:12]}-{task_id[12:16]}-{task_id[16:20]}-{task_id[20:]}"
+            else:
+                task_id = strings[int.from_bytes(task_id[:4], "little")]
+
+            task_data = {
+                "task_id": task_id,
+                "timestamp": strings[seconds] if flags & TaskCodec.FLAG_RAW_TIMESTAMP
+                             else to_isoformat(seconds, microseconds),
+                "message": strings[message],
+                "alarm_name": None if flags & TaskCodec.FLAG_NO_ALARM else strings[alarm_id],
+                "sound": strings[sound],
+                "vibrate": strings[vibrate],
+                "expired": bool(flags & TaskCodec.FLAG_EXPIRED),
+                "snooze_time": bool(snooze_time) if flags & TaskCodec.FLAG_BOOL_SNOOZE else snooze_time,
+            }
+            if flags & TaskCodec.FLAG_EXTRAS:
+                task_data.update(json.loads(strings[record[9]]))
+            return task_data
+
+        return decode_record
+
+
+def convert_json_to_binary(json_path: str, binary_path: str) -> int:
+    """Converts a JSON Task file to the binary format, returns the number of Tasks."""
+    from managers.tasks.task_store import write_file_atomic
+
+    with open(json_path, "r") as f:
+        data = json.load(f)
+
+    write_file_atomic(binary_path, TaskCodec.encode(data))
+    return sum(len(tasks_data) for tasks_data in data.values())
+
+
+def convert_binary_to_json(binary_path: str, json_path: str) -> int:
+    """Converts a binary Task file back to JSON, returns the number of Tasks."""
+    from managers.tasks.task_store import write_file_atomic
+
+    with open(binary_path, "rb") as f:
+        data = TaskCodec.decode(f.read())
+
+    write_file_atomic(json_path, json.dumps(data, indent=2))
+    return sum(len(tasks_data) for tasks_data in data.values())
@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from typing import Iterable
+
+from managers.tasks.task import TaskGroup
+
+
+class TaskDayIndex:
+    """
+    Index of the days that have Tasks, for the calendar and the week navigator.
+    - Per month a bitmask with bit (day - 1) set if the day has Tasks.
+    - Per day the number of Tasks, for density.
+    - Updated incrementally by the TaskManager, queries are O(1) per day.
+    """
+    def __init__(self):
+        self._months: dict[tuple[int, int], int] = {}
+        self._counts: dict[str, int] = {}
+
+    def load(self, task_groups: Iterable[TaskGroup]) -> None:
+        """Rebuilds the index from all TaskGroups."""
+        self._months = {}
+        self._counts = {}
+        for task_group in task_groups:
+            if task_group.tasks:
+                self._counts[task_group.date_str] = len(task_group.tasks)
+                self._set_bit(task_group.date_str, True)
+
+    def add(self, date_key: str) -> None:
+        """Counts a Task added to a day."""
+        count = self._counts.get(date_key, 0)
+        self._counts[date_key] = count + 1
+        if not count:
+            self._set_bit(date_key, True)
+
+    def remove(self, date_key: str) -> None:
+        """Uncounts a Task removed from a day."""
+        count = self._counts.get(date_key, 0)
+        if count > 1:
+            self._counts[date_key] = count - 1
+        elif count == 1:
+            del self._counts[date_key]
+            self._set_bit(date_key, False)
+
+    def has_tasks(self, day: date) -> bool:
+        """Returns True if the day has Tasks."""
+        return bool(self._months.get((day.year, day.month), 0) >> (day.day - 1) & 1)
+
+    def get_count(self, day: date) -> int:
+        """Returns the number of Tasks on the day."""
+        return self._counts.get(day.isoformat(), 0)
+
+    def get_month_mask(self, year: int, month: int) -> int:
+        """Returns the bitmask of the month, bit (day - 1) is set if the day has Tasks."""
+        return self._months.get((year, month), 0)
+
+    def has_tasks_between(self, start: date, end: date) -> bool:
+        """Returns True if any day from start to end, both included, has Tasks."""
+        while start <= end:
+            mask = self._months.get((start.year, start.month), 0)
+            if start.year == end.year and start.month == end.month:
+                last_day = end.day
+            else:
+                last_day = 31
+            # Bits of start.day up to last_day
+            if mask >> (start.day - 1) & ((1 << (last_day - start.day + 1)) - 1):
+                return True
+            # First day of the next month
+            start = (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+        return False
+
+    def _set_bit(self, date_key: str, value: bool) -> None:
+        month = (int(date_key[:4]), int(date_key[5:7]))
+        bit = 1 << (int(date_key[8:10]) - 1)
+        mask = self._months.get(month, 0)
+        mask = mask | bit if value else mask & ~bit
+        if mask:
+            self._months[month] = mask
+        else:
+            self._months.pop(month, None)
@@ -1,12 +1,22 @@
-import json
-import time
+import os
 
-from datetime import datetime, timedelta
+from concurrent.futures import Future
+from datetime import timedelta
 
-from typing import Any, TYPE_CHECKING
+from typing import Any, Callable, Iterable, TYPE_CHECKING
 
 
 from managers.device.device_manager import DM
+from managers.tasks.task_archive import TaskArchive
+from managers.tasks.task_changeset import TaskChangeLog
+from managers.tasks.task_journal import TaskJournal
+from managers.tasks.task_read_cache import TaskReadCache
+from managers.tasks.task_repository import TaskRepository
+from managers.tasks.task_store import (TaskStore, TaskSnapshot, JsonTaskStore, BinaryTaskStore,
+                                       ShardedTaskStore, SqliteTaskStore)
+from managers.tasks.task_version import TaskStoreVersion
+from managers.tasks.task_writer import TaskWriter
+from src.utils.clock import WallClock, WALL_CLOCK
 from src.utils.logger import logger
 
 if TYPE_CHECKING:
@@ -17,78 +27,355 @@ class TaskFileManager:
 
     TASK_HISTORY_DAYS: int = 30
 
+    STORE_JSON: str = "json"
+    STORE_BINARY: str = "binary"
+    STORE_SHARDED: str = "sharded"
+    STORE_SQLITE: str = "sqlite"
+    TASK_STORE: str = STORE_SHARDED
+
     """
     Manages the Task file.
+    - Task data is kept by a TaskStore backend, selected by TASK_STORE.
+    - Single Task mutations are written as TaskJournal records, not as full rewrites.
+    - All writes go through the TaskRepository, which commits each unit of work once
+      to the TaskWriter, a write-behind queue on a background thread.
+    - Reads go through the TaskReadCache, which only re-parses when the TaskStore changed.
+    - Written records are also appended to the TaskChangeLog, so the other process can apply just the changes.
+    - Commits hold the TaskStoreVersion lock and bump its version.
+      A snapshot based on an older version first gets the other process's records since then applied,
+      or is merged into the stored data if the TaskChangeLog was replaced since.
+    - synced_version is the version the in-memory Tasks reflect, reloads are skipped while it is current.
+      It is changed under the TaskRepository lock, the TaskWriter thread advances it after its own commits.
+    - TaskGroups older than TASK_HISTORY_DAYS are moved to the compressed TaskArchive.
     """
-    def __init__(self):
+    def __init__(self, clock: WallClock = WALL_CLOCK):
+        self.clock: WallClock = clock
         self.task_file_path: str = DM.PATH.TASK_FILE
+        self.task_store: TaskStore = self._create_task_store()
+        self.task_cache: TaskReadCache = TaskReadCache(self.task_store)
+        self.change_log: TaskChangeLog = TaskChangeLog(DM.PATH.TASK_CHANGE_LOG_FILE)
+        self.task_archive: TaskArchive = TaskArchive(DM.PATH.TASK_ARCHIVE_DIR)
+        self.task_version: TaskStoreVersion = TaskStoreVersion(DM.PATH.TASK_VERSION_FILE)
+        self.synced_version: int = self.task_version.read()
+        self.task_writer: TaskWriter = TaskWriter(write_snapshot=self._write_snapshot,
+                                                  write_records=self._write_records,
+                                                  compact=self._compact)
+        self.task_repository: TaskRepository = TaskRepository(self.task_writer)
         if not self._validate_task_data():
             self._reset_task_file()
+    
+    def _create_task_store(self) -> TaskStore:
+        """Returns the TaskStore backend selected by TASK_STORE."""
+        json_store = JsonTaskStore(self.task_file_path, DM.PATH.TASK_JOURNAL_FILE)
+        if TaskFileManager.TASK_STORE == TaskFileManager.STORE_SHARDED:
+            return ShardedTaskStore(DM.PATH.TASK_SHARD_DIR, legacy_store=json_store)
+        
+        if TaskFileManager.TASK_STORE == TaskFileManager.STORE_SQLITE:
+            return SqliteTaskStore(DM.PATH.TASK_DB_FILE, legacy_store=json_store)
+        
+        if TaskFileManager.TASK_STORE == TaskFileManager.STORE_BINARY:
+            return BinaryTaskStore(DM.PATH.TASK_BINARY_FILE, DM.PATH.TASK_BINARY_JOURNAL_FILE,
+                                   legacy_store=json_store)
+        
+        return json_store
+    
+    def _write_snapshot(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        """
+        Runs on the TaskWriter thread.
+        If the other process committed since the snapshot's base version, its records are applied on top,
+         so they are not lost, and logged again after the snapshot marker for this process to apply.
+        If the TaskChangeLog no longer reaches back to the base version, the snapshot is merged into the stored data.
+        """
+        try:
+            with self.task_version.locked() as version:
+                base_version = data.base_version if isinstance(data, TaskSnapshot) else None
+                rebased_records = []
+                if base_version is not None and base_version != version:
+                    data, rebased_records = self._rebase_snapshot(data, base_version)
+                
+                self.task_store.write_snapshot(data)
+                new_version = self.task_version.bump()
+                self.change_log.append_snapshot(new_version)
+                if rebased_records is None:
+                    # Memory lacks the kept Tasks, synced_version stays behind so this process reloads
+                    logger.debug("Merged Task snapshot into the stored Tasks, the change log did not reach back")
+                elif rebased_records:
+                    self.change_log.append_records(rebased_records, new_version)
+                    logger.debug(f"Rebased Task snapshot on {len(rebased_records)} records of the other process")
+                else:
+                    self._advance_synced_version(version, new_version)
+        finally:
+            self.task_cache.invalidate()
+    
+    def _rebase_snapshot(self, data: dict[str, list[dict[str, Any]]],
+                         base_version: int) -> tuple[dict[str, list[dict[str, Any]]], list[dict[str, Any]] | None]:
+        """
+        Returns the snapshot with the other process's records since base_version applied, and those records.
+        Records are idempotent, so records this process already applied in memory do no harm.
+        Returns the merged snapshot and None if the TaskChangeLog no longer reaches back to base_version.
+        """
+        entries = self.change_log.read_after_store_version(base_version)
+        if entries is None:
+            logger.warning(f"Task change log does not reach back to version {base_version}, merging snapshot")
+            return self._merge_snapshot(data), None
+        
+        records = [record for entry in entries if entry.get("pid") != os.getpid()
+                   for record in entry.get("records", [])]
+        if not records:
+            return data, []
+        
+        # The snapshot shares its lists with the TaskGroup caches, apply to a copy
+        rebased = {date_key: [dict(task_data) for task_data in tasks_data] for date_key, tasks_data in data.items()}
+        for record in records:
+            TaskJournal.apply_record(rebased, record)
+        
+        # Fragments of touched TaskGroups are outdated
+        touched = {record.get("date_key") for record in records}
+        fragments = {date_key: fragment for date_key, fragment in data.fragments.items()
+                     if date_key not in touched and None not in touched}
+        return TaskSnapshot(rebased, fragments), records
+    
+    def _merge_snapshot(self, data: dict[str, list[dict[str, Any]]]) -> dict[str, list[dict[str, Any]]]:
+        """
+        Runs under the TaskStoreVersion lock, re-reads the stored data and applies the snapshot's Tasks on top.
+        Tasks that are only stored are kept, they may be commits of the other process since the snapshot's base.
+        """
+        snapshot_ids = {task_data["task_id"] for tasks_data in data.values() for task_data in tasks_data}
+        merged = {date_key: list(tasks_data) for date_key, tasks_data in data.items()}
+        for date_key, tasks_data in self.task_store.read().items():
+            kept = [task_data for task_data in tasks_data if task_data["task_id"] not in snapshot_ids]
+            if kept:
+                merged.setdefault(date_key, []).extend(kept)
+        return merged
+    
+    def _write_records(self, records: list[dict[str, Any]]) -> None:
+        """Runs on the TaskWriter thread, journal records apply to the current data, so they never conflict."""
+        try:
+            with self.task_version.locked() as version:
+                self.task_store.write_records(records)
+                new_version = self.task_version.bump()
+                self.change_log.append_records(records, new_version)
+                self._advance_synced_version(version, new_version)
+        finally:
+            self.task_cache.invalidate()
+    
+    def _compact(self) -> None:
+        """Runs on the TaskWriter thread, does not change the Task data, so does not bump the version."""
+        try:
+            with self.task_version.locked():
+                self.task_store.compact()
+        finally:
+            self.task_cache.invalidate()
+    
+    def _advance_synced_version(self, version: int, new_version: int) -> None:
+        """Memory already holds this process's own changes, so it stays in sync if it was before the commit."""
+        with self.task_repository.lock:
+            if self.synced_version == version:
+                self.synced_version = new_version
+    
+    def set_synced_version(self, version: int) -> None:
+        """Marks the in-memory Tasks as synced with version, read before the Task data was loaded."""
+        with self.task_repository.lock:
+            self.synced_version = version
+    
+    def has_task_changes(self) -> bool:
+        """Returns True if the stored Task data changed since the in-memory Tasks were synced."""
+        try:
+            return self.task_version.read() != self.synced_version
+        
+        except Exception as e:
+            logger.error(f"Error reading Task store version: {e}")
+            return True
+    
+    def get_store_version(self) -> int:
+        """Returns the current TaskStoreVersion, read it before loading data that will be marked as synced."""
+        try:
+            return self.task_version.read()
+        
+        except Exception as e:
+            logger.error(f"Error reading Task store version: {e}")
+            return -1
 
-    def get_task_data(self) -> dict[str, list[dict[str, Any]]]:
-        """Returns a dictionary of Tasks from the Task file."""
+    def get_change_version(self) -> tuple[int, int] | None:
+        """Returns the current TaskChangeLog version, Task data read after this includes all changes up to it."""
+        try:
+            return self.change_log.get_version()
+        
+        except Exception as e:
+            logger.error(f"Error getting Task change version: {e}")
+            return None
+    
+    def get_task_changes(self, version: tuple[int, int] | None) -> tuple[tuple[int, int], list[dict[str, Any]]] | None:
+        """
+        Returns the new version and the journal records written since version, including queued records.
+        Returns None if the changes cannot be applied incrementally:
+        - The TaskChangeLog was replaced since version.
+        - The other process wrote a full snapshot since version.
+        A snapshot of this process is already reflected in memory, so only records after it are returned.
+        Records are idempotent, a record that is both queued and logged can be applied twice.
+        """
         try:
-            with open(self.task_file_path, "r") as f:
-                data = json.load(f)
+            result = self.change_log.read_since(version)
+            if result is None:
+                return None
+            
+            new_version, entries = result
+            records = []
+            for entry in entries:
+                if entry.get("snapshot"):
+                    if entry.get("pid") != os.getpid():
+                        return None
+                    records = []
+                else:
+                    records.extend(entry.get("records", []))
+            
+            pending_snapshot, pending_records = self.task_repository.get_pending()
+            if pending_snapshot is not None:
+                records = []
+            records.extend(pending_records)
+            return new_version, records
+        
+        except Exception as e:
+            logger.error(f"Error getting Task changes: {e}")
+            return None
+    
+    def get_task_data(self, date_keys: Iterable[str] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """
+        Returns a dictionary of Tasks from the TaskStore, limited to date_keys if provided.
+        Writes that are still queued in the TaskWriter or collected by an open unit of work are included.
+        """
+        try:
+            pending_snapshot, pending_records = self.task_repository.get_pending()
+            if date_keys is not None:
+                # Include TaskGroups that pending records add to
+                date_keys = set(date_keys)
+                date_keys.update(record["date_key"] for record in pending_records
+                                 if record["op"] == TaskJournal.OP_ADD)
+            
+            if pending_snapshot is not None:
+                data = pending_snapshot
+                if date_keys is not None:
+                    data = {date_key: tasks_data for date_key, tasks_data in data.items() if date_key in date_keys}
+            else:
+                data = self.task_cache.read(date_keys)
+            
+            if pending_records:
+                # Pending and cached data are shared, only TaskGroups the records change are copied
+                data = TaskJournal.apply_records_copied(data, pending_records)
             return data
         
         except Exception as e:
             logger.error(f"Error getting Task data: {e}")
             return {}
     
-    def save_task_file(self, data: dict) -> None:
-        """Saves Task data to file."""
+    def get_task_data_since(self, earliest_date_key: str) -> dict[str, list[dict[str, Any]]]:
+        """Returns the Task data of all TaskGroups on or after the earliest date key."""
+        date_keys = [date_key for date_key in self.get_date_keys() if date_key >= earliest_date_key]
+        return self.get_task_data(date_keys)
+    
+    def get_active_task_data(self) -> dict[str, list[dict[str, Any]]]:
+        """Returns at least all non-expired Tasks, grouped by date key."""
+        pending_snapshot, pending_records = self.task_repository.get_pending()
         try:
-            with open(self.task_file_path, "w") as f:
-                json.dump(data, f, indent=2)
+            if pending_snapshot is not None:
+                # The queued snapshot replaces the stored data, which may not exist yet
+                return self.get_task_data()
+            
+            if pending_records:
+                return self.get_task_data(self.task_cache.get_active_date_keys())
+            
+            return self.task_cache.read_active()
         
         except Exception as e:
-            logger.error(f"Error saving Task file: {e}")
-    
-    def _save_task_changes(self, task_id: str, changes: dict) -> None:
-        """Saves Task changes to file."""
-        try:
-            task_data = self.get_task_data()
-            for date_tasks in task_data.values():
-                for task in date_tasks:
-                    if task["task_id"] == task_id:
-                        task.update(changes)
-                        self.save_task_file(task_data)
-                        
-                        time.sleep(0.1)
-                        logger.debug(f"Saved changes for Task {DM.get_task_id_log(task_id)}")
-                        return
+            logger.error(f"Error getting active Task data: {e}")
+            return {}
+    
+    def find_task_data(self, task_id: str) -> tuple[str, dict[str, Any]] | None:
+        """Returns the date key and Task dict of any stored Task by ID, or None."""
+        pending_snapshot, pending_records = self.task_repository.get_pending()
+        try:
+            if pending_snapshot is None and not pending_records:
+                return self.task_cache.find_task(task_id)
+            
+            for date_key, tasks_data in self.get_task_data().items():
+                for task_data in tasks_data:
+                    if task_data["task_id"] == task_id:
+                        return date_key, task_data
+            return None
+        
+        except Exception as e:
+            logger.error(f"Error finding Task data: {e}")
+            return None
+    
+    def get_date_keys(self) -> list[str]:
+        """Returns all date keys, including those of queued writes."""
+        pending_snapshot, pending_records = self.task_repository.get_pending()
+        if pending_snapshot is not None or pending_records:
+            return sorted(self.get_task_data().keys())
+        
+        return self.task_cache.get_date_keys()
+    
+    def save_task_file(self, data: dict, fragments: dict[str, str] | None = None,
+                       base_version: int | None = None) -> Future:
+        """
+        Queues a full snapshot of the Task data.
+        fragments are the serialized TaskGroups by date key, used by JSON based TaskStores.
+        base_version is the TaskStoreVersion the data is based on, changes of the other process since are kept.
+        Returns a Future that resolves once the snapshot is on disk.
+        """
+        if fragments or base_version is not None:
+            data = TaskSnapshot(data, fragments, base_version)
+        return self.task_repository.save_snapshot(data)
+    
+    def save_task_records(self, records: list[dict[str, Any]]) -> Future:
+        """
+        Queues TaskJournal records as one unit of work, only the changed Tasks are written.
+        Returns a Future that resolves once the records are on disk.
+        """
+        with self.task_repository.unit_of_work():
+            for record in records:
+                self.task_repository.add_record(record)
+            future = self.task_repository.flushed()
+        
+        self._check_compaction()
+        return future
+    
+    def flush_task_file(self, timeout: float | None = None) -> bool:
+        """Blocks until all queued writes are on disk, used before notifying the other process."""
+        return self.task_repository.flush(timeout)
+    
+    def on_task_file_flushed(self, callback: Callable[[], None]) -> None:
+        """Calls the callback from the writer thread once all queued writes are on disk."""
+        self.task_repository.flushed().add_done_callback(lambda _: callback())
+    
+    def _save_task_changes(self, task_id: str, changes: dict, date_key: str | None = None) -> None:
+        """
+        Queues Task changes as a journal record.
+        The date_key of the Task lets the TaskStore skip searching for it.
+        """
+        try:
+            self.task_repository.add_record(TaskJournal.update_record(task_id, changes, date_key))
+            logger.debug(f"Saved changes for Task {DM.get_task_id_log(task_id)}")
+            self._check_compaction()
         
         except Exception as e:
             logger.error(f"Error saving Task changes: {e}")
     
+    def _check_compaction(self) -> None:
+        """Queues compacting the TaskStore if it passed its threshold."""
+        if self.task_store.needs_compaction():
+            self.task_writer.submit_compaction()
+    
     def _validate_task_data(self) -> bool:
         """
         Returns True if TaskData is valid, False otherwise.
         """
-        data = self.get_task_data()
-
-        if not isinstance(data, dict):
-            return False
-        
-        for date_key, tasks_data in data.items():
-            # Check date_key isstring
-            if not isinstance(date_key, str):
-                logger.error(f"Error validating TaskData, date_key != str: {type(date_key)=}")
-                return False
-            
-            # Check tasks_data is list
-            if not isinstance(tasks_data, list):
-                logger.error(f"Error validating TaskData, tasks_data != list: {type(tasks_data)=}")
-                return False
-            
-            # Check Tasks are dicts
-            for task_data in tasks_data:
-                if not isinstance(task_data, dict):
-                    logger.error(f"Error validating TaskData, task_data != dict: {type(task_data)=}")
-                    return False
+        try:
+            return self.task_store.validate()
         
-        return True
+        except Exception as e:
+            logger.error(f"Error validating TaskData: {e}")
+            return False
     
     def _reset_task_file(self) -> None:
         """Saves empty JSON to file."""
@@ -101,91 +388,58 @@ class TaskFileManager:
     
     def _add_to_task_groups(self, task: "Task") -> None:
         """
-        Adds a Task to the task_groups in the JSON file.
+        Adds a Task to the task_groups by queueing a journal record.
         """
         try:
-            task_data = self.get_task_data()
             date_key = task.get_date_key()
             task.expired = False
-            task_json = task.to_json()
-            # Add to existing DateGroup or create new one
-            if date_key in task_data:
-                task_data[date_key].append(task_json)
-            else:
-                task_data[date_key] = [task_json]
-            
-            self.save_task_file(task_data)
+            self.task_repository.add_record(TaskJournal.add_record(date_key, task.to_json()))
             
-            time.sleep(0.1)
             logger.debug(f"Added Task to group {date_key}: {DM.get_task_log(task)}")
+            self._check_compaction()
             
         except Exception as e:
             logger.error(f"Error adding Task to groups: {e}")
     
     def _remove_from_task_groups(self, task: "Task", date_key: str = None) -> None:
         """
-        Removes a Task from the task_groups in the JSON file.
-        If the last task is removed from a group, the entire group is removed.
+        Removes a Task from the task_groups by queueing a journal record.
+        If the last task is removed from a group, the entire group is removed on replay.
         If no date_key is priveded, the Task's date_key is used.
         """
         try:
-            task_data = self.get_task_data()
             date_key = date_key if date_key else task.get_date_key()
+            self.task_repository.add_record(TaskJournal.remove_record(date_key, task.task_id))
             
-            if date_key not in task_data:
-                logger.error(f"Date key {date_key} not found in task data")
-                return
-            
-            # Find and remove the task
-            tasks_in_date = task_data[date_key]
-            for i, task_dict in enumerate(tasks_in_date):
-                if task_dict["task_id"] == task.task_id:
-                    tasks_in_date.pop(i)
-                    
-                    # If last Task in group, remove it
-                    if not tasks_in_date:
-                        del task_data[date_key]
-                    
-                    self.save_task_file(task_data)
-                    
-                    time.sleep(0.1)
-                    logger.debug(f"Removed Task from group {date_key}: {DM.get_task_log(task)}")
-                    return
-            
-            logger.error(f"Task {DM.get_task_log(task)} not found in group {date_key}")
+            logger.debug(f"Removed Task from group {date_key}: {DM.get_task_log(task)}")
+            self._check_compaction()
             
         except Exception as e:
             logger.error(f"Error removing Task from groups: {e}")
     
     def _remove_old_task_groups(self) -> None:
         """
-        Removes TaskGroups that are older than TASK_HISTORY_DAYS.
+        Moves TaskGroups that are older than TASK_HISTORY_DAYS to the TaskArchive.
+        Queues a drop record per TaskGroup, which is a shard unlink for sharded storage.
+        TaskGroups are only dropped once they are archived.
         """
         try:
-            data = self.get_task_data()
-            if not data:
-                return
-            
             # Get earliest date to keep
-            earliest_date = datetime.now().date() - timedelta(days=TaskFileManager.TASK_HISTORY_DAYS)
+            earliest_date = self.clock.today() - timedelta(days=TaskFileManager.TASK_HISTORY_DAYS)
             earliest_date_str = earliest_date.isoformat()
 
             # Remove old TaskGroups
-            old_groups_removed = False
-            keys_to_remove = []
-            for date_key in data.keys():
-                if date_key < earliest_date_str:
-                    keys_to_remove.append(date_key)
-                    old_groups_removed = True
+            keys_to_remove = [date_key for date_key in self.get_date_keys() if date_key < earliest_date_str]
+            if keys_to_remove:
+                self.task_archive.archive(self.get_task_data(keys_to_remove))
             
-            # Remove old keys
-            for key in keys_to_remove:
-                del data[key]
+            with self.task_repository.unit_of_work():
+                for date_key in keys_to_remove:
+                    self.task_repository.add_record(TaskJournal.drop_record(date_key))
             
-            # Save if needed
-            if old_groups_removed:
-                self.save_task_file(data)
-                logger.debug(f"Removed {len(keys_to_remove)} old TaskGroups")
+            if keys_to_remove:
+                logger.debug(f"Archived and removed {len(keys_to_remove)} old TaskGroups")
+                self._check_compaction()
         
         except Exception as e:
             logger.error(f"Error removing old TaskGroups: {e}")
@@ -0,0 +1,88 @@
+import bisect
+
+from typing import Iterable, Iterator
+
+from managers.tasks.task import Task, TaskGroup
+
+
+class TaskGroupList:
+    """
+    TaskGroups sorted by date_str, with their Tasks sorted by timestamp.
+    - Looks up TaskGroups by date_str in O(1) through a dict.
+    - Finds positions with bisect, neighbours are then O(1) by position.
+    - Inserts keep both the TaskGroups and their Tasks sorted.
+    - Read-only list access through len(), iteration and indexing.
+    """
+    def __init__(self, task_groups: Iterable[TaskGroup] = ()):
+        task_groups = sorted(task_groups, key=lambda task_group: task_group.date_str)
+        self._task_groups: list[TaskGroup] = task_groups
+        self._date_strs: list[str] = [task_group.date_str for task_group in task_groups]
+        self._by_date_str: dict[str, TaskGroup] = {task_group.date_str: task_group for task_group in task_groups}
+
+    def __len__(self) -> int:
+        return len(self._task_groups)
+
+    def __iter__(self) -> Iterator[TaskGroup]:
+        return iter(self._task_groups)
+
+    def __getitem__(self, index: int) -> TaskGroup:
+        return self._task_groups[index]
+
+    def __contains__(self, date_str: str) -> bool:
+        return date_str in self._by_date_str
+
+    def get(self, date_str: str) -> TaskGroup | None:
+        """Returns the TaskGroup of a date_str, or None."""
+        return self._by_date_str.get(date_str)
+
+    def index(self, date_str: str) -> int:
+        """Returns the position of the TaskGroup of a date_str, or -1."""
+        if date_str not in self._by_date_str:
+            return -1
+        return bisect.bisect_left(self._date_strs, date_str)
+
+    def index_on_or_after(self, date_str: str) -> int:
+        """Returns the position of the first TaskGroup on or after a date_str, len() if there is none."""
+        return bisect.bisect_left(self._date_strs, date_str)
+
+    def get_prev(self, date_str: str) -> TaskGroup | None:
+        """Returns the TaskGroup before a date_str, or None."""
+        i = bisect.bisect_left(self._date_strs, date_str)
+        return self._task_groups[i - 1] if i > 0 else None
+
+    def get_next(self, date_str: str) -> TaskGroup | None:
+        """Returns the TaskGroup after a date_str, or None."""
+        i = bisect.bisect_right(self._date_strs, date_str)
+        return self._task_groups[i] if i < len(self._task_groups) else None
+
+    def insert_task(self, task: Task) -> tuple[TaskGroup, int]:
+        """
+        Inserts a Task at its sorted position, creating its TaskGroup if needed.
+        Tasks with an equal timestamp keep their insertion order.
+        Returns the TaskGroup and the position of the Task in it.
+        """
+        date_str = task.get_date_key()
+        task_group = self._by_date_str.get(date_str)
+        if task_group is None:
+            task_group = TaskGroup(date_str=date_str, tasks=[task])
+            i = bisect.bisect_left(self._date_strs, date_str)
+            self._task_groups.insert(i, task_group)
+            self._date_strs.insert(i, date_str)
+            self._by_date_str[date_str] = task_group
+            return task_group, 0
+
+        tasks = task_group.tasks
+        position = bisect.bisect_right(tasks, task.timestamp, key=lambda group_task: group_task.timestamp)
+        tasks.insert(position, task)
+        return task_group, position
+
+    def remove(self, date_str: str) -> TaskGroup | None:
+        """Removes and returns the TaskGroup of a date_str, or None."""
+        task_group = self._by_date_str.pop(date_str, None)
+        if task_group is None:
+            return None
+
+        i = bisect.bisect_left(self._date_strs, date_str)
+        del self._task_groups[i]
+        del self._date_strs[i]
+        return task_group
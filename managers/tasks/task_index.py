@@ -0,0 +1,177 @@
+import bisect
+
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, Iterator
+
+from managers.tasks.task import Task
+
+
+class TaskIndex:
+    """
+    In-memory index of all loaded Tasks by ID, one per process.
+    - Shared by the ExpiryManager and TaskManager, so both use the same Task objects.
+    - Maps task_id to (date_key, Task).
+      Positions are not indexed, the ExpiryManager and TaskManager order TaskGroups differently,
+      a Task is found by ID within its TaskGroup.
+    - Loading Task data re-uses and updates existing Task objects.
+    - Maintained incrementally on add, remove and move.
+    - Keeps a timeline of (timestamp, task_id) sorted by time for range queries.
+      It is built on the first query, so timestamps are not parsed before they are needed.
+    - Keeps the IDs of recurring Tasks, whose later occurrences are not in the timeline.
+    """
+    def __init__(self):
+        self._entries: dict[str, tuple[str, Task]] = {}
+        self._date_keys: dict[str, set[str]] = {}
+        self._timeline: list[tuple[datetime, str]] | None = None
+        self._timeline_keys: dict[str, tuple[datetime, str]] = {}
+        self._recurring: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def get(self, task_id: str | None) -> Task | None:
+        """Returns the Task by ID, or None."""
+        entry = self._entries.get(task_id)
+        return entry[1] if entry else None
+
+    def get_entry(self, task_id: str | None) -> tuple[str, Task] | None:
+        """Returns (date_key, Task) by ID, or None."""
+        return self._entries.get(task_id)
+
+    def get_task_ids(self, date_key: str) -> set[str]:
+        """Returns a copy of the IDs of the indexed Tasks in a TaskGroup."""
+        return set(self._date_keys.get(date_key, ()))
+
+    def get_recurring(self) -> list[Task]:
+        """Returns the indexed recurring Tasks."""
+        return [self._entries[task_id][1] for task_id in self._recurring]
+
+    def load_group(self, date_key: str, tasks_data: list[dict[str, Any]], complete: bool = False) -> list[Task]:
+        """
+        Returns the Tasks of a TaskGroup from their dicts.
+        Known Tasks are updated in place, new Tasks are created and indexed.
+        If complete, Tasks that are indexed in this TaskGroup but not in tasks_data are removed.
+        """
+        tasks = []
+        for task_data in tasks_data:
+            entry = self._entries.get(task_data["task_id"])
+            if entry is None:
+                task = Task.to_class(task_data)
+            else:
+                task = entry[1]
+                task.update_from_json(task_data)
+
+            self._set_entry(task, date_key)
+            tasks.append(task)
+
+        if complete:
+            loaded_ids = {task.task_id for task in tasks}
+            for task_id in self._date_keys.get(date_key, set()) - loaded_ids:
+                self.remove(task_id)
+
+        return tasks
+
+    def add(self, task: Task, date_key: str | None = None) -> None:
+        """Adds or re-indexes a Task in the TaskGroup of date_key, or of its timestamp."""
+        self._set_entry(task, date_key if date_key else task.get_date_key())
+
+    def remove(self, task_id: str) -> None:
+        """Removes a Task from the index."""
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return
+
+        self._remove_from_timeline(task_id)
+        self._recurring.discard(task_id)
+
+        task_ids = self._date_keys.get(entry[0])
+        if task_ids is not None:
+            task_ids.discard(task_id)
+            if not task_ids:
+                del self._date_keys[entry[0]]
+
+    def move(self, task: Task, old_date_key: str) -> None:
+        """Moves a Task to the TaskGroup of its current timestamp."""
+        if old_date_key != task.get_date_key():
+            self.remove(task.task_id)
+        self.add(task)
+
+    def update_timestamp(self, task: Task) -> None:
+        """Re-sorts a Task in the timeline after its timestamp was changed in place."""
+        if self._timeline is not None and task.task_id in self._entries:
+            self._add_to_timeline(task)
+
+    def range(self, start: datetime, end: datetime) -> Iterator[Task]:
+        """
+        Yields the Tasks with start <= timestamp < end in time order.
+        The index must not be changed while iterating.
+        """
+        timeline = self._get_timeline()
+        i = bisect.bisect_left(timeline, start, key=itemgetter(0))
+        while i < len(timeline) and timeline[i][0] < end:
+            yield self._entries[timeline[i][1]][1]
+            i += 1
+
+    def count(self, start: datetime, end: datetime) -> int:
+        """Returns the number of Tasks with start <= timestamp < end."""
+        timeline = self._get_timeline()
+        return bisect.bisect_left(timeline, end, key=itemgetter(0)) - bisect.bisect_left(timeline, start, key=itemgetter(0))
+
+    def next_after(self, timestamp: datetime) -> Task | None:
+        """Returns the first Task with a timestamp after the given timestamp, or None."""
+        timeline = self._get_timeline()
+        i = bisect.bisect_right(timeline, timestamp, key=itemgetter(0))
+        return self._entries[timeline[i][1]][1] if i < len(timeline) else None
+
+    def remove_groups_except(self, date_keys: set[str], earliest_date_key: str) -> None:
+        """Removes Tasks of TaskGroups on or after earliest_date_key that are not in date_keys."""
+        for date_key in list(self._date_keys.keys()):
+            if date_key >= earliest_date_key and date_key not in date_keys:
+                for task_id in list(self._date_keys[date_key]):
+                    self.remove(task_id)
+
+    def _set_entry(self, task: Task, date_key: str) -> None:
+        old_entry = self._entries.get(task.task_id)
+        if old_entry and old_entry[0] != date_key:
+            self._date_keys[old_entry[0]].discard(task.task_id)
+            if not self._date_keys[old_entry[0]]:
+                del self._date_keys[old_entry[0]]
+
+        self._entries[task.task_id] = (date_key, task)
+        self._date_keys.setdefault(date_key, set()).add(task.task_id)
+        if task.recurrence is None:
+            self._recurring.discard(task.task_id)
+        else:
+            self._recurring.add(task.task_id)
+        if self._timeline is not None:
+            self._add_to_timeline(task)
+
+    def _get_timeline(self) -> list[tuple[datetime, str]]:
+        """Returns the timeline, building it on first use."""
+        if self._timeline is None:
+            self._timeline_keys = {task_id: (entry[1].timestamp, task_id) for task_id, entry in self._entries.items()}
+            self._timeline = sorted(self._timeline_keys.values())
+        return self._timeline
+
+    def _add_to_timeline(self, task: Task) -> None:
+        key = (task.timestamp, task.task_id)
+        if self._timeline_keys.get(task.task_id) == key:
+            return
+
+        self._remove_from_timeline(task.task_id)
+        bisect.insort(self._timeline, key)
+        self._timeline_keys[task.task_id] = key
+
+    def _remove_from_timeline(self, task_id: str) -> None:
+        if self._timeline is None:
+            return
+
+        key = self._timeline_keys.pop(task_id, None)
+        if key is not None:
+            i = bisect.bisect_left(self._timeline, key)
+            if i < len(self._timeline) and self._timeline[i] == key:
+                del self._timeline[i]
@@ -0,0 +1,243 @@
+import json
+import os
+
+from typing import Any
+
+from src.utils.logger import logger
+
+
+class TaskJournal:
+
+    MAX_RECORDS: int = 200
+    MAX_SIZE: int = 64 * 1024   # = 64 KB
+
+    OP_ADD: str = "add"
+    OP_UPDATE: str = "update"
+    OP_REMOVE: str = "remove"
+    OP_DROP: str = "drop"
+
+    """
+    Append-only log of Task mutations on top of the Task file snapshot.
+    - Each mutation is stored as a single JSON line.
+    - Replaying the records on the snapshot gives the current Task data.
+    - Records are idempotent, replaying them twice gives the same result.
+    - While compacting, the journal is rotated so new records never get lost.
+    """
+    def __init__(self, journal_path: str):
+        self.journal_path: str = journal_path
+        self.rotated_path: str = f"{journal_path}.compacting"
+        self.record_count: int = 0
+
+    @staticmethod
+    def add_record(date_key: str, task_json: dict[str, Any]) -> dict[str, Any]:
+        """Returns a record that adds a Task to a TaskGroup."""
+        return {"op": TaskJournal.OP_ADD, "date_key": date_key, "task": task_json}
+
+    @staticmethod
+    def update_record(task_id: str, changes: dict[str, Any], date_key: str | None = None) -> dict[str, Any]:
+        """
+        Returns a record that updates a Task's attributes.
+        The date_key is optional, it lets storage find the Task without a full scan.
+        """
+        record = {"op": TaskJournal.OP_UPDATE, "task_id": task_id, "changes": changes}
+        if date_key:
+            record["date_key"] = date_key
+        return record
+
+    @staticmethod
+    def remove_record(date_key: str, task_id: str) -> dict[str, Any]:
+        """Returns a record that removes a Task from a TaskGroup."""
+        return {"op": TaskJournal.OP_REMOVE, "date_key": date_key, "task_id": task_id}
+
+    @staticmethod
+    def drop_record(date_key: str) -> dict[str, Any]:
+        """Returns a record that removes an entire TaskGroup."""
+        return {"op": TaskJournal.OP_DROP, "date_key": date_key}
+
+    def write_records(self, records: list[dict[str, Any]]) -> None:
+        """Appends the records, one line each, so a partial write only affects the last record."""
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+        with open(self.journal_path, "a") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.record_count += len(records)
+
+    def replay(self, data: dict[str, list[dict[str, Any]]]) -> dict[str, list[dict[str, Any]]]:
+        """
+        Applies all journal records to the snapshot data in place.
+        Records of a journal that is being compacted are applied first.
+        """
+        record_count = 0
+        for path in (self.rotated_path, self.journal_path):
+            for record in self._read_records(path):
+                TaskJournal.apply_record(data, record)
+                record_count += 1
+
+        self.record_count = record_count
+        return data
+
+    def replay_rotated(self, data: dict[str, list[dict[str, Any]]]) -> dict[str, list[dict[str, Any]]]:
+        """Applies only the records of the rotated journal to the snapshot data in place."""
+        for record in self._read_records(self.rotated_path):
+            TaskJournal.apply_record(data, record)
+
+        return data
+
+    def _read_records(self, path: str) -> list[dict[str, Any]]:
+        """Returns the records in the journal file, skipping a torn last line."""
+        if not os.path.exists(path):
+            return []
+
+        records = []
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable journal record in {path}")
+
+        return records
+
+    @staticmethod
+    def apply_record(data: dict[str, list[dict[str, Any]]], record: dict[str, Any]) -> None:
+        """Applies a single journal record to the Task data."""
+        op = record.get("op")
+        if op == TaskJournal.OP_ADD:
+            task_json = record["task"]
+            # Upsert, a Task only lives in one TaskGroup
+            TaskJournal._pop_task(data, task_json["task_id"])
+            data.setdefault(record["date_key"], []).append(dict(task_json))
+
+        elif op == TaskJournal.OP_UPDATE:
+            # Look in the record's TaskGroup first
+            groups = list(data.values())
+            if record.get("date_key") in data:
+                groups.insert(0, data[record["date_key"]])
+
+            for tasks_data in groups:
+                for task_data in tasks_data:
+                    if task_data["task_id"] == record["task_id"]:
+                        task_data.update(record["changes"])
+                        return
+
+        elif op == TaskJournal.OP_REMOVE:
+            tasks_data = data.get(record["date_key"])
+            if tasks_data is None:
+                return
+
+            data[record["date_key"]] = [task_data for task_data in tasks_data
+                                        if task_data["task_id"] != record["task_id"]]
+            # If last Task in group, remove it
+            if not data[record["date_key"]]:
+                del data[record["date_key"]]
+
+        elif op == TaskJournal.OP_DROP:
+            data.pop(record["date_key"], None)
+
+        else:
+            logger.error(f"Unknown journal record op: {op}")
+
+    @staticmethod
+    def apply_records_copied(data: dict[str, list[dict[str, Any]]],
+                             records: list[dict[str, Any]]) -> dict[str, list[dict[str, Any]]]:
+        """
+        Returns the data with the records applied, leaving data itself unchanged.
+        Only the TaskGroups a record changes in place are copied, so data may be shared with a cache.
+        """
+        data = dict(data)
+        copied = set()
+        for record in records:
+            for date_key in TaskJournal._get_changed_date_keys(data, record):
+                if date_key not in copied:
+                    data[date_key] = [dict(task_data) for task_data in data[date_key]]
+                    copied.add(date_key)
+            TaskJournal.apply_record(data, record)
+
+        return data
+
+    @staticmethod
+    def _get_changed_date_keys(data: dict[str, list[dict[str, Any]]], record: dict[str, Any]) -> list[str]:
+        """Returns the date keys of the TaskGroups whose list or Task dicts apply_record() changes in place."""
+        op = record.get("op")
+        if op == TaskJournal.OP_ADD:
+            date_keys = [record["date_key"]] if record["date_key"] in data else []
+            owner = TaskJournal._find_date_key(data, record["task"]["task_id"])
+            if owner is not None:
+                date_keys.append(owner)
+            return date_keys
+
+        if op == TaskJournal.OP_UPDATE:
+            date_key = record.get("date_key")
+            if date_key in data and any(task_data["task_id"] == record["task_id"] for task_data in data[date_key]):
+                return [date_key]
+            owner = TaskJournal._find_date_key(data, record["task_id"])
+            return [owner] if owner is not None else []
+
+        # Remove and drop replace or delete the TaskGroup's list
+        return []
+
+    @staticmethod
+    def _find_date_key(data: dict[str, list[dict[str, Any]]], task_id: str) -> str | None:
+        """Returns the date key of the TaskGroup holding the Task, or None."""
+        for date_key, tasks_data in data.items():
+            for task_data in tasks_data:
+                if task_data["task_id"] == task_id:
+                    return date_key
+        return None
+
+    @staticmethod
+    def _pop_task(data: dict[str, list[dict[str, Any]]], task_id: str) -> None:
+        """Removes a Task from whichever TaskGroup it is in."""
+        for date_key, tasks_data in list(data.items()):
+            for i, task_data in enumerate(tasks_data):
+                if task_data["task_id"] == task_id:
+                    tasks_data.pop(i)
+                    if not tasks_data:
+                        del data[date_key]
+                    return
+
+    def needs_compaction(self) -> bool:
+        """Returns True if the journal passed its record count or size threshold."""
+        if self.record_count >= TaskJournal.MAX_RECORDS:
+            return True
+
+        try:
+            return os.path.getsize(self.journal_path) >= TaskJournal.MAX_SIZE
+        except OSError:
+            return False
+
+    def rotate(self) -> bool:
+        """
+        Moves the journal aside for compaction.
+        New records are appended to a fresh journal in the meantime.
+        Returns False if there is nothing to compact.
+        """
+        if os.path.exists(self.rotated_path):
+            # Previous compaction was interrupted, fold it in again
+            return True
+
+        if not os.path.exists(self.journal_path):
+            return False
+
+        os.replace(self.journal_path, self.rotated_path)
+        self.record_count = 0
+        return True
+
+    def remove_rotated(self) -> None:
+        """Removes the rotated journal after its records are folded into the snapshot."""
+        if os.path.exists(self.rotated_path):
+            os.remove(self.rotated_path)
+
+    def clear(self) -> None:
+        """Removes all journal records, used after a full snapshot save."""
+        for path in (self.rotated_path, self.journal_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+        self.record_count = 0
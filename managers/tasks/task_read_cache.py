@@ -0,0 +1,133 @@
+import threading
+
+from typing import Any, Iterable
+
+from managers.tasks.task_store import TaskStore
+
+
+class TaskReadCache:
+    """
+    Cache of parsed Task data in front of a TaskStore.
+    - Validated by the TaskStore signature, (inode, size, mtime_ns) for file based stores.
+    - Stale as soon as the signature changes, or when this process writes.
+    - Caches per TaskGroup, only missing TaskGroups are read.
+    - Returned data is shared with the cache and must not be mutated.
+    """
+    def __init__(self, task_store: TaskStore):
+        self.task_store: TaskStore = task_store
+        self.hits: int = 0
+        self.misses: int = 0
+
+        self._lock: threading.Lock = threading.Lock()
+        self._signature: Any = None
+        self._groups: dict[str, list[dict[str, Any]]] = {}
+        self._missing_keys: set[str] = set()
+        self._is_complete: bool = False
+        self._date_keys: list[str] | None = None
+        self._active_date_keys: list[str] | None = None
+
+    def invalidate(self) -> None:
+        """Drops all cached data, called after this process wrote to the TaskStore."""
+        with self._lock:
+            self._clear()
+
+    def get_stats(self) -> dict[str, int]:
+        """Returns the hit and miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    def read(self, date_keys: Iterable[str] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Returns the Task data, limited to the given date keys if provided."""
+        with self._lock:
+            self._validate()
+            return self._read(date_keys)
+
+    def read_active(self) -> dict[str, list[dict[str, Any]]]:
+        """Returns the TaskGroups that contain non-expired Tasks, validating the cache once."""
+        with self._lock:
+            self._validate()
+            return self._read(self._get_active_date_keys())
+
+    def find_task(self, task_id: str) -> tuple[str, dict[str, Any]] | None:
+        """Returns the date key and Task dict of a Task by ID, or None."""
+        with self._lock:
+            self._validate()
+            if not self._is_complete:
+                return self.task_store.find_task(task_id)
+
+            for date_key, tasks_data in self._groups.items():
+                for task_data in tasks_data:
+                    if task_data["task_id"] == task_id:
+                        return date_key, task_data
+
+            return None
+
+    def get_date_keys(self) -> list[str]:
+        """Returns all stored date keys."""
+        with self._lock:
+            self._validate()
+            if self._date_keys is None:
+                self._date_keys = sorted(self._groups.keys()) if self._is_complete \
+                                  else self.task_store.get_date_keys()
+            return self._date_keys
+
+    def get_active_date_keys(self) -> list[str]:
+        """Returns the date keys that contain at least one non-expired Task."""
+        with self._lock:
+            self._validate()
+            return self._get_active_date_keys()
+
+    def _get_active_date_keys(self) -> list[str]:
+        if self._active_date_keys is None:
+            self._active_date_keys = self.task_store.get_active_date_keys()
+        return self._active_date_keys
+
+    def _validate(self) -> None:
+        """Clears the cache if the TaskStore changed since it was filled."""
+        signature = self.task_store.get_signature()
+        if signature is None or signature != self._signature:
+            self._clear()
+            self._signature = signature
+
+    def _clear(self) -> None:
+        self._signature = None
+        self._groups = {}
+        self._missing_keys = set()
+        self._is_complete = False
+        self._date_keys = None
+        self._active_date_keys = None
+
+    def _read(self, date_keys: Iterable[str] | None) -> dict[str, list[dict[str, Any]]]:
+        if date_keys is None:
+            if not self._is_complete:
+                self._fill_all()
+            else:
+                self.hits += 1
+            return dict(self._groups)
+
+        date_keys = list(date_keys)
+        missing = [date_key for date_key in date_keys
+                   if date_key not in self._groups and date_key not in self._missing_keys]
+        if missing and not self._is_complete:
+            if self.task_store.PARTIAL_READS:
+                self.misses += 1
+                data = self.task_store.read(missing)
+                self._groups.update(data)
+                self._missing_keys.update(date_key for date_key in missing if date_key not in data)
+            else:
+                self._fill_all()
+        else:
+            self.hits += 1
+
+        return {date_key: self._groups[date_key] for date_key in date_keys if date_key in self._groups}
+
+    def _fill_all(self) -> None:
+        self.misses += 1
+        data = self.task_store.read()
+        if not isinstance(data, dict):
+            # Invalid Task data is handled by the TaskFileManager, never cached
+            self._groups = {}
+            return
+
+        self._groups = data
+        self._missing_keys = set()
+        self._is_complete = True
@@ -0,0 +1,111 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterator
+
+
+class TaskRecurrence:
+
+    RULE_DAILY: str = "daily"
+    RULE_WEEKLY: str = "weekly"
+    RULE_WEEKDAYS: str = "weekdays"
+    RULE_MINUTES: str = "minutes"
+    RULES: frozenset[str] = frozenset((RULE_DAILY, RULE_WEEKLY, RULE_WEEKDAYS, RULE_MINUTES))
+
+    """
+    Repeat rule of a recurring Task.
+    - daily: every interval days, weekly: every interval weeks, minutes: every interval minutes.
+    - weekdays: on a set of weekdays [0 = Monday], every interval weeks.
+    - Occurrences are generated lazily from the start anchor, up to and including until.
+    - Jumps to the first occurrence of a range arithmetically, earlier occurrences are never generated.
+    """
+    def __init__(self, rule: str, start: datetime, interval: int = 1,
+                 weekdays: list[int] | None = None, until: datetime | None = None):
+        if rule not in TaskRecurrence.RULES:
+            raise ValueError(f"Unknown recurrence rule: {rule}")
+        if interval < 1:
+            raise ValueError(f"Recurrence interval must be at least 1: {interval}")
+        if rule == TaskRecurrence.RULE_WEEKDAYS and not weekdays:
+            raise ValueError("Weekdays recurrence needs at least one weekday")
+
+        self.rule: str = rule
+        self.start: datetime = start
+        self.interval: int = interval
+        self.weekdays: list[int] = sorted(set(weekdays)) if weekdays else []
+        self.until: datetime | None = until
+        if any(not 0 <= weekday <= 6 for weekday in self.weekdays):
+            raise ValueError(f"Weekdays must be 0 to 6: {self.weekdays}")
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, TaskRecurrence) and self.to_json() == other.to_json()
+
+    def occurrences(self, start: datetime | None = None) -> Iterator[datetime]:
+        """Yields the occurrences on or after start, in time order."""
+        start = self.start if start is None or start < self.start else start
+        if self.rule == TaskRecurrence.RULE_WEEKDAYS:
+            occurrences = self._weekday_occurrences(start)
+        else:
+            occurrences = self._step_occurrences(start)
+
+        for occurrence in occurrences:
+            if self.until is not None and occurrence > self.until:
+                return
+            yield occurrence
+
+    def next_after(self, timestamp: datetime) -> datetime | None:
+        """Returns the first occurrence after the timestamp, or None if the recurrence ended."""
+        for occurrence in self.occurrences(timestamp):
+            if occurrence > timestamp:
+                return occurrence
+        return None
+
+    def _get_step(self) -> timedelta:
+        if self.rule == TaskRecurrence.RULE_DAILY:
+            return timedelta(days=self.interval)
+        if self.rule == TaskRecurrence.RULE_WEEKLY:
+            return timedelta(weeks=self.interval)
+        return timedelta(minutes=self.interval)
+
+    def _step_occurrences(self, start: datetime) -> Iterator[datetime]:
+        step = self._get_step()
+        # Number of steps up to start, rounded up
+        count = -((self.start - start) // step)
+        occurrence = self.start + count * step
+        while True:
+            yield occurrence
+            occurrence += step
+
+    def _weekday_occurrences(self, start: datetime) -> Iterator[datetime]:
+        # Monday of the anchor week, at the time of day of the anchor
+        anchor = self.start - timedelta(days=self.start.weekday())
+        week = (start - anchor).days // 7
+        week -= week % self.interval
+        while True:
+            week_start = anchor + timedelta(weeks=week)
+            for weekday in self.weekdays:
+                occurrence = week_start + timedelta(days=weekday)
+                if occurrence >= start:
+                    yield occurrence
+            week += self.interval
+
+    def to_json(self) -> dict[str, Any]:
+        """Convert TaskRecurrence to JSON dictionary, weekdays and until only if set."""
+        data = {
+            "rule": self.rule,
+            "start": self.start.isoformat(),
+            "interval": self.interval,
+        }
+        if self.weekdays:
+            data["weekdays"] = list(self.weekdays)
+        if self.until is not None:
+            data["until"] = self.until.isoformat()
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "TaskRecurrence":
+        """Convert JSON dictionary to TaskRecurrence, raises ValueError if it is not valid."""
+        return cls(
+            rule=data["rule"],
+            start=datetime.fromisoformat(data["start"]),
+            interval=data.get("interval", 1),
+            weekdays=data.get("weekdays"),
+            until=datetime.fromisoformat(data["until"]) if data.get("until") else None,
+        )
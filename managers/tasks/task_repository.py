@@ -0,0 +1,127 @@
+import threading
+
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from managers.tasks.task_writer import TaskWriter
+
+
+class TaskRepository:
+    """
+    Single entry point for all Task writes of a process, with unit of work semantics.
+    - A change is a TaskJournal record or a full snapshot, a snapshot replaces the earlier changes of its unit.
+    - Inside unit_of_work() changes are collected and handed to the TaskWriter once, when the outermost unit ends.
+    - Outside a unit, every change is its own unit.
+    - Every thread collects its own unit. The lock is only held while a unit is handed to the TaskWriter,
+      so units of different threads never interleave and a long unit never blocks other threads or the TaskWriter.
+    - The TaskFileManager also holds the lock to change its synced_version, which the TaskWriter thread advances.
+    - Changes of the calling thread's open unit stay readable through get_pending().
+    - write_counts keeps the number of committed units, snapshots and records, for tests and profiling.
+    """
+    def __init__(self, task_writer: TaskWriter):
+        self.task_writer: TaskWriter = task_writer
+        self.lock: threading.RLock = threading.RLock()
+        self._local: threading.local = threading.local()
+        self.write_counts: dict[str, int] = {"units": 0, "snapshots": 0, "records": 0}
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator["TaskRepository"]:
+        """
+        Collects all changes made inside and commits them at once on exit.
+        Changes are already applied in memory, so they are committed even on errors.
+        Nested units commit with the outermost one.
+        """
+        unit = self._get_unit()
+        unit.depth += 1
+        try:
+            yield self
+        finally:
+            unit.depth -= 1
+            if unit.depth == 0:
+                self._commit(unit)
+
+    def save_snapshot(self, data: dict[str, list[dict[str, Any]]]) -> Future:
+        """Adds a full snapshot of the Task data, returns a Future that resolves once its unit is on disk."""
+        with self.unit_of_work():
+            unit = self._get_unit()
+            unit.snapshot = data
+            unit.records = []
+            return self._get_future(unit)
+
+    def add_record(self, record: dict[str, Any]) -> Future:
+        """Adds a TaskJournal record, returns a Future that resolves once its unit is on disk."""
+        with self.unit_of_work():
+            unit = self._get_unit()
+            unit.records.append(record)
+            return self._get_future(unit)
+
+    def flushed(self) -> Future:
+        """Returns a Future that resolves once all changes so far, including those of an open unit, are on disk."""
+        unit = self._get_unit()
+        if unit.depth == 0:
+            return self.task_writer.flushed()
+        return self._get_future(unit)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until all committed changes are on disk. Returns False on timeout.
+        Changes of a unit that is still open are not committed yet and not waited for.
+        """
+        return self.task_writer.flush(timeout)
+
+    def get_pending(self) -> tuple[dict | None, list[dict[str, Any]]]:
+        """
+        Returns the changes that may not be on disk yet, queued in the TaskWriter or collected by the open unit
+         of the calling thread:
+        - The latest pending snapshot, or None.
+        - The journal records after that snapshot.
+        Both are shared with the queue and the open unit and must be treated as read-only.
+        """
+        unit = self._get_unit()
+        if unit.snapshot is not None:
+            return unit.snapshot, list(unit.records)
+
+        with self.lock:
+            snapshot, records = self.task_writer.get_pending()
+        return snapshot, records + unit.records
+
+    def _get_unit(self) -> threading.local:
+        """Returns the unit of work state of the calling thread."""
+        unit = self._local
+        if not hasattr(unit, "depth"):
+            unit.depth = 0
+            unit.snapshot = None
+            unit.records = []
+            unit.future = None
+        return unit
+
+    def _get_future(self, unit: threading.local) -> Future:
+        if unit.future is None:
+            unit.future = Future()
+        return unit.future
+
+    def _commit(self, unit: threading.local) -> None:
+        """Hands the collected changes to the TaskWriter in one submission."""
+        snapshot, records, future = unit.snapshot, unit.records, unit.future
+        unit.snapshot, unit.records, unit.future = None, [], None
+
+        with self.lock:
+            if snapshot is None and not records:
+                writer_future = self.task_writer.flushed()
+            else:
+                writer_future = self.task_writer.submit_unit(snapshot, records)
+                self.write_counts["units"] += 1
+                self.write_counts["snapshots"] += snapshot is not None
+                self.write_counts["records"] += len(records)
+
+        if future is not None:
+            writer_future.add_done_callback(lambda done: TaskRepository._resolve(future, done))
+
+    @staticmethod
+    def _resolve(future: Future, done: Future) -> None:
+        error = done.exception()
+        if error:
+            future.set_exception(error)
+        else:
+            future.set_result(True)
@@ -0,0 +1,117 @@
+import heapq
+import itertools
+
+from datetime import datetime
+from typing import Iterator
+
+from managers.tasks.task import Task
+from managers.tasks.task_slot_index import TaskSlotIndex
+
+
+class TaskScheduler:
+
+    COMPACT_FACTOR: int = 2
+    COMPACT_MINIMUM: int = 64
+
+    """
+    Priority queue of active Tasks, earliest timestamp first.
+    - Heap of (timestamp, sequence, task_id) with lazy deletion.
+    - Insert, remove, reschedule and pop are O(log n), peek is amortized O(1).
+    - Tasks with equal timestamps keep their insertion order.
+    - A Task's timestamp must not change without rescheduling it.
+    - Keeps a TaskSlotIndex of the scheduled timestamps.
+    """
+    def __init__(self, tasks: list[Task] | None = None):
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._entries: dict[str, tuple[int, Task]] = {}
+        self._sequence: Iterator[int] = itertools.count()
+        self.slots: TaskSlotIndex = TaskSlotIndex()
+        if tasks:
+            self.load(tasks)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def __iter__(self) -> Iterator[Task]:
+        """Iterates the scheduled Tasks in no particular order."""
+        return (task for _, task in self._entries.values())
+
+    def load(self, tasks: list[Task]) -> None:
+        """Replaces all scheduled Tasks, O(n)."""
+        self._heap = []
+        self._entries = {}
+        for task in tasks:
+            sequence = next(self._sequence)
+            self._entries[task.task_id] = (sequence, task)
+            self._heap.append((task.timestamp, sequence, task.task_id))
+
+        heapq.heapify(self._heap)
+        self.slots.load(tasks)
+
+    def get(self, task_id: str | None) -> Task | None:
+        """Returns the scheduled Task by ID, or None."""
+        entry = self._entries.get(task_id)
+        return entry[1] if entry else None
+
+    def insert(self, task: Task) -> None:
+        """Schedules a Task, or reschedules it if it is already scheduled."""
+        sequence = next(self._sequence)
+        self._entries[task.task_id] = (sequence, task)
+        heapq.heappush(self._heap, (task.timestamp, sequence, task.task_id))
+        self.slots.add(task)
+        self._compact()
+
+    reschedule = insert
+
+    def remove(self, task_id: str) -> Task | None:
+        """Unschedules a Task by ID and returns it, or None if it was not scheduled."""
+        entry = self._entries.pop(task_id, None)
+        if entry is None:
+            return None
+
+        self.slots.remove(task_id)
+        self._compact()
+        return entry[1]
+
+    def peek(self) -> Task | None:
+        """Returns the earliest Task without removing it."""
+        self._discard_stale()
+        if not self._heap:
+            return None
+
+        return self._entries[self._heap[0][2]][1]
+
+    def pop(self) -> Task | None:
+        """Removes and returns the earliest Task."""
+        self._discard_stale()
+        if not self._heap:
+            return None
+
+        _, _, task_id = heapq.heappop(self._heap)
+        self.slots.remove(task_id)
+        return self._entries.pop(task_id)[1]
+
+    def nsmallest(self, count: int) -> list[Task]:
+        """Returns the earliest count Tasks, earliest first."""
+        entries = heapq.nsmallest(count, ((task.timestamp, sequence, task)
+                                          for sequence, task in self._entries.values()),
+                                  key=lambda entry: entry[:2])
+        return [task for _, _, task in entries]
+
+    def _is_stale(self, heap_entry: tuple[datetime, int, str]) -> bool:
+        entry = self._entries.get(heap_entry[2])
+        return entry is None or entry[0] != heap_entry[1]
+
+    def _discard_stale(self) -> None:
+        while self._heap and self._is_stale(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        """Rebuilds the heap once removed entries outnumber the scheduled Tasks."""
+        if len(self._heap) > max(TaskScheduler.COMPACT_MINIMUM,
+                                 TaskScheduler.COMPACT_FACTOR * len(self._entries)):
+            self._heap = [entry for entry in self._heap if not self._is_stale(entry)]
+            heapq.heapify(self._heap)
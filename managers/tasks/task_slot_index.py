@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from managers.tasks.task import Task
+
+
+class TaskSlotIndex:
+    """
+    Hash index of the timestamps occupied by Tasks.
+    - Exact timestamps, used to find a free snooze slot.
+    - Remembers where each Task was indexed, so Tasks can be removed after their timestamp was edited.
+    """
+    def __init__(self, tasks: Iterable[Task] | None = None):
+        self._task_slots: dict[str, datetime] = {}
+        self._slots: dict[datetime, int] = {}
+        if tasks:
+            self.load(tasks)
+
+    def __len__(self) -> int:
+        return len(self._task_slots)
+
+    def load(self, tasks: Iterable[Task]) -> None:
+        """Replaces all indexed Tasks."""
+        self._task_slots = {}
+        self._slots = {}
+        for task in tasks:
+            self.add(task)
+
+    def add(self, task: Task) -> None:
+        """Indexes a Task at its current timestamp, re-indexes it if already indexed."""
+        if task.task_id in self._task_slots:
+            self.remove(task.task_id)
+
+        timestamp = task.timestamp
+        self._task_slots[task.task_id] = timestamp
+        self._slots[timestamp] = self._slots.get(timestamp, 0) + 1
+
+    def remove(self, task_id: str) -> None:
+        """Removes a Task from the index."""
+        timestamp = self._task_slots.pop(task_id, None)
+        if timestamp is None:
+            return
+
+        count = self._slots[timestamp] - 1
+        if count:
+            self._slots[timestamp] = count
+        else:
+            del self._slots[timestamp]
+
+    def is_taken(self, timestamp: datetime) -> bool:
+        """Returns True if a Task has exactly this timestamp."""
+        return timestamp in self._slots
+
+    def first_free(self, timestamp: datetime, step_seconds: int) -> datetime:
+        """
+        Returns the first timestamp, starting at timestamp and moving in steps, that no Task occupies.
+        Each step is a hash lookup, so only Tasks on the same step grid are visited.
+        """
+        step = timedelta(seconds=step_seconds)
+        while timestamp in self._slots:
+            timestamp += step
+
+        return timestamp
@@ -0,0 +1,638 @@
+import json
+import os
+import sqlite3
+import threading
+import zlib
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Iterable
+
+from managers.tasks.task_codec import TaskCodec
+from managers.tasks.task_journal import TaskJournal
+from src.utils.logger import logger
+
+
+def is_valid_task_data(data: Any) -> bool:
+    """Returns True if the data has the Task file layout {date_key: [task_dict, ...]}."""
+    if not isinstance(data, dict):
+        return False
+
+    for date_key, tasks_data in data.items():
+        # Check date_key isstring
+        if not isinstance(date_key, str):
+            logger.error(f"Error validating TaskData, date_key != str: {type(date_key)=}")
+            return False
+
+        # Check tasks_data is list
+        if not isinstance(tasks_data, list):
+            logger.error(f"Error validating TaskData, tasks_data != list: {type(tasks_data)=}")
+            return False
+
+        # Check Tasks are dicts
+        for task_data in tasks_data:
+            if not isinstance(task_data, dict):
+                logger.error(f"Error validating TaskData, task_data != dict: {type(task_data)=}")
+                return False
+
+    return True
+
+
+def migrate_task_store(source: "TaskStore", target: "TaskStore") -> int:
+    """
+    One-shot copy of all Task data from one TaskStore to another.
+    Returns the number of migrated Tasks.
+    """
+    data = source.read()
+    if not is_valid_task_data(data):
+        logger.error("Error migrating Task data, source data is invalid")
+        data = {}
+
+    target.write_snapshot(data)
+    task_count = sum(len(tasks_data) for tasks_data in data.values())
+    logger.info(f"Migrated {len(data)} TaskGroups with {task_count} Tasks "
+                f"from {type(source).__name__} to {type(target).__name__}")
+    return task_count
+
+
+class TaskSnapshot(dict):
+    """
+    Task data {date_key: [task_dict, ...]} with pre-serialized TaskGroups.
+    - fragments maps a date key to json.dumps(tasks_data, indent=2) of its unchanged TaskGroup.
+    - JSON based stores splice the fragments in instead of serializing those TaskGroups again.
+    - base_version is the TaskStoreVersion the data is based on, None if it replaces the data regardless.
+    """
+    def __init__(self, data: dict[str, list[dict[str, Any]]], fragments: dict[str, str] | None = None,
+                 base_version: int | None = None):
+        super().__init__(data)
+        self.fragments: dict[str, str] = fragments if fragments is not None else {}
+        self.base_version: int | None = base_version
+
+
+def get_fragment(data: dict[str, list[dict[str, Any]]], date_key: str) -> str:
+    """Returns json.dumps(data[date_key], indent=2), taken from the TaskSnapshot fragments if available."""
+    fragment = data.fragments.get(date_key) if isinstance(data, TaskSnapshot) else None
+    return fragment if fragment is not None else json.dumps(data[date_key], indent=2)
+
+
+def dump_task_data(data: dict[str, list[dict[str, Any]]]) -> str:
+    """Returns json.dumps(data, indent=2), splicing in the fragments of a TaskSnapshot."""
+    if not isinstance(data, TaskSnapshot) or not data.fragments or not data:
+        return json.dumps(data, indent=2)
+
+    # Fragments are top level JSON, nest them one level deeper
+    parts = [f"  {json.dumps(date_key)}: {get_fragment(data, date_key).replace(chr(10), chr(10) + '  ')}"
+             for date_key in data]
+    return "{\n" + ",\n".join(parts) + "\n}"
+
+
+def stat_signature(path: str) -> tuple[int, int, int] | None:
+    """Returns (inode, size, mtime_ns) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    except FileNotFoundError:
+        return None
+
+
+def write_file_atomic(path: str, content: str | bytes) -> None:
+    """
+    Writes content to a temporary file and renames it over the target.
+    A partial write never corrupts the file the other process is reading.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb" if isinstance(content, bytes) else "w") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(temp_path, path)
+
+
+class TaskStore(ABC):
+
+    PARTIAL_READS: bool = True
+    JSON_FRAGMENTS: bool = False
+
+    """
+    Base class for Task storage backends used by the TaskFileManager.
+    - read() returns Task data in the Task file layout {date_key: [task_dict, ...]}.
+    - write_snapshot(), write_records() and compact() run on the TaskWriter thread.
+    - PARTIAL_READS is False if reading some date keys costs as much as reading all.
+    - JSON_FRAGMENTS is True if write_snapshot() uses the fragments of a TaskSnapshot.
+    - Backends must implement read(), write_snapshot() and write_records().
+    """
+    def get_signature(self) -> Any:
+        """
+        Returns a cheap value that changes whenever the stored data changes, used by the TaskReadCache.
+        None means the data can not be validated and is never cached.
+        """
+        return None
+
+    @abstractmethod
+    def read(self, date_keys: Iterable[str] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Returns the Task data, limited to the given date keys if provided."""
+
+    @abstractmethod
+    def write_snapshot(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        """Replaces all stored Task data."""
+
+    @abstractmethod
+    def write_records(self, records: list[dict[str, Any]]) -> None:
+        """Applies TaskJournal records to the stored Task data."""
+
+    def compact(self) -> None:
+        """Folds pending changes into their final form, if the backend needs it."""
+        pass
+
+    def needs_compaction(self) -> bool:
+        """Returns True if compact() should be queued."""
+        return False
+
+    def read_active(self) -> dict[str, list[dict[str, Any]]]:
+        """Returns at least all non-expired Tasks, grouped by date key."""
+        return self.read(self.get_active_date_keys())
+
+    def find_task(self, task_id: str) -> tuple[str, dict[str, Any]] | None:
+        """Returns the date key and Task dict of a Task by ID, or None."""
+        for date_key, tasks_data in self.read().items():
+            for task_data in tasks_data:
+                if task_data["task_id"] == task_id:
+                    return date_key, task_data
+
+        return None
+
+    def get_date_keys(self) -> list[str]:
+        """Returns all stored date keys."""
+        return list(self.read().keys())
+
+    def get_active_date_keys(self) -> list[str]:
+        """Returns the date keys that contain at least one non-expired Task."""
+        return [date_key for date_key, tasks_data in self.read().items()
+                if any(not task_data["expired"] for task_data in tasks_data)]
+
+    def validate(self) -> bool:
+        """Returns True if the stored Task data is valid."""
+        return is_valid_task_data(self.read())
+
+
+class JsonTaskStore(TaskStore):
+
+    PARTIAL_READS: bool = False
+    JSON_FRAGMENTS: bool = True
+    MAX_READ_RETRIES: int = 5
+
+    """
+    Stores all TaskGroups in one JSON snapshot with a TaskJournal on top.
+    - Single Task mutations are appended to the journal.
+    - The journal is folded back into the snapshot once it grows too large.
+    - Reads are retried if the files changed while reading, e.g. by a compaction of the other process.
+    """
+    def __init__(self, task_file_path: str, journal_path: str):
+        self.task_file_path: str = task_file_path
+        self.task_journal: TaskJournal = TaskJournal(journal_path)
+        # Keeps reads from seeing a half-finished snapshot and journal swap
+        self._file_lock: threading.Lock = threading.Lock()
+
+    def get_signature(self) -> tuple:
+        """Snapshot is replaced atomically and the journals are append-only, so their stats cover all changes."""
+        return (stat_signature(self.task_file_path),
+                stat_signature(self.task_journal.journal_path),
+                stat_signature(self.task_journal.rotated_path))
+
+    def read(self, date_keys: Iterable[str] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Returns the snapshot with the journal replayed on top."""
+        with self._file_lock:
+            for _ in range(JsonTaskStore.MAX_READ_RETRIES):
+                signature = self.get_signature()
+                data = self._read_snapshot()
+                if isinstance(data, dict):
+                    self.task_journal.replay(data)
+
+                # The other process may have compacted between reading the snapshot and the journals,
+                #  then the old snapshot was read without the folded records
+                if self.get_signature() == signature:
+                    break
+            else:
+                logger.warning("Task file kept changing while reading, using the last read")
+
+        if date_keys is None or not isinstance(data, dict):
+            return data
+
+        date_keys = set(date_keys)
+        return {date_key: tasks_data for date_key, tasks_data in data.items() if date_key in date_keys}
+
+    def _read_snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        """Returns the Task data snapshot from the Task file."""
+        with open(self.task_file_path, "r") as f:
+            return json.load(f)
+
+    def _write_snapshot_file(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        """Atomically replaces the Task file with the snapshot."""
+        write_file_atomic(self.task_file_path, dump_task_data(data))
+
+    def write_snapshot(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        """Atomically replaces the Task file with the snapshot and clears the journal."""
+        with self._file_lock:
+            self._write_snapshot_file(data)
+            self.task_journal.clear()
+
+    def write_records(self, records: list[dict[str, Any]]) -> None:
+        """Appends the records to the journal."""
+        self.task_journal.write_records(records)
+
+    def needs_compaction(self) -> bool:
+        return self.task_journal.needs_compaction()
+
+    def compact(self) -> None:
+        """
+        Folds the journal back into the snapshot.
+        - Rotates the journal, new records from the other process go to a fresh journal meanwhile.
+        - Writes the snapshot with the rotated records applied.
+        - Removes the rotated journal.
+        """
+        with self._file_lock:
+            if not self.task_journal.rotate():
+                return
+
+            # Only fold the rotated records, new records stay in the journal
+            data = self._read_snapshot()
+            self.task_journal.replay_rotated(data)
+
+            self._write_snapshot_file(data)
+            self.task_journal.remove_rotated()
+
+        logger.debug("Compacted Task journal into Task file")
+
+
+class BinaryTaskStore(JsonTaskStore):
+
+    JSON_FRAGMENTS: bool = False
+
+    """
+    JsonTaskStore with the snapshot in the compact TaskCodec format.
+    - Uses the same TaskJournal for single Task mutations.
+    - On first use, an existing JSON Task file is converted.
+    """
+    def __init__(self, binary_path: str, journal_path: str, legacy_store: JsonTaskStore | None = None):
+        super().__init__(binary_path, journal_path)
+        if not os.path.exists(self.task_file_path):
+            self._migrate(legacy_store)
+
+    def _migrate(self, legacy_store: JsonTaskStore | None) -> None:
+        """Converts the legacy JSON Task file, or starts empty."""
+        if legacy_store and os.path.exists(legacy_store.task_file_path):
+            try:
+                migrate_task_store(legacy_store, self)
+                return
+
+            except Exception as e:
+                logger.error(f"Error migrating legacy Task file to binary: {e}")
+
+        self.write_snapshot({})
+
+    def _read_snapshot(self) -> dict[str, list[dict[str, Any]]]:
+        with open(self.task_file_path, "rb") as f:
+            return TaskCodec.decode(f.read())
+
+    def _write_snapshot_file(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        write_file_atomic(self.task_file_path, TaskCodec.encode(data))
+
+
+class ShardedTaskStore(TaskStore):
+
+    MANIFEST_FILE: str = "manifest.json"
+    JSON_FRAGMENTS: bool = True
+
+    """
+    Stores each TaskGroup in its own shard file, named after its date key.
+    - A small manifest keeps the Task count, active Task count and checksum per shard.
+    - Reads only open the shards that are asked for.
+    - Writes only rewrite the shards that changed.
+    - Dropping a TaskGroup is a shard unlink.
+    - On first use, an existing single JSON Task file is split into shards.
+    """
+    def __init__(self, shard_dir: str, legacy_store: JsonTaskStore | None = None):
+        self.shard_dir: str = shard_dir
+        self.manifest_path: str = os.path.join(shard_dir, ShardedTaskStore.MANIFEST_FILE)
+        self._file_lock: threading.Lock = threading.Lock()
+
+        os.makedirs(self.shard_dir, exist_ok=True)
+        if not os.path.exists(self.manifest_path):
+            self._migrate(legacy_store)
+
+    def _migrate(self, legacy_store: JsonTaskStore | None) -> None:
+        """Splits the legacy single Task file into shards, or starts empty."""
+        if legacy_store and os.path.exists(legacy_store.task_file_path):
+            try:
+                migrate_task_store(legacy_store, self)
+                return
+
+            except Exception as e:
+                logger.error(f"Error migrating legacy Task file to shards: {e}")
+
+        self.write_snapshot({})
+
+    def get_signature(self) -> tuple[int, int, int] | None:
+        """Every write replaces the manifest, so a single stat covers all shards."""
+        return stat_signature(self.manifest_path)
+
+    def _get_shard_path(self, date_key: str) -> str:
+        """Returns the shard file path for a date key."""
+        return os.path.join(self.shard_dir, f"{date_key}.json")
+
+    def _read_manifest(self) -> dict[str, dict[str, int]]:
+        """Returns the manifest {date_key: {"tasks", "active", "crc"}}."""
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+
+        except FileNotFoundError:
+            return {}
+
+    def _write_manifest(self, manifest: dict[str, dict[str, int]]) -> None:
+        write_file_atomic(self.manifest_path, json.dumps(manifest, sort_keys=True))
+
+    def _read_shard(self, date_key: str) -> list[dict[str, Any]]:
+        """Returns the Task dicts of a single shard."""
+        try:
+            with open(self._get_shard_path(date_key), "r") as f:
+                return json.load(f)
+
+        except FileNotFoundError:
+            logger.error(f"Missing Task shard for {date_key}")
+            return []
+
+    def _write_shard(self, manifest: dict[str, dict[str, int]],
+                     date_key: str, tasks_data: list[dict[str, Any]], content: str | None = None) -> None:
+        """Writes a single shard if its content changed and updates its manifest entry."""
+        content = content if content is not None else json.dumps(tasks_data, indent=2)
+        crc = zlib.crc32(content.encode())
+        entry = manifest.get(date_key)
+        if entry and entry["crc"] == crc:
+            return
+
+        write_file_atomic(self._get_shard_path(date_key), content)
+        manifest[date_key] = {
+            "tasks": len(tasks_data),
+            "active": sum(1 for task_data in tasks_data if not task_data["expired"]),
+            "crc": crc,
+        }
+
+    def _drop_shard(self, manifest: dict[str, dict[str, int]], date_key: str) -> None:
+        """Unlinks a shard and removes it from the manifest."""
+        manifest.pop(date_key, None)
+        try:
+            os.remove(self._get_shard_path(date_key))
+        except FileNotFoundError:
+            pass
+
+    def read(self, date_keys: Iterable[str] | None = None) -> dict[str, list[dict[str, Any]]]:
+        """Returns the Task data of the requested shards, or of all shards."""
+        with self._file_lock:
+            manifest = self._read_manifest()
+            keys = manifest.keys() if date_keys is None else [key for key in date_keys if key in manifest]
+            return {date_key: self._read_shard(date_key) for date_key in sorted(keys)}
+
+    def write_snapshot(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        """Rewrites changed shards, unlinks shards that are no longer present."""
+        with self._file_lock:
+            manifest = self._read_manifest()
+            for date_key in list(manifest.keys()):
+                if date_key not in data or not data[date_key]:
+                    self._drop_shard(manifest, date_key)
+
+            for date_key, tasks_data in data.items():
+                if tasks_data:
+                    self._write_shard(manifest, date_key, tasks_data, get_fragment(data, date_key))
+
+            self._write_manifest(manifest)
+
+    def write_records(self, records: list[dict[str, Any]]) -> None:
+        """Loads only the shards the records touch, applies them and writes them back."""
+        with self._file_lock:
+            manifest = self._read_manifest()
+            date_keys = set()
+            for record in records:
+                date_key = record.get("date_key")
+                if date_key:
+                    date_keys.add(date_key)
+                else:
+                    date_keys.update(self._find_task_shards(manifest, record["task_id"]))
+
+            data = {date_key: self._read_shard(date_key) for date_key in date_keys if date_key in manifest}
+            for record in records:
+                TaskJournal.apply_record(data, record)
+
+            for date_key in date_keys:
+                if data.get(date_key):
+                    self._write_shard(manifest, date_key, data[date_key])
+                elif date_key in manifest:
+                    self._drop_shard(manifest, date_key)
+
+            self._write_manifest(manifest)
+
+    def _find_task_shards(self, manifest: dict[str, dict[str, int]], task_id: str) -> list[str]:
+        """
+        Returns the date key of the shard holding the Task.
+        Only used for records without a date key, searches active shards first.
+        """
+        date_keys = sorted(manifest.keys(), key=lambda key: manifest[key]["active"] == 0)
+        for date_key in date_keys:
+            if any(task_data["task_id"] == task_id for task_data in self._read_shard(date_key)):
+                return [date_key]
+
+        return []
+
+    def get_date_keys(self) -> list[str]:
+        return sorted(self._read_manifest().keys())
+
+    def get_active_date_keys(self) -> list[str]:
+        manifest = self._read_manifest()
+        return sorted(date_key for date_key, entry in manifest.items() if entry["active"])
+
+    def validate(self) -> bool:
+        """Only validates the manifest, shards are validated when read."""
+        manifest = self._read_manifest()
+        if not isinstance(manifest, dict):
+            return False
+
+        return all(isinstance(entry, dict) and {"tasks", "active", "crc"} <= entry.keys()
+                   for entry in manifest.values())
+
+
+class SqliteTaskStore(TaskStore):
+
+    BUSY_TIMEOUT: int = 5000   # = 5 seconds
+
+    """
+    Stores Tasks as rows in an SQLite database in WAL mode.
+    - The App and Service can read and write concurrently.
+    - Indexed on task_id, timestamp, (date_key, timestamp) and expired.
+    - Tasks are read in timestamp order, the date_key of a row follows its timestamp.
+    - Task lookups by ID, active Tasks and dropping TaskGroups are indexed queries.
+    - The full Task dict is kept in the data column, so storage is lossless.
+    - On first use, an existing single JSON Task file is migrated into the database.
+    """
+    def __init__(self, db_path: str, legacy_store: JsonTaskStore | None = None):
+        self.db_path: str = db_path
+        self._local: threading.local = threading.local()
+
+        is_new = not os.path.exists(self.db_path)
+        self._create_schema()
+        if is_new and legacy_store and os.path.exists(legacy_store.task_file_path):
+            try:
+                migrate_task_store(legacy_store, self)
+
+            except Exception as e:
+                logger.error(f"Error migrating legacy Task file to SQLite: {e}")
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread, SQLite connections are not shared between threads."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.db_path, timeout=SqliteTaskStore.BUSY_TIMEOUT / 1000)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={SqliteTaskStore.BUSY_TIMEOUT}")
+            self._local.connection = connection
+
+        return connection
+
+    def _create_schema(self) -> None:
+        with self._get_connection() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    date_key TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    expired INTEGER NOT NULL,
+                    data TEXT NOT NULL
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_date_key_timestamp ON tasks (date_key, timestamp)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_timestamp ON tasks (timestamp)")
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_expired ON tasks (expired, timestamp)")
+
+    def get_signature(self) -> int:
+        """
+        Changes when another connection commits, which includes the TaskWriter thread and the other process.
+        """
+        return self._get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+    @staticmethod
+    def _to_row(date_key: str, task_data: dict[str, Any]) -> tuple[str, str, str, int, str]:
+        return (task_data["task_id"], date_key, task_data["timestamp"],
+                int(bool(task_data["expired"])), json.dumps(task_data))
+
+    @staticmethod
+    def _get_date_key(timestamp: str) -> str:
+        """Returns the date key of an ISO timestamp, like Task.get_date_key()."""
+        return datetime.fromisoformat(timestamp).date().isoformat()
+
+    @staticmethod
+    def _group_rows(rows: Iterable[tuple[str, str]]) -> dict[str, list[dict[str, Any]]]:
+        """Groups (date_key, data) rows into the Task file layout."""
+        data = {}
+        for date_key, task_json in rows:
+            data.setdefault(date_key, []).append(json.loads(task_json))
+
+        return data
+
+    def read(self, date_keys: Iterable[str] | None = None) -> dict[str, list[dict[str, Any]]]:
+        connection = self._get_connection()
+        if date_keys is None:
+            rows = connection.execute("SELECT date_key, data FROM tasks ORDER BY date_key, timestamp, task_id")
+            return self._group_rows(rows)
+
+        data = {}
+        for date_key in date_keys:
+            rows = connection.execute("SELECT date_key, data FROM tasks WHERE date_key = ? "
+                                      "ORDER BY timestamp, task_id", (date_key,))
+            data.update(self._group_rows(rows))
+
+        return data
+
+    def read_active(self) -> dict[str, list[dict[str, Any]]]:
+        """Returns only the non-expired Tasks."""
+        rows = self._get_connection().execute(
+            "SELECT date_key, data FROM tasks WHERE expired = 0 ORDER BY timestamp"
+        )
+        return self._group_rows(rows)
+
+    def find_task(self, task_id: str) -> tuple[str, dict[str, Any]] | None:
+        row = self._get_connection().execute(
+            "SELECT date_key, data FROM tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        return row[0], json.loads(row[1])
+
+    def write_snapshot(self, data: dict[str, list[dict[str, Any]]]) -> None:
+        with self._get_connection() as connection:
+            connection.execute("DELETE FROM tasks")
+            connection.executemany(
+                "INSERT OR REPLACE INTO tasks (task_id, date_key, timestamp, expired, data) VALUES (?, ?, ?, ?, ?)",
+                [self._to_row(date_key, task_data) for date_key, tasks_data in data.items()
+                 for task_data in tasks_data]
+            )
+
+    def write_records(self, records: list[dict[str, Any]]) -> None:
+        """Applies all records in a single transaction."""
+        with self._get_connection() as connection:
+            for record in records:
+                self._apply_record(connection, record)
+
+    def _apply_record(self, connection: sqlite3.Connection, record: dict[str, Any]) -> None:
+        op = record.get("op")
+        if op == TaskJournal.OP_ADD:
+            connection.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, date_key, timestamp, expired, data) VALUES (?, ?, ?, ?, ?)",
+                self._to_row(record["date_key"], record["task"])
+            )
+
+        elif op == TaskJournal.OP_UPDATE:
+            row = connection.execute("SELECT date_key, data FROM tasks WHERE task_id = ?",
+                                     (record["task_id"],)).fetchone()
+            if row is None:
+                return
+
+            task_data = json.loads(row[1])
+            task_data.update(record["changes"])
+            # A new timestamp past midnight moves the Task to another date_key
+            connection.execute(
+                "UPDATE tasks SET date_key = ?, timestamp = ?, expired = ?, data = ? WHERE task_id = ?",
+                (self._get_date_key(task_data["timestamp"]), task_data["timestamp"],
+                 int(bool(task_data["expired"])), json.dumps(task_data), record["task_id"])
+            )
+
+        elif op == TaskJournal.OP_REMOVE:
+            connection.execute("DELETE FROM tasks WHERE task_id = ? AND date_key = ?",
+                               (record["task_id"], record["date_key"]))
+
+        elif op == TaskJournal.OP_DROP:
+            connection.execute("DELETE FROM tasks WHERE date_key = ?", (record["date_key"],))
+
+        else:
+            logger.error(f"Unknown journal record op: {op}")
+
+    def get_date_keys(self) -> list[str]:
+        rows = self._get_connection().execute("SELECT DISTINCT date_key FROM tasks ORDER BY date_key")
+        return [row[0] for row in rows]
+
+    def get_active_date_keys(self) -> list[str]:
+        rows = self._get_connection().execute(
+            "SELECT DISTINCT date_key FROM tasks WHERE expired = 0 ORDER BY date_key"
+        )
+        return [row[0] for row in rows]
+
+    def validate(self) -> bool:
+        try:
+            result = self._get_connection().execute("PRAGMA quick_check").fetchone()
+            return result is not None and result[0] == "ok"
+
+        except sqlite3.DatabaseError as e:
+            logger.error(f"Error validating Task database: {e}")
+            return False
@@ -0,0 +1,70 @@
+import os
+import threading
+
+from contextlib import contextmanager
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:
+    # Windows, only the in-process lock is used
+    fcntl = None
+
+
+class TaskStoreVersion:
+
+    WIDTH: int = 20
+
+    """
+    Monotonic version of the stored Task data, shared by the App and Service processes.
+    - Kept in a small sidecar file as a fixed width number, read and written with a single pread/pwrite.
+    - Every commit to the TaskStore bumps it while holding locked().
+    - locked() takes an in-process lock and an advisory fcntl lock on the sidecar,
+      so commits of the App and Service never interleave.
+    - Readers compare it to the version they loaded to skip reloading unchanged data.
+    """
+    def __init__(self, version_path: str):
+        self.version_path: str = version_path
+        self._lock: threading.Lock = threading.Lock()
+
+    def read(self) -> int:
+        """Returns the current version, 0 if nothing was committed yet."""
+        try:
+            fd = os.open(self.version_path, os.O_RDONLY)
+        except FileNotFoundError:
+            return 0
+
+        try:
+            content = os.pread(fd, TaskStoreVersion.WIDTH, 0) if hasattr(os, "pread") else os.read(fd, TaskStoreVersion.WIDTH)
+        finally:
+            os.close(fd)
+
+        return int(content) if content.strip() else 0
+
+    @contextmanager
+    def locked(self) -> Iterator[int]:
+        """Holds the commit lock of both processes, yields the current version."""
+        with self._lock:
+            fd = os.open(self.version_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield self.read()
+            finally:
+                # Closing the file releases the fcntl lock
+                os.close(fd)
+
+    def bump(self) -> int:
+        """Increments the version and returns it, must be called inside locked()."""
+        version = self.read() + 1
+        fd = os.open(self.version_path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            content = f"{version:0{TaskStoreVersion.WIDTH}d}".encode()
+            if hasattr(os, "pwrite"):
+                os.pwrite(fd, content, 0)
+            else:
+                os.write(fd, content)
+        finally:
+            os.close(fd)
+
+        return version
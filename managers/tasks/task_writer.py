@@ -0,0 +1,187 @@
+import threading
+import time
+
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from src.utils.logger import logger
+
+
+class TaskWriter:
+
+    COALESCE_DELAY: float = 0.02   # = 20 milliseconds
+
+    JOB_SNAPSHOT: str = "snapshot"
+    JOB_RECORD: str = "record"
+    JOB_COMPACT: str = "compact"
+    JOB_BARRIER: str = "barrier"
+
+    """
+    Write-behind queue for the Task file, runs on a single background thread.
+    - Snapshot saves, journal records and compactions are committed in order.
+    - Bursts are coalesced, a queued snapshot makes all earlier queued jobs redundant.
+    - Consecutive journal records are written in one append.
+    - Every job returns a Future that resolves once its data is on disk.
+    - Queued data stays readable through get_pending(), so reads never go stale.
+      Queued payloads are never changed after submission, so they are shared with readers, not copied.
+    """
+    def __init__(self,
+                 write_snapshot: Callable[[dict], None],
+                 write_records: Callable[[list[dict]], None],
+                 compact: Callable[[], None]):
+        self._write_snapshot: Callable[[dict], None] = write_snapshot
+        self._write_records: Callable[[list[dict]], None] = write_records
+        self._compact: Callable[[], None] = compact
+
+        self._condition: threading.Condition = threading.Condition()
+        self._queue: list[tuple[str, Any, Future]] = []
+        self._in_flight: list[tuple[str, Any, Future]] = []
+
+        self._thread: threading.Thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit_snapshot(self, data: dict) -> Future:
+        """Queues a full Task data snapshot."""
+        return self._submit(TaskWriter.JOB_SNAPSHOT, data)
+
+    def submit_record(self, record: dict) -> Future:
+        """Queues a single journal record."""
+        return self._submit(TaskWriter.JOB_RECORD, record)
+
+    def submit_unit(self, snapshot: dict | None, records: list[dict]) -> Future:
+        """
+        Queues an optional snapshot followed by journal records in one go.
+        They end up in the same batch and share one Future.
+        """
+        future = Future()
+        with self._condition:
+            if snapshot is not None:
+                self._queue.append((TaskWriter.JOB_SNAPSHOT, snapshot, future))
+            for record in records:
+                self._queue.append((TaskWriter.JOB_RECORD, record, future))
+            self._condition.notify()
+
+        return future
+
+    def submit_compaction(self) -> Future:
+        """Queues folding the journal into the snapshot, unless one is already queued."""
+        with self._condition:
+            for job, _, future in self._queue:
+                if job == TaskWriter.JOB_COMPACT:
+                    return future
+
+        return self._submit(TaskWriter.JOB_COMPACT, None)
+
+    def flushed(self) -> Future:
+        """Returns a Future that resolves once all jobs queued so far are on disk."""
+        return self._submit(TaskWriter.JOB_BARRIER, None)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Blocks until all jobs queued so far are on disk. Returns False on timeout."""
+        try:
+            self.flushed().result(timeout=timeout)
+            return True
+
+        except Exception as e:
+            logger.error(f"Error flushing Task file: {e}")
+            return False
+
+    def get_pending(self) -> tuple[dict | None, list[dict]]:
+        """
+        Returns the data that is queued or being written, but may not be on disk yet:
+        - The latest pending snapshot, or None.
+        - The journal records queued after that snapshot.
+        Both are shared with the queue and must be treated as read-only.
+        """
+        with self._condition:
+            jobs = self._in_flight + self._queue
+            if not jobs:
+                return None, []
+
+            snapshot = None
+            records = []
+            for job, payload, _ in jobs:
+                if job == TaskWriter.JOB_SNAPSHOT:
+                    snapshot = payload
+                    records = []
+                elif job == TaskWriter.JOB_RECORD:
+                    records.append(payload)
+
+            return snapshot, records
+
+    def _submit(self, job: str, payload: Any) -> Future:
+        """Adds a job to the queue and wakes the writer thread."""
+        future = Future()
+        with self._condition:
+            self._queue.append((job, payload, future))
+            self._condition.notify()
+
+        return future
+
+    def _run(self) -> None:
+        """Writer thread loop, commits queued jobs in batches."""
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+
+            # Let a burst of jobs arrive before committing
+            time.sleep(TaskWriter.COALESCE_DELAY)
+
+            with self._condition:
+                self._in_flight = self._queue
+                self._queue = []
+                batch = self._in_flight
+
+            error = self._commit(batch)
+
+            with self._condition:
+                self._in_flight = []
+
+            for _, _, future in batch:
+                # Jobs of one unit share their Future
+                if future.done():
+                    continue
+                if error:
+                    future.set_exception(error)
+                else:
+                    future.set_result(True)
+
+    def _commit(self, batch: list[tuple[str, Any, Future]]) -> Exception | None:
+        """
+        Commits a batch of jobs in order, skipping jobs made redundant by a later snapshot.
+        Returns the first error, or None.
+        """
+        last_snapshot = None
+        for i, (job, _, _) in enumerate(batch):
+            if job == TaskWriter.JOB_SNAPSHOT:
+                last_snapshot = i
+
+        jobs = batch[last_snapshot:] if last_snapshot is not None else batch
+        records = []
+        try:
+            for job, payload, _ in jobs:
+                if job == TaskWriter.JOB_RECORD:
+                    records.append(payload)
+                    continue
+
+                # Write collected records before any other job
+                if records:
+                    self._write_records(records)
+                    records = []
+
+                if job == TaskWriter.JOB_SNAPSHOT:
+                    self._write_snapshot(payload)
+                elif job == TaskWriter.JOB_COMPACT:
+                    self._compact()
+
+            if records:
+                self._write_records(records)
+
+            if len(jobs) < len(batch):
+                logger.trace(f"Coalesced {len(batch)} Task file jobs into {len(jobs)}")
+            return None
+
+        except Exception as e:
+            logger.error(f"Error committing Task file jobs: {e}")
+            return e
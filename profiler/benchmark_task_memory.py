@@ -0,0 +1,104 @@
+"""
+Measures load time and RSS of loading a large Task history into Task objects.
+Each scenario runs in a fresh interpreter, so RSS is not shared between them.
+Usage: python -m profiler.benchmark_task_memory [task_count]
+"""
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime
+
+from managers.tasks.task import Task
+from managers.tasks.task_codec import TaskCodec
+from profiler.benchmark_task_store import generate_task_data
+
+
+TASK_COUNT: int = 50_000
+SCENARIOS: list[str] = ["baseline", "slots", "slots_parsed", "binary", "binary_parsed"]
+
+
+class BaselineTask:
+    """Copy of the Task before __slots__, with a __dict__ and an eagerly parsed timestamp."""
+    def __init__(self, data: dict):
+        self.task_id = data["task_id"]
+        self.message = data["message"]
+        self.timestamp = datetime.fromisoformat(data["timestamp"])
+        self.alarm_name = data["alarm_name"]
+        self.sound = data["sound"]
+        self.vibrate = data["vibrate"]
+        self.expired = data["expired"]
+        self.snooze_time = data["snooze_time"]
+
+
+def get_rss() -> int:
+    """Returns the current resident set size in bytes, from /proc on Linux and Android."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def load(scenario: str, directory: str) -> list:
+    """Loads all Tasks of the scenario the way the TaskStores do, and returns them to keep them alive."""
+    if scenario.startswith("binary"):
+        with open(os.path.join(directory, "task_file.bin"), "rb") as f:
+            data = TaskCodec.decode(f.read())
+    else:
+        with open(os.path.join(directory, "task_file.json"), "r") as f:
+            data = json.load(f)
+
+    if scenario == "baseline":
+        return [BaselineTask(task_data) for tasks_data in data.values() for task_data in tasks_data]
+
+    tasks = [Task.to_class(task_data) for tasks_data in data.values() for task_data in tasks_data]
+    del data
+    if scenario.endswith("_parsed"):
+        for task in tasks:
+            task.timestamp
+    return tasks
+
+
+def run_scenario(scenario: str, directory: str) -> None:
+    """Runs in the child interpreter, prints 'load_ms rss_bytes'."""
+    rss_before = get_rss()
+    start = time.perf_counter()
+    tasks = load(scenario, directory)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"{load_ms:.1f} {get_rss() - rss_before}")
+    del tasks
+
+
+def benchmark(task_count: int) -> None:
+    directory = tempfile.mkdtemp(prefix="bgtask_memory_")
+    try:
+        data = generate_task_data(task_count)
+        with open(os.path.join(directory, "task_file.json"), "w") as f:
+            json.dump(data, f, indent=2)
+        with open(os.path.join(directory, "task_file.bin"), "wb") as f:
+            f.write(TaskCodec.encode(data))
+
+        print(f"\n{task_count} Tasks")
+        print(f"{'scenario':<16}{'load':>12}{'RSS':>12}")
+        for scenario in SCENARIOS:
+            result = subprocess.run([sys.executable, "-m", "profiler.benchmark_task_memory", "--scenario",
+                                     scenario, directory], capture_output=True, text=True, check=True)
+            load_ms, rss = result.stdout.split()
+            print(f"{scenario:<16}{float(load_ms):>10.1f}ms{int(rss) / 1024 / 1024:>10.1f}MB")
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--scenario":
+        run_scenario(sys.argv[2], sys.argv[3])
+    else:
+        benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else TASK_COUNT)
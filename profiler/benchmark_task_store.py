@@ -0,0 +1,96 @@
+"""
+Compares the TaskStore backends on generated Task data.
+Usage: python -m profiler.benchmark_task_store [task_count ...]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from managers.tasks.task_journal import TaskJournal
+from managers.tasks.task_store import TaskStore, JsonTaskStore, BinaryTaskStore, ShardedTaskStore, SqliteTaskStore
+
+
+TASK_COUNTS: list[int] = [1_000, 10_000, 100_000]
+TASKS_PER_DAY: int = 20
+
+
+def generate_task_data(task_count: int) -> dict[str, list[dict[str, Any]]]:
+    """Returns Task data with TASKS_PER_DAY Tasks per day, mostly expired history."""
+    start = datetime.now().replace(second=0, microsecond=0) - timedelta(days=task_count // TASKS_PER_DAY - 7)
+    data = {}
+    for i in range(task_count):
+        timestamp = start + timedelta(days=i // TASKS_PER_DAY, minutes=(i % TASKS_PER_DAY) * 30)
+        data.setdefault(timestamp.date().isoformat(), []).append({
+            "task_id": str(uuid.uuid4()),
+            "timestamp": timestamp.isoformat(),
+            "message": f"Benchmark Task {i}",
+            "alarm_name": "classic",
+            "sound": "once",
+            "vibrate": "off",
+            "expired": timestamp < datetime.now(),
+            "snooze_time": 0,
+        })
+
+    return data
+
+
+def measure(func: Callable[[], Any], repeat: int = 3) -> float:
+    """Returns the best duration of func in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best * 1000
+
+
+def create_stores(directory: str) -> dict[str, TaskStore]:
+    return {
+        "json": JsonTaskStore(os.path.join(directory, "task_file.json"),
+                              os.path.join(directory, "task_file.journal")),
+        "binary": BinaryTaskStore(os.path.join(directory, "task_file.bin"),
+                                  os.path.join(directory, "task_file.bin.journal")),
+        "sharded": ShardedTaskStore(os.path.join(directory, "task_shards")),
+        "sqlite": SqliteTaskStore(os.path.join(directory, "task_file.db")),
+    }
+
+
+def benchmark(task_count: int) -> None:
+    data = generate_task_data(task_count)
+    date_keys = sorted(data.keys())
+    target_key = date_keys[-1]
+    target_task = data[target_key][-1]
+    old_key = date_keys[0]
+
+    print(f"\n{task_count} Tasks in {len(date_keys)} TaskGroups")
+    print(f"{'backend':<10}{'snapshot':>12}{'read all':>12}{'active':>12}{'find id':>12}{'update':>12}{'drop day':>12}")
+
+    directory = tempfile.mkdtemp(prefix="bgtask_benchmark_")
+    try:
+        for name, store in create_stores(directory).items():
+            snapshot_ms = measure(lambda: store.write_snapshot(data), repeat=1)
+            read_ms = measure(lambda: store.read())
+            active_ms = measure(lambda: store.read_active())
+            find_ms = measure(lambda: store.find_task(target_task["task_id"]))
+            update_ms = measure(lambda: store.write_records([
+                TaskJournal.update_record(target_task["task_id"], {"snooze_time": 30}, target_key)
+            ]))
+            drop_ms = measure(lambda: store.write_records([TaskJournal.drop_record(old_key)]), repeat=1)
+            print(f"{name:<10}{snapshot_ms:>10.1f}ms{read_ms:>10.1f}ms{active_ms:>10.1f}ms"
+                  f"{find_ms:>10.2f}ms{update_ms:>10.2f}ms{drop_ms:>10.2f}ms")
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    counts = [int(arg) for arg in sys.argv[1:]] or TASK_COUNTS
+    for count in counts:
+        benchmark(count)
@@ -0,0 +1,272 @@
+"""
+Replays days of Tasks, snoozes and cancels through the ServiceLoop and ExpiryManager in virtual time.
+Runs on plain Linux: Android notifications, the alarm and the heartbeat flag are counted instead of shown or written.
+Task data is written to a temporary directory with the configured TaskStore.
+The App is not simulated, Tasks due while it is in the foreground expire once it leaves the foreground.
+Its foreground state is published on a StatusPage like TaskApp does, running process enumerations are counted.
+Usage: python -m profiler.simulate_service [days] [tasks_per_day] [foreground_minutes_per_hour]
+"""
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from managers.device.device_manager import DM
+from managers.device.status_page import StatusPage
+from managers.tasks.expiry_manager import ExpiryManager
+from managers.tasks.task import Task
+from service.service_app_state import ServiceAppState
+from service.service_job_registry import ServiceJob
+from service.service_loop import ServiceLoop
+from src.utils.clock import VirtualClock
+from src.utils.logger import logger
+
+
+DAYS: int = 1
+TASKS_PER_DAY: int = 20
+FOREGROUND_MINUTES_PER_HOUR: int = 0
+SNOOZE_CHANCE: float = 0.3
+CANCEL_CHANCE: float = 0.5
+REACTION_SECONDS: tuple[int, int] = (5, 120)
+HOURLY_ROWS_MAX_DAYS: int = 2
+SEED: int = 42
+
+# Same periods as ServiceManager._register_jobs
+HEARTBEAT_INTERVAL: int = DM.SETTINGS.SERVICE_HEARTBEAT_INTERVAL
+FOREGROUND_NOTIFICATION_INTERVAL: int = 60
+EXPIRY_LOG_INTERVAL: int = 30
+JOB_JITTER: int = DM.SETTINGS.SERVICE_JOB_JITTER
+
+
+class SimulatedExpiryManager(ExpiryManager):
+    """ServiceExpiryManager without the alarm."""
+    def _handle_snoozed_task(self, snoozed_task: Task) -> None:
+        self._refresh_task(snoozed_task)
+
+    def _handle_cancelled_task(self, cancelled_task: Task) -> None:
+        self._refresh_task(cancelled_task)
+
+
+class ServiceSimulation:
+    """
+    Drives a ServiceLoop with a VirtualClock.
+    - Expiry is handled like ServiceManager._handle_task_expiry, user reactions like the notification actions.
+    - Each expired Task is snoozed, cancelled or ignored after a random reaction time.
+    - The App enters the foreground at the start of every hour for foreground_minutes and publishes its state.
+    - Counts expiry latency, file writes, notification updates, loop wake-ups and running process enumerations
+      per simulated hour. Before the App published its state, every wake-up enumerated the running processes.
+    """
+    def __init__(self, start: datetime, days: int, tasks_per_day: int, foreground_minutes: int):
+        self.rng: random.Random = random.Random(SEED)
+        self.start: datetime = start
+        self.end: datetime = start + timedelta(days=days)
+        self.foreground_minutes: int = foreground_minutes
+        self.clock: VirtualClock = VirtualClock(start)
+        self.stats: defaultdict[int, defaultdict[str, float]] = defaultdict(lambda: defaultdict(float))
+
+        self.expiry_manager: SimulatedExpiryManager = SimulatedExpiryManager(self.clock)
+        self.expiry_manager.save_task_file(self._generate_task_data(days, tasks_per_day))
+        self.expiry_manager.flush_task_file()
+        self.expiry_manager._refresh_tasks()
+        self._store_writes: int = self._get_store_writes()
+
+        self.status_page: StatusPage = StatusPage(DM.PATH.STATUS_PAGE_FILE)
+        self.app_state: ServiceAppState = ServiceAppState(self.clock, self.status_page, self._get_running_app_state)
+        self.loop: ServiceLoop = ServiceLoop(self.expiry_manager, self.clock, self.status_page)
+        self._register_jobs()
+        self._schedule_app_states(days)
+        self.clock.call_at(self.end.timestamp(), self.loop.stop)
+
+    def run(self) -> None:
+        self.loop.run(self._is_app_in_foreground, self._check_task_expiry)
+        self._count_store_writes()
+        self.expiry_manager.flush_task_file()
+
+    def _generate_task_data(self, days: int, tasks_per_day: int) -> dict[str, list[dict]]:
+        """Returns Tasks on distinct minutes of every simulated day."""
+        data = {}
+        for day in range(days):
+            day_start = self.start + timedelta(days=day)
+            for minute in sorted(self.rng.sample(range(1, 24 * 60), tasks_per_day)):
+                task = Task(message=f"Simulated Task {day}-{minute}",
+                            timestamp=day_start + timedelta(minutes=minute),
+                            snooze_time=0)
+                data.setdefault(task.get_date_key(), []).append(task.to_json())
+        return data
+
+    def _register_jobs(self) -> None:
+        jobs = self.loop.jobs
+        jobs.register("heartbeat", lambda: self._count("heartbeat_writes"),
+                      HEARTBEAT_INTERVAL, JOB_JITTER)
+        # Only updates the notification if it was dismissed, which does not happen here
+        jobs.register("foreground_notification", lambda: None,
+                      FOREGROUND_NOTIFICATION_INTERVAL, JOB_JITTER)
+        jobs.register("expiry_log", lambda: None,
+                      EXPIRY_LOG_INTERVAL, EXPIRY_LOG_INTERVAL, eligibility=ServiceJob.RUN_BACKGROUND)
+
+    def _schedule_app_states(self, days: int) -> None:
+        """Schedules the App's foreground transitions and refreshes, like TaskApp publishes them."""
+        self._publish_app_state(False)
+        if not self.foreground_minutes:
+            return
+
+        foreground_seconds = self.foreground_minutes * 60
+        for hour in range(days * 24):
+            hour_start = self.start.timestamp() + hour * 3600
+            self.clock.call_at(hour_start, lambda: self._publish_app_state(True, transition=True))
+            for refresh in range(StatusPage.APP_REFRESH_INTERVAL, foreground_seconds, StatusPage.APP_REFRESH_INTERVAL):
+                self.clock.call_at(hour_start + refresh, lambda: self._publish_app_state(True))
+            if foreground_seconds < 3600:
+                self.clock.call_at(hour_start + foreground_seconds,
+                                   lambda: self._publish_app_state(False, transition=True))
+
+    def _publish_app_state(self, in_foreground: bool, transition: bool = False) -> None:
+        self.status_page.update(StatusPage.SECTION_APP, foreground=int(in_foreground), state_time=self.clock.time())
+        # Transitions are also broadcasted, which wakes the loop
+        if transition:
+            self.loop.wake()
+
+    def _is_app_in_foreground(self) -> bool:
+        # Called once per loop cycle
+        self._count("wakeups")
+        return self.app_state.is_app_in_foreground()
+
+    def _get_running_app_state(self) -> bool:
+        self._count("process_enumerations")
+        return self.clock.now().minute < self.foreground_minutes
+
+    def _check_task_expiry(self) -> None:
+        if not self.expiry_manager.is_task_expired():
+            return
+
+        if self.expiry_manager.expired_task:
+            self.expiry_manager.complete_task(self.expiry_manager.expired_task)
+
+        expired_task = self.expiry_manager.handle_task_expired()
+        if expired_task is None:
+            return
+
+        latency = self.clock.time() - expired_task.timestamp.timestamp()
+        hour = self._get_hour()
+        self.stats[hour]["expiries"] += 1
+        self.stats[hour]["latency_total"] += latency
+        self.stats[hour]["latency_max"] = max(self.stats[hour]["latency_max"], latency)
+        # Task notification and foreground notification
+        self._count("notifications", 2)
+        self._count_store_writes()
+
+        reaction = self.rng.randint(*REACTION_SECONDS)
+        self.clock.call_at(self.clock.time() + reaction, lambda: self._react(expired_task.task_id))
+
+    def _react(self, task_id: str) -> None:
+        """Snoozes, cancels or ignores an expired Task, like the notification actions do."""
+        if self.expiry_manager.expired_task is None or self.expiry_manager.expired_task.task_id != task_id:
+            return
+
+        choice = self.rng.random()
+        if choice < SNOOZE_CHANCE:
+            self.expiry_manager.snooze_task(DM.ACTION.SNOOZE_A, task_id)
+            self._count("snoozes")
+        elif choice < SNOOZE_CHANCE + CANCEL_CHANCE:
+            self.expiry_manager.cancel_task(task_id)
+            self._count("cancels")
+        else:
+            return
+
+        # Foreground notification update, then the broadcast receiver wakes the loop
+        self._count("notifications")
+        self._count_store_writes()
+        self.loop.wake()
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        self.stats[self._get_hour()][name] += amount
+
+    def _count_store_writes(self) -> None:
+        store_writes = self._get_store_writes()
+        self._count("store_writes", store_writes - self._store_writes)
+        self._store_writes = store_writes
+
+    def _get_store_writes(self) -> int:
+        return self.expiry_manager.task_repository.write_counts["units"]
+
+    def _get_hour(self) -> int:
+        return int((self.clock.time() - self.start.timestamp()) // 3600)
+
+
+def print_report(simulation: ServiceSimulation, days: int, wall_seconds: float) -> None:
+    columns = ["expiries", "latency_avg", "latency_max", "snoozes", "cancels",
+               "store_writes", "heartbeat_writes", "notifications", "wakeups", "process_enumerations"]
+    # Every column is at least one space wider than the longest name
+    width = max(len(column) for column in columns) + 1
+    hours = days * 24
+    print(f"\nSimulated {days} days in {wall_seconds:.2f}s wall time")
+    print(f"{'hour':<8}" + "".join(f"{column:>{width}}" for column in columns))
+
+    totals = defaultdict(float)
+    for hour in range(hours):
+        stats = simulation.stats[hour]
+        for name, value in stats.items():
+            totals[name] = max(totals[name], value) if name == "latency_max" else totals[name] + value
+        if days <= HOURLY_ROWS_MAX_DAYS:
+            print(f"{hour:<8}" + "".join(f"{value:>{width}.2f}" for value in get_row(stats, columns)))
+
+    print(f"{'total':<8}" + "".join(f"{value:>{width}.2f}" for value in get_row(totals, columns)))
+    print(f"{'per hour':<8}" + "".join(f"{value:>{width}.2f}" for value in get_row(totals, columns, hours)))
+    print(f"Loop wake-ups: {simulation.loop.wake_counts}, jobs: "
+          f"{ {name: stats['runs'] for name, stats in simulation.loop.jobs.get_stats().items()} }")
+    print(f"Running process enumerations per hour: {totals['wakeups'] / hours:.2f} when polled every wake-up, "
+          f"{totals['process_enumerations'] / hours:.2f} with the published App state. "
+          f"App state sources: {simulation.app_state.counts}")
+
+
+def get_row(stats: dict[str, float], columns: list[str], hours: int = 1) -> list[float]:
+    row = []
+    for column in columns:
+        if column == "latency_avg":
+            row.append(stats["latency_total"] / stats["expiries"] if stats["expiries"] else 0.0)
+        elif column == "latency_max":
+            row.append(stats["latency_max"])
+        else:
+            row.append(stats[column] / hours)
+    return row
+
+
+def set_task_paths(directory: str) -> None:
+    """Points the Task files and the StatusPage to the directory, so the simulation never touches real data."""
+    DM.PATH.TASK_FILE = os.path.join(directory, "task_file.json")
+    DM.PATH.TASK_JOURNAL_FILE = os.path.join(directory, "task_file.journal")
+    DM.PATH.TASK_BINARY_FILE = os.path.join(directory, "task_file.bin")
+    DM.PATH.TASK_BINARY_JOURNAL_FILE = os.path.join(directory, "task_file.bin.journal")
+    DM.PATH.TASK_SHARD_DIR = os.path.join(directory, "task_shards")
+    DM.PATH.TASK_DB_FILE = os.path.join(directory, "task_file.db")
+    DM.PATH.TASK_CHANGE_LOG_FILE = os.path.join(directory, "task_file.changes")
+    DM.PATH.TASK_VERSION_FILE = os.path.join(directory, "task_file.version")
+    DM.PATH.TASK_ARCHIVE_DIR = os.path.join(directory, "task_archive")
+    DM.PATH.STATUS_PAGE_FILE = os.path.join(directory, "status_page.bin")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    days = args[0] if len(args) > 0 else DAYS
+    tasks_per_day = args[1] if len(args) > 1 else TASKS_PER_DAY
+    foreground_minutes = args[2] if len(args) > 2 else FOREGROUND_MINUTES_PER_HOUR
+
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    directory = tempfile.mkdtemp(prefix="bgtask_simulation_")
+    try:
+        set_task_paths(directory)
+        start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        wall_start = time.perf_counter()
+        simulation = ServiceSimulation(start, days, tasks_per_day, foreground_minutes)
+        simulation.run()
+        print_report(simulation, days, time.perf_counter() - wall_start)
+
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
@@ -208,7 +208,7 @@ class BackgroundService:
             # Clean up ServiceManager - Tasks and GPS
             if self._service_manager:
                 logger.info("DEBUG: Cleaning up service manager")
-                self._service_manager._running = False
+                self._service_manager.stop_service()
                 self._service_manager.cancel_alarm_and_notifications()
                 
                 logger.info("DEBUG: Calling GPS cleanup")
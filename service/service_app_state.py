@@ -0,0 +1,56 @@
+from typing import Callable
+
+from managers.device.status_page import StatusPage
+
+from src.utils.clock import WallClock
+from src.utils.logger import logger
+
+
+class ServiceAppState:
+
+    STALE_AFTER = 3 * StatusPage.APP_REFRESH_INTERVAL  # = 3 minutes, without a refresh a foreground App may have died
+
+    """
+    Foreground state of the App as the Service sees it, pushed by the App instead of polled.
+    - The App publishes it on the StatusPage on every lifecycle transition and re-publishes it while in the foreground
+    - The App also broadcasts transitions, which wake the loop and keep the state when the StatusPage is not available
+    - A background state stays valid, an App that died is not in the foreground
+    - A foreground state older than STALE_AFTER, or no state at all, falls back to enumerating the running processes
+    - Counts how often each source answered
+    """
+    def __init__(self, clock: WallClock, status_page: StatusPage | None, get_running_state: Callable[[], bool]):
+        self.clock: WallClock = clock
+        self.status_page: StatusPage | None = status_page
+        self.get_running_state: Callable[[], bool] = get_running_state
+
+        self.counts: dict[str, int] = {"status_page": 0, "broadcast": 0, "running_processes": 0}
+        self._broadcast_state: tuple[bool, float] | None = None
+
+    def set_state(self, in_foreground: bool) -> None:
+        """Keeps the state the App broadcasted."""
+        self._broadcast_state = (in_foreground, self.clock.time())
+
+    def is_app_in_foreground(self) -> bool:
+        """Returns True if the App is in the foreground, from its published state while that is fresh."""
+        source, state = self._get_published_state()
+        if state is not None:
+            in_foreground, state_time = state
+            if not in_foreground or self.clock.time() - state_time <= ServiceAppState.STALE_AFTER:
+                self.counts[source] += 1
+                return in_foreground
+
+            logger.trace("Published App state is stale, checking running processes")
+
+        self.counts["running_processes"] += 1
+        return self.get_running_state()
+
+    def _get_published_state(self) -> tuple[str, tuple[bool, float] | None]:
+        """Returns the source and (in_foreground, time) of the most recently published state."""
+        source, state = "broadcast", self._broadcast_state
+
+        status = self.status_page.read(StatusPage.SECTION_APP) if self.status_page is not None else None
+        if status is not None and status["state_time"]:
+            if state is None or status["state_time"] >= state[1]:
+                source, state = "status_page", (bool(status["foreground"]), status["state_time"])
+
+        return source, state
@@ -62,6 +62,7 @@ class ServiceCommunicationManager:
             DM.ACTION.GET_LOCATION_ONCE,
             DM.ACTION.START_LOCATION_MONITORING,
             # DM.ACTION.STOP_LOCATION_MONITORING,
+            DM.ACTION.APP_STATE,
         ]
         self.boot_actions: list[str] = [
             DM.ACTION.BOOT_COMPLETED,
@@ -93,6 +94,7 @@ class ServiceCommunicationManager:
         - Does not listen for ACTION_TARGETs - accepts all actions
         - Listens for ACTION: SNOOZE_A | SNOOZE_B | CANCEL
         - Listens for ACTION: STOP_ALARM | UPDATE_TASKS | REMOVE_TASK_NOTIFICATIONS
+        - Listens for ACTION: APP_STATE
         - Listens for ACTION: BOOT_COMPLETED | RESTART_SERVICE
         """
         try:
@@ -139,6 +141,8 @@ class ServiceCommunicationManager:
             
             logger.debug(f"ServiceCommunicationManager received intent with action: {pure_action}")
             self.handle_action(intent, pure_action)
+            # Tasks may have changed, the loop re-computes its deadline
+            self.service_manager.wake()
                 
         except Exception as e:
             logger.error(f"Error in broadcast receiver callback: {e}")
@@ -224,6 +228,7 @@ class ServiceCommunicationManager:
         - Alarm: stop alarm
         - Notifications: remove task notifications
         - GPS: get location once, start location monitoring, stop location monitoring
+        - Lifecycle: App foreground state
         """
         # Update tasks
         if pure_action.endswith(DM.ACTION.UPDATE_TASKS):
@@ -251,6 +256,10 @@ class ServiceCommunicationManager:
         
         # elif pure_action == DM.ACTION.STOP_LOCATION_MONITORING:
         #     self._stop_location_monitoring_action()
+        
+        # App foreground state
+        elif pure_action == DM.ACTION.APP_STATE:
+            self._app_state_action(intent)
 
         return Service.START_STICKY
 
@@ -314,7 +323,8 @@ class ServiceCommunicationManager:
             # Service side
             self.expiry_manager.snooze_task(action, task_id)
             self.service_manager.update_foreground_notification_info()
-            # App side
+            # App side, only after the changes are on disk
+            self.expiry_manager.flush_task_file()
             self.send_action(DM.ACTION.UPDATE_TASKS, task_id)
 
         except Exception as e:
@@ -330,15 +340,23 @@ class ServiceCommunicationManager:
             # Service side
             self.expiry_manager.cancel_task(task_id)
             self.service_manager.update_foreground_notification_info()
-            # App side
+            # App side, only after the changes are on disk
+            self.expiry_manager.flush_task_file()
             self.send_action(DM.ACTION.UPDATE_TASKS, task_id)
 
         except Exception as e:
             logger.error(f"Error handling cancel action: {e}")
     
     def _update_tasks_action(self) -> None:
-        """Refreshes ExpiryManager Tasks and updates foreground notification."""
+        """
+        Refreshes ExpiryManager Tasks and updates foreground notification.
+        Skips re-loading if the Task store version did not change since the last load.
+        """
         logger.trace("Handling update tasks action")
+        if not self.expiry_manager.has_task_changes():
+            logger.trace("Task store version unchanged, skipping re-load")
+            return
+        
         self.expiry_manager._refresh_tasks()
         self.service_manager.update_foreground_notification_info()
         logger.trace("Updated Tasks and foreground notification through service action")
@@ -353,6 +371,12 @@ class ServiceCommunicationManager:
         logger.trace("Handling remove task notifications action")
         self.notification_manager.cancel_task_notifications()
     
+    def _app_state_action(self, intent: Any) -> None:
+        """Keeps the foreground state the App broadcasted, the receiver callback then wakes the loop."""
+        in_foreground = intent.getStringExtra("foreground") == "true"
+        logger.trace(f"Handling App state action, in foreground: {in_foreground}")
+        self.service_manager.app_state.set_state(in_foreground)
+    
     def _get_location_once_action(self) -> None:
         """Handles request for one-time location from app."""
         try:
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING
 from managers.tasks.expiry_manager import ExpiryManager
 from managers.device.device_manager import DM
 
+from src.utils.clock import WallClock, WALL_CLOCK
 from src.utils.logger import logger
 
 if TYPE_CHECKING:
@@ -12,8 +13,8 @@ if TYPE_CHECKING:
 
 class ServiceExpiryManager(ExpiryManager):
     """Expiry Manager for the Service."""	
-    def __init__(self, audio_manager: "ServiceAudioManager"):
-        super().__init__()
+    def __init__(self, audio_manager: "ServiceAudioManager", clock: WallClock = WALL_CLOCK):
+        super().__init__(clock)
         self.audio_manager: "ServiceAudioManager" = audio_manager
     
     def _handle_snoozed_task(self, snoozed_task: "Task") -> None:
@@ -21,13 +22,13 @@ class ServiceExpiryManager(ExpiryManager):
         Snoozes a Task from notification.
         - Gets expired Task or current Task (if no expired Task exists).
         - Updates the snooze time.
-        - Refreshes the Tasks and gets new current Task.
+        - Re-schedules the Task and gets new current Task.
         """
         logger.debug(f"Snoozed Task: {DM.get_task_log(snoozed_task)}")
         # Stop alarm
         self.audio_manager.stop_alarm()
-        # Refresh tasks
-        self._refresh_tasks()
+        # Re-schedule Task
+        self._refresh_task(snoozed_task)
     
     def _handle_cancelled_task(self, cancelled_task: "Task") -> None:
         """
@@ -37,5 +38,5 @@ class ServiceExpiryManager(ExpiryManager):
         logger.debug(f"Cancelled Task: {DM.get_task_log(cancelled_task)}")
         # Stop alarm
         self.audio_manager.stop_alarm()
-        # Refresh tasks
-        self._refresh_tasks()
+        # Un-schedule Task, a recurring Task stays scheduled at its next occurrence
+        self._refresh_task(cancelled_task)
@@ -7,6 +7,7 @@ from math import radians, sin, cos, sqrt, atan2
 from typing import Callable, TYPE_CHECKING
 
 from managers.device.device_manager import DM
+from managers.device.status_page import STATUS_PAGE, StatusPage
 from service.service_utils import LocationListener, Context, LocationManager, Looper
 from src.utils.logger import logger
 from src.utils.wrappers import requires_gps
@@ -290,6 +291,7 @@ class ServiceGpsManager:
         
         if self.gps_start_after and self.gps_start_after > datetime.now():
             logger.info(f"Service: Start after: {self.gps_start_after}, postponing location monitoring")
+            STATUS_PAGE.update(StatusPage.SECTION_SERVICE, gps_state=StatusPage.GPS_WAITING)
             return None
         else:
             logger.info(f"Service: Start after: {self.gps_start_after} & Now: {datetime.now()}")
@@ -309,6 +311,8 @@ class ServiceGpsManager:
         else:
             logger.error("Service: Failed to start location monitoring")
             self._monitoring_active = False
+        STATUS_PAGE.update(StatusPage.SECTION_SERVICE,
+                           gps_state=StatusPage.GPS_MONITORING if success else StatusPage.GPS_OFF)
         
         # Try to set notification immediately
         current_location = self._get_current_location_from_file()
@@ -340,6 +344,7 @@ class ServiceGpsManager:
 
         self.target_reached = True
         self._reset_gps_file()
+        STATUS_PAGE.update(StatusPage.SECTION_SERVICE, gps_state=StatusPage.GPS_OFF, location_time=0)
     
     def _on_location_update(self, lat: float, lon: float) -> None:
         """Handle location updates during monitoring."""
@@ -577,7 +582,10 @@ class ServiceGpsManager:
             return None
     
     def _get_current_location_from_file(self) -> tuple[float, float] | None:
-        """Returns current location from file."""
+        """Returns current location from the StatusPage, or from file if the StatusPage is not available."""
+        if STATUS_PAGE.read(StatusPage.SECTION_SERVICE) is not None:
+            return STATUS_PAGE.get_location()
+        
         try:
             with open(DM.PATH.GPS_FILE, "r") as f:
                 data = json.load(f)
@@ -590,7 +598,14 @@ class ServiceGpsManager:
             return None
     
     def save_location_to_file(self, lat: float, lon: float) -> None:
-        """Overwrites current location in file."""
+        """
+        Publishes current location on the StatusPage.
+        Overwrites current location in file if the StatusPage is not available.
+        """
+        if STATUS_PAGE.update(StatusPage.SECTION_SERVICE, latitude=lat, longitude=lon, location_time=time.time()):
+            logger.debug(f"Updated current location: {lat}, {lon}")
+            return
+        
         try:
             existing_data = {}
             try:
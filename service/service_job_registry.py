@@ -0,0 +1,145 @@
+import heapq
+import time
+
+from typing import Callable
+
+from src.utils.clock import WallClock
+from src.utils.logger import logger
+
+
+class ServiceJob:
+
+    RUN_ALWAYS: str = "always"
+    RUN_FOREGROUND: str = "foreground"
+    RUN_BACKGROUND: str = "background"
+
+    """
+    Periodic job of the Service loop.
+    - Runs every period seconds on fixed slots, may run up to jitter seconds late to share a wake-up with other jobs.
+    - Only runs while the App is in the state it is eligible for, is skipped for one period otherwise.
+    - Keeps the number of runs and their durations.
+    """
+    def __init__(self, name: str, callback: Callable[[], None], period: float, jitter: float, eligibility: str):
+        self.name: str = name
+        self.callback: Callable[[], None] = callback
+        self.period: float = period
+        self.jitter: float = jitter
+        self.eligibility: str = eligibility
+
+        self.next_run: float = 0.0
+        self.runs: int = 0
+        self.skips: int = 0
+        self.last_duration: float = 0.0
+        self.max_duration: float = 0.0
+        self.total_duration: float = 0.0
+
+    def is_eligible(self, in_foreground: bool) -> bool:
+        """Returns True if the job may run in the current App state."""
+        if self.eligibility == ServiceJob.RUN_FOREGROUND:
+            return in_foreground
+        if self.eligibility == ServiceJob.RUN_BACKGROUND:
+            return not in_foreground
+        return True
+
+    def get_stats(self) -> dict[str, float]:
+        """Returns the run counts and durations [seconds] of the job."""
+        return {
+            "runs": self.runs,
+            "skips": self.skips,
+            "last_duration": self.last_duration,
+            "max_duration": self.max_duration,
+            "average_duration": self.total_duration / self.runs if self.runs else 0.0,
+        }
+
+
+class ServiceJobRegistry:
+    """
+    Schedules the periodic jobs of the Service loop.
+    - Jobs are kept in a heap on their next run time.
+    - The loop sleeps until get_next_deadline() and then calls run_due().
+    - Jobs that are due when the loop wakes run together, a job is re-scheduled one period after its planned slot,
+      so running late never stretches its period. Slots missed entirely are skipped.
+    """
+    def __init__(self, clock: WallClock):
+        self.clock: WallClock = clock
+        self._heap: list[tuple[float, int, ServiceJob]] = []
+        self._jobs: dict[str, ServiceJob] = {}
+        self._counter: int = 0
+
+    def register(self, name: str, callback: Callable[[], None], period: float, jitter: float = 0.0,
+                 eligibility: str = ServiceJob.RUN_ALWAYS, first_run: float | None = None) -> ServiceJob:
+        """Registers a periodic job, by default it first runs one period from now."""
+        if name in self._jobs:
+            raise ValueError(f"Service job already registered: {name}")
+        if period <= 0:
+            raise ValueError(f"Service job period must be positive: {period}")
+
+        job = ServiceJob(name, callback, period, jitter, eligibility)
+        job.next_run = self.clock.time() + period if first_run is None else first_run
+        self._jobs[name] = job
+        self._push(job)
+        return job
+
+    def get_next_deadline(self) -> float | None:
+        """
+        Returns the time [epoch seconds] the loop must wake up for the next job, or None if there are no jobs.
+        - The loop wakes at the earliest next run.
+        - It wakes later only for another job whose next run lies within the jitter windows of the earlier jobs,
+          so both share one wake-up.
+        Jobs are few, so their windows are simply compared.
+        """
+        if not self._heap:
+            return None
+
+        deadline = None
+        latest = None
+        for next_run, _, job in sorted(self._heap):
+            if latest is not None and next_run > latest:
+                break
+            deadline = next_run
+            latest = next_run + job.jitter if latest is None else min(latest, next_run + job.jitter)
+        return deadline
+
+    def run_due(self, now: float, in_foreground: bool) -> list[str]:
+        """Runs all jobs that are due and eligible, returns their names."""
+        due_jobs = []
+        while self._heap and self._heap[0][0] <= now:
+            due_jobs.append(heapq.heappop(self._heap)[2])
+
+        ran = []
+        for job in due_jobs:
+            if job.is_eligible(in_foreground):
+                self._run(job)
+                ran.append(job.name)
+            else:
+                job.skips += 1
+
+            job.next_run += job.period
+            if job.next_run <= now:
+                # Skip the slots missed while the loop was not running, e.g. during device sleep
+                missed_slots = (now - job.next_run) // job.period + 1
+                job.next_run += missed_slots * job.period
+            self._push(job)
+
+        return ran
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """Returns the run counts and durations of all jobs by name."""
+        return {name: job.get_stats() for name, job in self._jobs.items()}
+
+    def _run(self, job: ServiceJob) -> None:
+        start = time.perf_counter()
+        try:
+            job.callback()
+        except Exception as e:
+            logger.error(f"Error running Service job {job.name}: {e}")
+
+        duration = time.perf_counter() - start
+        job.runs += 1
+        job.last_duration = duration
+        job.total_duration += duration
+        job.max_duration = max(job.max_duration, duration)
+
+    def _push(self, job: ServiceJob) -> None:
+        self._counter += 1
+        heapq.heappush(self._heap, (job.next_run, self._counter, job))
@@ -0,0 +1,116 @@
+import threading
+
+from typing import Callable
+
+from managers.device.status_page import StatusPage
+from managers.tasks.expiry_manager import ExpiryManager
+from service.service_job_registry import ServiceJobRegistry
+
+from src.utils.clock import WallClock
+from src.utils.logger import logger
+
+
+class ServiceLoop:
+
+    LOOP_INTERVAL = 10                       # = 10 seconds, re-check of a due Task handled by the App
+    IDLE_INTERVAL = 60                       # = 60 seconds, when no jobs are registered
+
+    """
+    Deadline driven main loop of the Service, free of Android classes so it also runs in simulations.
+    - Sleeps until the next deadline: the current Task's timestamp, the next periodic job or a wake()
+    - On every wake-up runs the due jobs, then checks Task expiry when the App is in the background
+    - Publishes the current Task and store version on the StatusPage when they changed
+    - Time comes from the clock, a VirtualClock replays a day of Tasks without sleeping
+    """
+    def __init__(self, expiry_manager: ExpiryManager, clock: WallClock, status_page: StatusPage | None = None):
+        self.expiry_manager: ExpiryManager = expiry_manager
+        self.clock: WallClock = clock
+        self.status_page: StatusPage | None = status_page
+        self.jobs: ServiceJobRegistry = ServiceJobRegistry(clock)
+
+        self.running: bool = True
+        self.in_foreground: bool = False
+        self.last_loop_time: float = clock.time()
+        self.wake_counts: dict[str, int] = {"deadline": 0, "wake": 0}
+
+        self._wake_condition: threading.Condition = threading.Condition()
+        self._wake_requested: bool = False
+        self._published_status: tuple[str, float, int] | None = None
+
+    def run(self, is_app_in_foreground: Callable[[], bool], check_task_expiry: Callable[[], None]) -> None:
+        """Runs until stop() is called."""
+        while self.running:
+
+            self.last_loop_time = self.clock.time()
+
+            try:
+                self.in_foreground = is_app_in_foreground()
+
+                # Heartbeat, foreground notification, GPS start and expiry logs
+                self.jobs.run_due(self.last_loop_time, self.in_foreground)
+
+                # The App handles expiry while in the foreground
+                if not self.in_foreground and self.expiry_manager.current_task is not None:
+                    check_task_expiry()
+
+            except Exception as e:
+                logger.error(f"Error in service loop: {e}")
+
+            self._publish_status()
+            self._wait_for_deadline(self.get_next_deadline())
+
+    def wake(self) -> None:
+        """Wakes the loop to re-check Tasks, e.g. after a broadcast changed them."""
+        with self._wake_condition:
+            self._wake_requested = True
+            self._wake_condition.notify()
+
+    def stop(self) -> None:
+        """Stops the loop after its current cycle."""
+        self.running = False
+        self.wake()
+
+    def _publish_status(self) -> None:
+        """Publishes the current Task, its deadline and the synced store version if they changed."""
+        if self.status_page is None:
+            return
+
+        current_task = self.expiry_manager.current_task
+        status = (current_task.task_id if current_task else "",
+                  current_task.timestamp.timestamp() if current_task else 0.0,
+                  self.expiry_manager.synced_version)
+        if status == self._published_status:
+            return
+
+        self._published_status = status
+        self.status_page.update(StatusPage.SECTION_SERVICE, current_task_id=status[0],
+                                current_task_deadline=status[1], store_version=status[2])
+
+    def _wait_for_deadline(self, deadline: float) -> None:
+        """Sleeps until the deadline [epoch seconds] or until wake() is called."""
+        with self._wake_condition:
+            woken = self.clock.wait_for(self._wake_condition, lambda: self._wake_requested, deadline)
+            self._wake_requested = False
+
+        self.wake_counts["wake" if woken else "deadline"] += 1
+
+    def get_next_deadline(self) -> float:
+        """
+        Returns the time [epoch seconds] the loop must wake up next, the earliest of:
+        - The next periodic job.
+        - The current Task's timestamp.
+        - The next LOOP_INTERVAL while the current Task is due, but handled by the App in the foreground.
+        """
+        deadline = self.jobs.get_next_deadline()
+        if deadline is None:
+            deadline = self.last_loop_time + ServiceLoop.IDLE_INTERVAL
+
+        current_task = self.expiry_manager.current_task
+        if current_task is not None:
+            task_time = current_task.timestamp.timestamp()
+            if task_time > self.clock.time():
+                deadline = min(deadline, task_time)
+            else:
+                deadline = min(deadline, self.last_loop_time + ServiceLoop.LOOP_INTERVAL)
+
+        return deadline
@@ -8,11 +8,16 @@ from service.service_expiry_manager import ServiceExpiryManager
 from service.service_notification_manager import ServiceNotificationManager
 from service.service_communication_manager import ServiceCommunicationManager
 from service.service_gps_manager import ServiceGpsManager
+from service.service_app_state import ServiceAppState
+from service.service_job_registry import ServiceJob
+from service.service_loop import ServiceLoop
 from managers.tasks.task import Task
 
 from service.service_utils import get_service_timestamp
 from managers.device.device_manager import DM
+from managers.device.status_page import STATUS_PAGE, StatusPage
 
+from src.utils.clock import WallClock, WALL_CLOCK
 from src.utils.logger import logger
 
 Context = autoclass("android.content.Context")
@@ -24,26 +29,31 @@ Service = autoclass("android.app.Service")
 
 class ServiceManager:
 
-    LOOP_INTERVAL = 10                       # = 10 seconds
-    SERVICE_HEARTBEAT_TICK = 6               # = 60 seconds
-    FORCE_FOREGROUND_NOTIFICATION_TICK = 6   # = 60 seconds
-    LOOP_SYNC_TICK = 360                     # = 1 hour
-    EXPIRY_LOG_TICK = 3                      # = 30 seconds
-    GPS_START_AFTER_TICK = 6                 # = 1 minutes
-
-    MAX_LOOP_DEVIATION = 4                   # = 4 seconds
+    SERVICE_HEARTBEAT_INTERVAL = DM.SETTINGS.SERVICE_HEARTBEAT_INTERVAL  # = 60 seconds
+    FORCE_FOREGROUND_NOTIFICATION_INTERVAL = 60  # = 60 seconds
+    EXPIRY_LOG_INTERVAL = 30                 # = 30 seconds
+    GPS_START_AFTER_INTERVAL = 60            # = 1 minutes
+    APP_STATE_LOG_INTERVAL = 3600            # = 1 hour
+    JOB_JITTER = DM.SETTINGS.SERVICE_JOB_JITTER  # = 10 seconds, jobs may run late to share a wake-up
 
     """
     Manages the Android background service and Task monitoring, it:
+    - Runs the ServiceLoop, which sleeps until the current Task's timestamp, the next periodic job or a wake()
+    - Gets the App's foreground state from what the App publishes, enumerates running processes only as fallback
+    - Registers the periodic jobs of the ServiceLoop
     - Monitors the current Task for expiration
     - Sends notification and triggers alarm when Task is expired
     - Handles Task actions (snooze, cancel) from notifications
     - Updates foreground and Task notifications
     - Writes timestamp to flag file periodically
     """
-    def __init__(self):
+    def __init__(self, clock: WallClock = WALL_CLOCK):
+        self.clock: WallClock = clock
         self.audio_manager: ServiceAudioManager = ServiceAudioManager()
-        self.expiry_manager: ServiceExpiryManager = ServiceExpiryManager(self.audio_manager)
+        self.expiry_manager: ServiceExpiryManager = ServiceExpiryManager(self.audio_manager, clock)
+        # Created before the receiver can call wake()
+        self.loop: ServiceLoop = ServiceLoop(self.expiry_manager, clock, STATUS_PAGE)
+        self.app_state: ServiceAppState = ServiceAppState(clock, STATUS_PAGE, self._get_running_app_state)
         self.notification_manager: ServiceNotificationManager = ServiceNotificationManager(PythonService.mService,
                                                                                            self.expiry_manager)
         self.gps_manager: ServiceGpsManager = ServiceGpsManager(service_manager=self)
@@ -56,33 +66,20 @@ class ServiceManager:
             gps_manager=self.gps_manager
         )
         
-        # Loop variables
-        self._running: bool = True
-        self._in_foreground: bool = False
-
         # ActivityManager
         self._package_name: str | None = None
         self._activity_manager: Any | None = None
         self._init_activity_manager()
 
-        # Ticks
-        self.loop_sync_tick: int = 0
-        self.heartbeat_tick: int = 0
-        self.foreground_notification_tick: int = 0
-        self.expiry_log_tick: int = 0
-        self.gps_start_after_tick: int = 0
-
-        # Loop timing
-        self._last_loop_time: float = 0
-        self._loop_synchronized: bool = False
+        # Periodic jobs
+        self._register_jobs()
     
     def run_service(self) -> None:
         """
-        Main service loop. Inactive when app is in foreground.
+        Main service loop, wakes on the next deadline or on wake().
         - Flags service as running
-        - Ensures loop is in sync with Task expiry
         - Ensures foreground notification is always active
-        - Checks Task expiry
+        - Checks Task expiry when the App is in the background
         """
         logger.debug("Starting main service loop")
         
@@ -97,61 +94,33 @@ class ServiceManager:
         # GPS check
         self.gps_manager.start_location_monitoring()  # Will skip if no GPS data found
 
-
-        # Sync loop
-        self.synchronize_loop_start()
-
-        while self._running:
-
-            self._update_loop_ticks()
-            self._update_loop_time()
-
-            try:
-                # ############### ALWAYS RUNS ###############
-                self.flag_service_as_running()                   # 60 seconds
-
-                self.synchronize_loop_cycle()                    # 1 hour
-
-                self.force_foreground_notification()             # 60 seconds
-
-                self.check_gps_start_after()                     # 1 minutes
-
-                # ############### RUNS IN FOREGROUND ########
-                if self.is_app_in_foreground():
-                    self._in_foreground = True
-                    time.sleep(self.get_loop_interval())
-                    continue
-                
-
-                # ############### RUNS IN BACKGROUND ########
-                else:
-                    self.log_expiry_tasks()                      # 30 seconds
-                    # self.check_gps_start_after()                     # 2 minutes
-
-                    if self.expiry_manager.current_task is not None:
-                        self.check_task_expiry()                 # 10 seconds
-
-                    self._in_foreground = False
-                
-                time.sleep(self.get_loop_interval())
-                
-            except Exception as e:
-                logger.error(f"Error in service loop: {e}")
-                time.sleep(self.get_loop_interval())
+        self.loop.run(self.is_app_in_foreground, self.check_task_expiry)
         
         self.audio_manager.stop_alarm()
     
-    def _update_loop_ticks(self) -> None:
-        """Updates all loop ticks."""
-        self.loop_sync_tick += 1
-        self.heartbeat_tick += 1
-        self.foreground_notification_tick += 1
-        self.expiry_log_tick += 1
-        self.gps_start_after_tick += 1
-
-    def _update_loop_time(self) -> None:
-        """Updates the loop time."""
-        self._last_loop_time = time.time()
+    def _register_jobs(self) -> None:
+        """Registers the periodic jobs of the service loop."""
+        jobs = self.loop.jobs
+        jobs.register("heartbeat", self._flag_service_as_running,
+                      ServiceManager.SERVICE_HEARTBEAT_INTERVAL, ServiceManager.JOB_JITTER)
+        jobs.register("foreground_notification", self._force_foreground_notification,
+                      ServiceManager.FORCE_FOREGROUND_NOTIFICATION_INTERVAL, ServiceManager.JOB_JITTER)
+        jobs.register("gps_start_after", self.check_gps_start_after,
+                      ServiceManager.GPS_START_AFTER_INTERVAL, ServiceManager.JOB_JITTER)
+        # Only logs, may wait for a wake-up of another job
+        jobs.register("expiry_log", self.expiry_manager._log_expiry_tasks,
+                      ServiceManager.EXPIRY_LOG_INTERVAL, ServiceManager.EXPIRY_LOG_INTERVAL,
+                      eligibility=ServiceJob.RUN_BACKGROUND)
+        jobs.register("app_state_log", self._log_app_state_counts,
+                      ServiceManager.APP_STATE_LOG_INTERVAL, ServiceManager.SERVICE_HEARTBEAT_INTERVAL)
+    
+    def wake(self) -> None:
+        """Wakes the service loop to re-check Tasks, e.g. after a broadcast changed them."""
+        self.loop.wake()
+    
+    def stop_service(self) -> None:
+        """Stops the service loop."""
+        self.loop.stop()
     
     def cancel_alarm_and_notifications(self) -> None:
         """Cancels the alarm and notifications."""
@@ -159,82 +128,24 @@ class ServiceManager:
         self.audio_manager.stop_alarm()
         self.notification_manager.cancel_task_notifications()
     
-    def synchronize_loop_start(self) -> None:
+    def _flag_service_as_running(self) -> None:
         """
-        Syncs loop to start at a 10-second interval (01, 11, 21, 31, 41, 51 seconds).
-        Synchronizes by sleeping until the next interval.
+        Publishes current timestamp as heartbeat on the StatusPage.
+        Writes it to the heartbeat flag file if the StatusPage is not available.
         """
-        current_seconds = time.localtime().tm_sec
-        seconds_to_wait = ((current_seconds + 9) // 10 * 10 + 1) - current_seconds
-        
-        if seconds_to_wait > 1:
-            logger.debug(f"Synchronizing loop start: waiting {seconds_to_wait} seconds")
-            time.sleep(seconds_to_wait)
+        if STATUS_PAGE.update(StatusPage.SECTION_SERVICE, heartbeat=self.clock.time()):
+            logger.trace("Service heartbeat published")
+            return
         
-        self._loop_synchronized = True
-    
-    def synchronize_loop_cycle(self) -> None:
-        """
-        Syncs loop to be at a 10-second interval (01, 11, 21, 31, 41, 51 seconds).
-        If loop is off by more than LOOP_DEVIATION seconds, resynchronize.
-        Synchronizes by sleeping until the next interval.
-        """
-        if self.loop_sync_tick >= ServiceManager.LOOP_SYNC_TICK:
-            logger.debug("Synchronizing loop cycle")
-            self.loop_sync_tick = 0
-            current_seconds = time.localtime().tm_sec
-            seconds_from_boundary = current_seconds % 10
-            
-            if seconds_from_boundary > ServiceManager.MAX_LOOP_DEVIATION:
-                seconds_to_wait = ((current_seconds + 9) // 10 * 10 + 1) - current_seconds
-                logger.debug(f"Loop drift detected: {seconds_from_boundary}s from boundary. "
-                            f"Resynchronizing: waiting {seconds_to_wait} seconds")
-                
-                time.sleep(seconds_to_wait)
-                logger.debug("Loop resynchronization complete")
-    
-    def get_loop_interval(self) -> float:
-        """
-        Returns the time to sleep if loop took less than LOOP_INTERVAL seconds,
-         else returns 0.
-        """
-        now = time.time()
-        loop_time = now - self._last_loop_time
-        sleep_time = ServiceManager.LOOP_INTERVAL - loop_time
-
-        if sleep_time < 0:
-            logger.error(f"Loop took longer than LOOP_INTERVAL ({ServiceManager.LOOP_INTERVAL}) seconds")
-            return 0.0
-
-        return sleep_time
-    
-    def flag_service_as_running(self) -> None:
-        """
-        Flags service as running if it has been running for SERVICE_HEARTBEAT_TICK seconds.
-        """
-        if self.heartbeat_tick >= ServiceManager.SERVICE_HEARTBEAT_TICK:
-            self.heartbeat_tick = 0
-            self._flag_service_as_running()
-    
-    def _flag_service_as_running(self) -> None:
-        """Writes current timestamp to heartbeat flag file."""
         try:
             # Write current timestamp
             with open(DM.PATH.SERVICE_HEARTBEAT_FLAG, "w") as f:
-                f.write(str(int(time.time())))
+                f.write(str(int(self.clock.time())))
             logger.trace("Service heartbeat flag written")
         
         except Exception as e:
             print(f"Error writing service heartbeat: {e}")
 
-    def force_foreground_notification(self) -> None:
-        """
-        Forces foreground notification if service has been running for FORCE_FOREGROUND_NOTIFICATION_TICK seconds.
-        """
-        if self.foreground_notification_tick >= ServiceManager.FORCE_FOREGROUND_NOTIFICATION_TICK:
-            self.foreground_notification_tick = 0
-            self._force_foreground_notification()
-
     def _force_foreground_notification(self) -> None:
         """
         Displays foreground notification with current Task info.
@@ -244,7 +155,7 @@ class ServiceManager:
             return
         
         if self.expiry_manager.current_task:
-            time_label = get_service_timestamp(self.expiry_manager.current_task)
+            time_label = get_service_timestamp(self.expiry_manager.current_task, self.clock)
             message = self.expiry_manager.current_task.message
             with_buttons = True
         else:
@@ -261,7 +172,7 @@ class ServiceManager:
     def update_foreground_notification_info(self) -> None:
         """Updates the foreground notification with the current Task's info."""
         if self.expiry_manager.current_task:
-            time_label = get_service_timestamp(self.expiry_manager.current_task)
+            time_label = get_service_timestamp(self.expiry_manager.current_task, self.clock)
             message = self.expiry_manager.current_task.message
 
             self.notification_manager.show_foreground_notification(
@@ -281,19 +192,25 @@ class ServiceManager:
             )
     
     def check_gps_start_after(self) -> None:
-        """Checks if the GPS start after has been reached."""
-        if self.gps_start_after_tick >= ServiceManager.GPS_START_AFTER_TICK:
-            self.gps_start_after_tick = 0
-            logger.info("check_gps_start_after reached tick")
-            
-            if not self.gps_manager._monitoring_active and self.gps_manager.gps_tracking_name:
-                logger.info("_monitoring_active is False, starting location monitoring")
-                self.gps_manager.start_location_monitoring()  # Will skip if no GPS data found
-            else:
-                logger.info("_monitoring_active is True, skipping location monitoring")
+        """Starts location monitoring if GPS tracking was set to start after a delay."""
+        logger.info("check_gps_start_after job running")
+        
+        if not self.gps_manager._monitoring_active and self.gps_manager.gps_tracking_name:
+            logger.info("_monitoring_active is False, starting location monitoring")
+            self.gps_manager.start_location_monitoring()  # Will skip if no GPS data found
+        else:
+            logger.info("_monitoring_active is True, skipping location monitoring")
     
     def is_app_in_foreground(self) -> bool:
         """Returns True if App is running in the foreground."""
+        return self.app_state.is_app_in_foreground()
+    
+    def _log_app_state_counts(self) -> None:
+        """Logs how often the App state came from each source since the Service started."""
+        logger.debug(f"App state sources: {self.app_state.counts}")
+    
+    def _get_running_app_state(self) -> bool:
+        """Returns True if the App's process has foreground importance, enumerates the running processes."""
         try:
             if not self._activity_manager or not self._package_name:
                 return False
@@ -325,11 +242,8 @@ class ServiceManager:
     def _handle_task_expiry(self) -> None:
         """Handles the expiry of a Task."""
         if self.expiry_manager.expired_task:
-            self.expiry_manager.expired_task.expired = True
-            self.expiry_manager._save_task_changes(
-                self.expiry_manager.expired_task.task_id, 
-                {"expired": True}
-            )
+            # A recurring Task is re-scheduled at its next occurrence
+            self.expiry_manager.complete_task(self.expiry_manager.expired_task)
         
         self.notification_manager.cancel_task_notifications()
 
@@ -337,12 +251,6 @@ class ServiceManager:
         if expired_task:
             self.notify_user_of_expiry(expired_task)
     
-    def log_expiry_tasks(self) -> None:
-        """Logs the current and expired Tasks."""
-        if self.expiry_log_tick >= ServiceManager.EXPIRY_LOG_TICK:
-            self.expiry_log_tick = 0
-            self.expiry_manager._log_expiry_tasks()
-    
     def notify_user_of_expiry(self, expired_task: Task) -> None:
         """
         Notifies the user of the expiry of a Task by:
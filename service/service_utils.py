@@ -1,9 +1,10 @@
-from datetime import datetime, timedelta
+from datetime import timedelta
 from typing import Any, Callable, TYPE_CHECKING
 
 from jnius import autoclass, PythonJavaClass, java_method  # type: ignore
 from managers.device.device_manager import DM
 
+from src.utils.clock import WallClock, WALL_CLOCK
 from src.utils.logger import logger
 
 # Android classes for GPS
@@ -66,14 +67,14 @@ class LocationListener(PythonJavaClass):
         pass
 
 
-def get_service_timestamp(task: Any) -> str:
+def get_service_timestamp(task: Any, clock: WallClock = WALL_CLOCK) -> str:
     """
     Returns the timestamp in the format of the ServiceNotification
     This includes the snooze time
     """
     try:
         timestamp = task.timestamp
-        today = datetime.now().date()
+        today = clock.today()
         tomorrow = today + timedelta(days=1)
 
         if timestamp.date() == today:
@@ -13,8 +13,6 @@ try:
     AndroidString = autoclass("java.lang.String")
     Intent = autoclass("android.content.Intent")
     PythonActivity = autoclass("org.kivy.android.PythonActivity")
-    Context = autoclass("android.content.Context")
-    RunningAppProcessInfo = autoclass("android.app.ActivityManager$RunningAppProcessInfo")
 
 except Exception as e:
     pass
@@ -31,6 +29,7 @@ class AppCommunicationManager():
     """
     Manages communication between the App and the Service.
     - Sends actions to the Service
+    - Broadcasts the App's foreground state transitions to the Service
     - Receives actions from the Service
     - Receiver listens for ACTION_TARGET: APP
     """
@@ -50,6 +49,7 @@ class AppCommunicationManager():
 
         self.send_action(DM.ACTION.STOP_ALARM)
         self.send_action(DM.ACTION.GET_LOCATION_ONCE)
+        self.send_app_state_action(self.app.in_foreground)
     
     def _init_context(self) -> None:
         """Initializes the App context and package name."""
@@ -183,6 +183,29 @@ class AppCommunicationManager():
         except Exception as e:
             logger.error(f"Error sending GPS monitoring action: {e}")
     
+    def send_app_state_action(self, in_foreground: bool) -> None:
+        """
+        Send the App's foreground state to the Service, which wakes its loop.
+        """
+        try:
+            if not self.context:
+                logger.error("Error sending App state action, no context available")
+                return
+            
+            intent = Intent()
+            intent.setAction(f"{self.package_name}.{DM.ACTION.APP_STATE}")
+            intent.setPackage(self.package_name)
+            # Flag action to be received only by the Service
+            intent.putExtra(DM.ACTION_TARGET.TARGET,
+                            AndroidString(DM.ACTION_TARGET.SERVICE))
+            intent.putExtra("foreground", AndroidString("true" if in_foreground else "false"))
+            
+            self.context.sendBroadcast(intent)
+            logger.debug(f"Sent App state action, in foreground: {in_foreground}")
+        
+        except Exception as e:
+            logger.error(f"Error sending App state action: {e}")
+    
     def _get_pure_action(self, intent: Any) -> str | None:
         """Extracts and returns the pure action from the intent, or None."""
         action = intent.getAction()
@@ -233,8 +256,17 @@ class AppCommunicationManager():
         """
         task_id = self._get_task_id_from_intent(intent)
         
-        self.task_manager.expiry_manager._refresh_tasks()
-        self.task_manager.refresh_task_groups()
+        # Nothing to apply if the Task store version did not change since the last sync
+        if not self.task_manager.expiry_manager.has_task_changes():
+            logger.trace("Task store version unchanged, skipping refresh")
+            return
+        
+        # Applies only the changes of the Service, unless the TaskGroups had to be re-loaded
+        changeset = self.task_manager.refresh_task_groups()
+        if changeset is None:
+            self.task_manager.expiry_manager._refresh_tasks()
+        else:
+            self.task_manager.expiry_manager._refresh_changed_tasks(changeset)
         
         task = self.task_manager.get_task_by_id(task_id)
         date_key = task.get_date_key()
@@ -249,32 +281,8 @@ class AppCommunicationManager():
         return
     
     def _is_app_in_foreground(self) -> bool:
-        """Returns True if the App is currently in the foreground."""
-        try:
-            if not self.context:
-                return False
-            
-            # Get ActivityManager service
-            activity_manager = self.context.getSystemService(Context.ACTIVITY_SERVICE)
-            if not activity_manager:
-                return False
-            
-            # Get running App processes
-            running_apps = activity_manager.getRunningAppProcesses()
-            if not running_apps:
-                return False
-            
-            # Check if in foreground
-            for process in running_apps:
-                if (process.processName == self.package_name and 
-                    process.importance == RunningAppProcessInfo.IMPORTANCE_FOREGROUND):
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            logger.error(f"Error checking app foreground state: {e}")
-            return False
+        """Returns True if the App is currently in the foreground, as tracked by its lifecycle events."""
+        return self.app.in_foreground
     
     def _location_response_action(self, intent: Any) -> None:
         """Handles location response from service."""
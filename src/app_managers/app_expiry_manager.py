@@ -66,6 +66,8 @@ class AppExpiryManager(ExpiryManager, EventDispatcher):
         """
         # Store the date key before refreshing
         date_key = cancelled_task.get_date_key()
+        # A recurring Task stays scheduled at its next occurrence
+        self._refresh_task(cancelled_task)
         self._update_managers(date_key)
 
         # Scroll to Task
@@ -78,20 +80,19 @@ class AppExpiryManager(ExpiryManager, EventDispatcher):
         # Store the date key before refreshing
         date_key = snoozed_task.get_date_key()
 
+        self._refresh_task(snoozed_task)
         self._update_managers(date_key)
         # Scroll to Task
         self.app.get_screen(DM.SCREEN.HOME).scroll_to_task(snoozed_task)
     
     def _update_managers(self, date_key: str) -> None:
-        """Updates the managers."""
-        # Refresh ExpiryManager
-        self._refresh_tasks()
+        """Updates the managers, ExpiryManager is already re-scheduled."""
         # Refresh TaskManager
         self.task_manager.refresh_task_groups()
         # Update HomeScreen
         self.task_manager.update_home_after_changes(date_key)
         # Refresh ServiceExpiryManager
-        self.communication_manager.send_action(DM.ACTION.UPDATE_TASKS)
+        self.task_manager.notify_service_when_saved()
     
     def _connect_task_manager(self, task_manager: "TaskManager") -> None:
         """Connects the TaskManager to the ExpiryManager."""
@@ -1,14 +1,23 @@
-import time
+import heapq
 
-from datetime import datetime, timedelta
-from typing import Any, TYPE_CHECKING
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Iterator, TYPE_CHECKING
 
 from kivy.clock import Clock
 from kivy.event import EventDispatcher
 
 from managers.device.device_manager import DM
 from managers.tasks.task import Task, TaskGroup
+from managers.tasks.task_changeset import TaskChangeset
+from managers.tasks.task_day_index import TaskDayIndex
+from managers.tasks.task_group_list import TaskGroupList
+from managers.tasks.task_index import TaskIndex
+from managers.tasks.task_journal import TaskJournal
+from managers.tasks.task_recurrence import TaskRecurrence
 
+from src.utils.clock import WallClock
 from src.utils.wrappers import log_time
 from src.utils.logger import logger
 
@@ -32,7 +41,19 @@ class TaskManager(EventDispatcher):
         self.app: "TaskApp" = app
         self.navigation_manager: "NavigationManager" = app.navigation_manager
         self.expiry_manager: "AppExpiryManager" = app.expiry_manager
+        # Shared with AppExpiryManager
+        self.clock: WallClock = self.expiry_manager.clock
         self.communication_manager: "AppCommunicationManager" = None  # connected in main.py
+        # Shared with AppExpiryManager
+        self.task_index: TaskIndex = self.expiry_manager.task_index
+        # Days with Tasks, for the calendar and week navigator
+        self.task_days: TaskDayIndex = TaskDayIndex()
+        # TaskChangeLog version the TaskGroups are up to date with
+        self.change_version: tuple[int, int] | None = None
+        # Task changes collected by batch()
+        self._task_batch: TaskChangeset | None = None
+        self._task_batch_records: list[dict[str, Any]] = []
+        self._task_batch_date_key: str | None = None
 
         # Task file - validated by ExpiryManager
         self.task_file_path: str = DM.PATH.TASK_FILE
@@ -42,7 +63,7 @@ class TaskManager(EventDispatcher):
         self.expiry_manager._remove_old_task_groups()
 
         # Task groups
-        self.task_groups: list[TaskGroup] = self.get_task_groups()
+        self.task_groups: TaskGroupList = self.get_task_groups()
         self.current_task_group: TaskGroup | None = self.get_current_task_group()
         self.task_group_index: int
 
@@ -56,36 +77,45 @@ class TaskManager(EventDispatcher):
         Clock.schedule_interval(self.expiry_manager.check_task_expiry, 1)
     
     @log_time("get_task_groups")
-    def get_task_groups(self) -> list[TaskGroup]:
+    def get_task_groups(self) -> TaskGroupList:
         """
         Loads all Tasks from the last TASK_HISTORY_DAYS days, which are grouped by date.
-        Returns a list of sorted TaskGroup objects with sorted Tasks, earliest first.
+        Returns a TaskGroupList of sorted TaskGroup objects with sorted Tasks, earliest first.
         """
         try:
-            data = self.expiry_manager.get_task_data()
-            
+            # Changes after these versions are applied by the next refresh
+            store_version = self.expiry_manager.get_store_version()
+            self.change_version = self.expiry_manager.get_change_version()
             # Get earliest date to include
-            earliest_date = datetime.now().date() - timedelta(days=self.expiry_manager.TASK_HISTORY_DAYS)
+            earliest_date = self.clock.today() - timedelta(days=self.expiry_manager.TASK_HISTORY_DAYS)
+            # Only reads the TaskGroups in range
+            data = self.expiry_manager.get_task_data_since(earliest_date.isoformat())
             task_groups = self._extract_task_data(data,
                                                   earliest_date)
+            # Forget Tasks of TaskGroups that no longer exist
+            self.task_index.remove_groups_except(set(data.keys()), earliest_date.isoformat())
+            self.task_days.load(task_groups)
+            self.expiry_manager.set_synced_version(store_version)
             
-            # Sort by date
-            sorted_task_groups = sorted(task_groups, key=lambda x: x.date_str)
-            return sorted_task_groups
+            # Sorts by date
+            return TaskGroupList(task_groups)
         
         except Exception as e:
             logger.error(f"Error loading Task groups: {e}")
-            return []
+            return TaskGroupList()
     
     def _extract_task_data(self, data: dict[str, list[dict[str, Any]]], earliest_date: datetime) -> list[Task]:
-        """Extracts the Task data from the Task file."""
+        """
+        Extracts the Task data from the Task file.
+        Tasks are loaded through the TaskIndex, so known Tasks keep their object.
+        """
         task_groups = []
         for date_key, tasks_data in data.items():
             task_date = datetime.strptime(date_key, DM.DATE.DATE_KEY).date()
             # Only include dates in range
             if task_date >= earliest_date:
                 # Sort by effective time
-                tasks = [Task.to_class(task_data) for task_data in tasks_data]
+                tasks = self.task_index.load_group(date_key, tasks_data, complete=True)
                 sorted_tasks = sorted(tasks, key=lambda x: x.timestamp)
                 task_groups.append(TaskGroup(date_str=date_key, tasks=sorted_tasks))
         
@@ -103,21 +133,21 @@ class TaskManager(EventDispatcher):
 
         # Get nearest future TaskGroup
         if task is None:
-            for i, task_group in enumerate(self.task_groups):
-                if task_group.date_str >= datetime.now().date().isoformat():
-                    self.task_group_index = i
-                    return task_group
+            i = self.task_groups.index_on_or_after(self.clock.today().isoformat())
+            if i < len(self.task_groups):
+                self.task_group_index = i
+                return self.task_groups[i]
             # No upcoming TaskGroups
             self._set_welcome_task_group()
             self.task_group_index = 0
             return self.task_groups[0]
             
-        # Get Task's TaskGroup
+        # Get Task's TaskGroup, TaskGroups are never empty
         date_key = task.get_date_key()
-        for i, task_group in enumerate(self.task_groups):
-            if task_group.date_str >= date_key and task_group.tasks:
-                self.task_group_index = i
-                return task_group
+        i = self.task_groups.index_on_or_after(date_key)
+        if i < len(self.task_groups):
+            self.task_group_index = i
+            return self.task_groups[i]
         
         logger.critical(f"No TaskGroup found for date: {date_key}")
         return None
@@ -126,40 +156,43 @@ class TaskManager(EventDispatcher):
         """Sets the welcome TaskGroup in the TaskManager."""
         first_task = Task(
             message=TaskManager.FIRST_TASK_MESSAGE,
-            timestamp=datetime.now() - timedelta(minutes=1),
+            timestamp=self.clock.now() - timedelta(minutes=1),
             expired=True,
         )
         start_group = TaskGroup(date_str=first_task.get_date_key(),
                                 tasks=[first_task])
-        self.task_groups = [start_group]
+        self.task_groups = TaskGroupList([start_group])
+        self.task_index.add(first_task, start_group.date_str)
+        self.task_days.load(self.task_groups)
         self.save_task_groups()
     
     def add_task(self, message: str, timestamp: datetime,
-                 alarm_name: str, sound: str, vibrate: str) -> None:
+                 alarm_name: str, sound: str, vibrate: str,
+                 recurrence: TaskRecurrence | None = None) -> Task:
         """
         Adds Task to task_groups, saves the Task to file,
          dispatches an event to update the Task display and scroll to the Task.
+        A recurring Task is stored once, at its first occurrence on or after the timestamp.
         """
         task = Task(message=message, timestamp=timestamp,
                     alarm_name=alarm_name, sound=sound, vibrate=vibrate,
-                    snooze_time=0)
+                    snooze_time=0, recurrence=recurrence)
         
         # Round timestamp
         task.timestamp = task.timestamp.replace(second=0, microsecond=0)
+        if recurrence is not None:
+            first_occurrence = next(recurrence.occurrences(task.timestamp), None)
+            if first_occurrence is not None:
+                task.timestamp = first_occurrence
         
         # Add to TaskGroups
         self._add_to_task_groups(task)
-        self.save_task_groups()
+        self._record_task_change(task, task.get_date_key(), added=True)
         
-        # Refresh AppExpiryManager
-        self.expiry_manager._refresh_tasks()
-        # Update HomeScreen
-        self.update_home_after_changes(task.get_date_key())
-        # Refresh ServiceExpiryManager
-        self.communication_manager.send_action(DM.ACTION.UPDATE_TASKS)
-
-        Clock.schedule_once(lambda dt: self.app.get_screen(DM.SCREEN.HOME).scroll_to_task(task), 0.15)
+        if self._task_batch is None:
+            Clock.schedule_once(lambda dt: self.app.get_screen(DM.SCREEN.HOME).scroll_to_task(task), 0.15)
         logger.debug(f"Added Task: {DM.get_task_log(task)}")
+        return task
 
     def update_task(self, task_id: str, message: str, timestamp: datetime,
                     alarm_name: str, sound: str, vibrate: str) -> None:
@@ -173,17 +206,12 @@ class TaskManager(EventDispatcher):
             logger.error(f"Error updating Task, {DM.get_task_id_log(task_id)} not found")
             return
         
+        old_date_key = task.get_date_key()
         self._edit_task_in_groups(task, message, timestamp, alarm_name, sound, vibrate)
-        self.save_task_groups()
-        
-        # Refresh ExpiryManager
-        self.expiry_manager._refresh_tasks()
-        # Update HomeScreen
-        self.update_home_after_changes(task.get_date_key())
-        # Refresh ServiceExpiryManager
-        self.communication_manager.send_action(DM.ACTION.UPDATE_TASKS)
+        self._record_task_change(task, task.get_date_key(), old_date_key=old_date_key)
         
-        Clock.schedule_once(lambda dt: self.app.get_screen(DM.SCREEN.HOME).scroll_to_task(task), 0.15)
+        if self._task_batch is None:
+            Clock.schedule_once(lambda dt: self.app.get_screen(DM.SCREEN.HOME).scroll_to_task(task), 0.15)
         logger.debug(f"Updated Task: {DM.get_task_log(task)}")
 
     def delete_task(self, task_id: str) -> None:
@@ -193,32 +221,172 @@ class TaskManager(EventDispatcher):
          dispatches an event to update the Task display.
         """
         task = self.get_task_by_id(task_id)
-        date_key = task.get_date_key()
         if not task:
             logger.error(f"Error deleting Task, {DM.get_task_id_log(task_id)} not found")
             return
         
+        date_key = task.get_date_key()
+        
         # Scroll to old pos if TaskGroup is still displayed
-        self.scroll_to_old_pos()
+        if self._task_batch is None:
+            self.scroll_to_old_pos()
         
         # Remove from TaskGroups
         self._remove_from_task_groups(task)
-        self.save_task_groups()
+        self._record_task_change(task, date_key, removed=True)
+
+        logger.debug(f"Deleted Task: {DM.get_task_log(task)}")
+    
+    def cancel_occurrence(self, task_id: str, occurrence: datetime) -> None:
+        """
+        Cancels a single occurrence of a recurring Task, the other occurrences stay.
+        The current occurrence is cancelled through the ExpiryManager, which moves the Task to its next occurrence.
+        """
+        task = self.get_task_by_id(task_id)
+        if not task or task.recurrence is None:
+            logger.error(f"Error cancelling occurrence, {DM.get_task_id_log(task_id)} is not a recurring Task")
+            return
+        
+        if occurrence <= task.get_occurrence():
+            self.expiry_manager.cancel_task(task_id)
+            return
+        
+        task.set_override(occurrence, {"cancelled": True})
+        self._record_task_change(task, task.get_date_key())
+        logger.debug(f"Cancelled occurrence {occurrence} of Task: {DM.get_task_log(task)}")
+    
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Collects Task mutations and commits them together on exit:
+         one write of their journal records, one ExpiryManager refresh, one HomeScreen refresh
+         and one Service notification.
+        Nested batches commit with the outermost one.
+        """
+        if self._task_batch is not None:
+            yield
+            return
         
-        # Refresh ExpiryManager
-        self.expiry_manager._refresh_tasks()
+        self._task_batch = TaskChangeset()
+        self._task_batch_records = []
+        self._task_batch_date_key = None
+        try:
+            yield
+        finally:
+            changeset, records, date_key = self._task_batch, self._task_batch_records, self._task_batch_date_key
+            self._task_batch = None
+            self._task_batch_records = []
+            self._task_batch_date_key = None
+            # Mutations are already applied in memory, so they are saved even on errors
+            if changeset:
+                self._commit_task_changes(changeset, records, date_key)
+                logger.debug(f"Committed batch of {len(changeset)} Task changes")
+    
+    def _record_task_change(self, task: Task, date_key: str, old_date_key: str | None = None,
+                            added: bool = False, removed: bool = False) -> None:
+        """
+        Adds a Task change and its journal records to the current batch, or commits it directly outside of a batch.
+        old_date_key is the date key of an updated Task before its timestamp changed.
+        """
+        # The Task may have changed in place
+        task_group = self.task_groups.get(date_key)
+        if task_group is not None:
+            task_group.mark_dirty()
+        
+        changeset = self._task_batch if self._task_batch is not None else TaskChangeset()
+        records = self._task_batch_records if self._task_batch is not None else []
+        if removed:
+            changeset.removed.append((date_key, task.task_id))
+            records.append(TaskJournal.remove_record(date_key, task.task_id))
+        else:
+            task_json = task.to_json()
+            if added:
+                changeset.added.append((date_key, task_json))
+            elif old_date_key is not None and old_date_key != date_key:
+                changeset.moved.append((old_date_key, date_key, task_json))
+                # Stores only load the record's TaskGroup, so the old one needs its own record
+                records.append(TaskJournal.remove_record(old_date_key, task.task_id))
+            else:
+                changeset.updated.append((date_key, task_json))
+            records.append(TaskJournal.add_record(date_key, task_json))
+        
+        if self._task_batch is None:
+            self._commit_task_changes(changeset, records, date_key)
+        else:
+            self._task_batch_date_key = date_key
+    
+    def _commit_task_changes(self, changeset: TaskChangeset, records: list[dict[str, Any]], date_key: str) -> None:
+        """Saves the journal records and updates the ExpiryManager, HomeScreen and Service once."""
+        self.expiry_manager.save_task_records(records)
+        # Refresh AppExpiryManager
+        self.expiry_manager._refresh_changed_tasks(changeset)
         # Update HomeScreen
         self.update_home_after_changes(date_key)
         # Refresh ServiceExpiryManager
-        self.communication_manager.send_action(DM.ACTION.UPDATE_TASKS)
-
-        logger.debug(f"Deleted Task: {DM.get_task_log(task)}")
+        self.notify_service_when_saved()
+    
+    def delete_expired_tasks(self, date_key: str | None = None) -> int:
+        """
+        Deletes all expired Tasks, or only those of a TaskGroup if date_key is given.
+        Returns the number of deleted Tasks.
+        """
+        task_groups = [self.task_groups.get(date_key)] if date_key else list(self.task_groups)
+        expired_tasks = [task for task_group in task_groups if task_group for task in task_group.tasks
+                         if task.expired]
+        with self.batch():
+            for task in expired_tasks:
+                self.delete_task(task.task_id)
+        
+        return len(expired_tasks)
+    
+    def shift_task_group(self, date_key: str, minutes: int) -> int:
+        """
+        Moves all Tasks of a TaskGroup by a number of minutes, negative moves them earlier.
+        Returns the number of moved Tasks.
+        """
+        task_group = self.task_groups.get(date_key)
+        if task_group is None:
+            return 0
+        
+        tasks = list(task_group.tasks)
+        shift = timedelta(minutes=minutes)
+        with self.batch():
+            for task in tasks:
+                self.update_task(task.task_id, task.message, task.timestamp + shift,
+                                 task.alarm_name, task.sound, task.vibrate)
+        
+        return len(tasks)
+    
+    def duplicate_task_group(self, date_key: str, target_date: date) -> int:
+        """
+        Copies all Tasks of a TaskGroup to target_date, at the same times.
+        Times that are already taken on target_date are skipped.
+        Returns the number of copied Tasks.
+        """
+        task_group = self.task_groups.get(date_key)
+        if task_group is None:
+            return 0
+        
+        copied = 0
+        with self.batch():
+            for task in list(task_group.tasks):
+                timestamp = datetime.combine(target_date, task.timestamp.time())
+                # Not date_is_taken(), the Task being edited does not free its minute here
+                if self.get_task_by_timestamp(timestamp) is not None:
+                    logger.debug(f"Skipped duplicating Task {DM.get_task_id_log(task.task_id)}, "
+                                 f"{timestamp} is taken")
+                    continue
+                
+                self.add_task(task.message, timestamp, task.alarm_name, task.sound, task.vibrate)
+                copied += 1
+        
+        return copied
     
     def _edit_task_in_groups(self, task: Task, message: str, timestamp: datetime,
                             alarm_name: str, sound: str, vibrate: str) -> None:
         """
         Directly edits a Task's attributes in the TaskGroups.
-        Only moves the Task between groups if the date has changed.
+        Re-inserts the Task, which moves it to its sorted position and TaskGroup.
         """
         old_date_key = task.get_date_key()
         
@@ -231,7 +399,7 @@ class TaskManager(EventDispatcher):
         task.snooze_time = 0
 
         # Update expired state using rounded timestamps
-        group_now = datetime.now().replace(second=0, microsecond=0)
+        group_now = self.clock.now().replace(second=0, microsecond=0)
         group_now += timedelta(seconds=1)
         if timestamp > group_now and task.expired:
             # Task from past to future, -> not expired
@@ -240,79 +408,164 @@ class TaskManager(EventDispatcher):
             # Task from future to past, -> expired
             task.expired = True
         
-        new_date_key = task.get_date_key()
-        
-        # Only move task between groups if date has changed
-        if old_date_key != new_date_key:
-            self._remove_from_task_groups(task)
-            self._add_to_task_groups(task)
+        # Re-insert to keep the TaskGroups sorted, the date may have changed
+        self._remove_from_task_groups(task, old_date_key)
+        self._add_to_task_groups(task)
     
-    def save_task_groups(self) -> None:
+    def save_task_groups(self) -> Future | None:
         """
-        Saves the Task groups to the file.
+        Queues the Task groups to be saved to the file.
+        Returns a Future that resolves once the file is written.
         """
         try:
-            # Format TaskGroups
+            # Changes of the Service since the synced version are kept on commit
+            base_version = self.expiry_manager.synced_version
+            # Format TaskGroups, only changed TaskGroups are serialized again
             tasks_json = {}
+            fragments = {} if self.expiry_manager.task_store.JSON_FRAGMENTS else None
             for task_group in self.task_groups:
-                tasks_json[task_group.date_str] = [task.to_json() for task in task_group.tasks]
+                tasks_json[task_group.date_str] = task_group.get_tasks_json()
+                if fragments is not None:
+                    fragments[task_group.date_str] = task_group.get_fragment()
             
-            self.expiry_manager.save_task_file(tasks_json)
-            time.sleep(0.1)
+            return self.expiry_manager.save_task_file(tasks_json, fragments, base_version)
         
         except Exception as e:
             logger.error(f"Error saving Task groups: {e}")
+            return None
+    
+    def notify_service_when_saved(self) -> None:
+        """
+        Sends UPDATE_TASKS to the Service once all queued writes are on disk,
+         so the Service never re-loads a Task file that is still being written.
+        """
+        self.expiry_manager.on_task_file_flushed(
+            lambda: Clock.schedule_once(lambda dt: self.communication_manager.send_action(DM.ACTION.UPDATE_TASKS), 0)
+        )
     
     def _add_to_task_groups(self, task: Task) -> None:
         """
-        Adds a Task to the TaskGroups.
+        Adds a Task to the TaskGroups and the TaskIndex.
+        The TaskGroup and the Task are inserted at their sorted position.
         """
-        date_key = task.get_date_key()
-        for task_group in self.task_groups:
-            if task_group.date_str == date_key:
-                task_group.tasks.append(task)
-                break
-        else:
-            self.task_groups.append(TaskGroup(date_str=date_key, tasks=[task]))
+        task_group, _ = self.task_groups.insert_task(task)
+        task_group.mark_dirty()
+        self.task_index.add(task, task_group.date_str)
+        self.task_days.add(task_group.date_str)
     
-    def _remove_from_task_groups(self, task: Task) -> None:
+    def _remove_from_task_groups(self, task: Task, date_key: str | None = None) -> None:
         """
-        Removes a Task from the TaskGroups.
+        Removes a Task from the TaskGroups and the TaskIndex.
+        Looks in the indexed TaskGroup, then in the given date_key's, as the Task's timestamp may already be edited.
         If the last task is removed from a group, the entire group is removed.
         """
-        date_key = task.get_date_key()
-        for i, task_group in enumerate(self.task_groups):
-            if task_group.date_str == date_key:
-                # Find Task by ID
-                for j, group_task in enumerate(task_group.tasks):
-                    if group_task.task_id == task.task_id:
-                        task_group.tasks.pop(j)
-                        
-                        # If last Task in group, remove it
-                        if not task_group.tasks:
-                            self.task_groups.pop(i)
-                        
-                        return
-                break
-        else:
-            logger.error(f"Error removing Task from TaskGroups, {DM.get_task_log(task)} not found")
+        entry = self.task_index.get_entry(task.task_id)
+        self.task_index.remove(task.task_id)
+
+        date_keys = [entry[0]] if entry else []
+        date_keys.append(date_key if date_key else task.get_date_key())
+        for candidate_date_key in date_keys:
+            task_group = self.task_groups.get(candidate_date_key)
+            if task_group is None:
+                continue
+            
+            position = self._find_task_position(task_group.tasks, task.task_id)
+            if position != -1:
+                self._pop_from_task_group(task_group, position)
+                return
+        
+        # Not where it was indexed or dated, should not happen
+        for task_group in self.task_groups:
+            position = self._find_task_position(task_group.tasks, task.task_id)
+            if position != -1:
+                self._pop_from_task_group(task_group, position)
+                return
+        
+        logger.error(f"Error removing Task from TaskGroups, {DM.get_task_log(task)} not found")
+    
+    @staticmethod
+    def _find_task_position(tasks: list[Task], task_id: str) -> int:
+        """Returns the position of a Task in a TaskGroup by ID, or -1."""
+        return next((i for i, task in enumerate(tasks) if task.task_id == task_id), -1)
+    
+    def _pop_from_task_group(self, task_group: TaskGroup, position: int) -> None:
+        """Removes a Task from a TaskGroup, and the TaskGroup if it was the last Task."""
+        tasks = task_group.tasks
+        tasks.pop(position)
+        task_group.mark_dirty()
+        self.task_days.remove(task_group.date_str)
+        # If last Task in group, remove it
+        if not tasks:
+            self.task_groups.remove(task_group.date_str)
     
-    def refresh_task_groups(self) -> None:
+    def refresh_task_groups(self) -> TaskChangeset | None:
         """
         Refreshes the Task groups.
+        Applies the Task changes since the last refresh, re-loads all TaskGroups if that is not possible.
+        Returns the applied TaskChangeset, or None after a full re-load.
         """
+        changeset = self.apply_task_changes()
+        if changeset is not None:
+            return changeset
+        
         logger.critical("Refreshing Task groups")
         self.task_groups = self.get_task_groups()
+        return None
+    
+    def apply_task_changes(self) -> TaskChangeset | None:
+        """
+        Applies the Task changes since change_version to the TaskGroups in place.
+        Returns None on a version mismatch or if a change touches an unknown Task.
+        """
+        try:
+            store_version = self.expiry_manager.get_store_version()
+            result = self.expiry_manager.get_task_changes(self.change_version)
+            if result is None:
+                return None
+            
+            version, records = result
+            changeset = TaskChangeset.from_records(records, self.task_index)
+            if not changeset.is_complete:
+                return None
+            
+            for _, task_id in changeset.removed:
+                task = self.task_index.get(task_id)
+                if task is not None:
+                    self._remove_from_task_groups(task)
+            
+            earliest_date_key = (self.clock.today() - 
+                                 timedelta(days=self.expiry_manager.TASK_HISTORY_DAYS)).isoformat()
+            changes = [(date_key, task_json) for _, date_key, task_json in changeset.moved]
+            for date_key, task_json in changes + changeset.updated + changeset.added:
+                self._apply_task_change(date_key, task_json, earliest_date_key)
+            
+            self.change_version = version
+            self.expiry_manager.set_synced_version(store_version)
+            if changeset:
+                logger.debug(f"Applied {len(changeset)} Task changes")
+            return changeset
+        
+        except Exception as e:
+            logger.error(f"Error applying Task changes: {e}")
+            return None
+    
+    def _apply_task_change(self, date_key: str, task_json: dict[str, Any], earliest_date_key: str) -> None:
+        """Re-inserts a changed Task at its sorted position, Tasks before the TaskGroup range are left out."""
+        task = self.task_index.get(task_json["task_id"])
+        if task is None:
+            task = Task.to_class(task_json)
+        else:
+            self._remove_from_task_groups(task)
+            task.update_from_json(task_json)
+        
+        if date_key >= earliest_date_key:
+            self._add_to_task_groups(task)
     
     def get_prev_task_group(self) -> TaskGroup | None:
         """
         Gets the previous TaskGroup.
         """
-        for i, task_group in enumerate(self.task_groups):
-            if task_group.date_str == self.current_task_group.date_str:
-                if i > 0:
-                    return self.task_groups[i - 1]
-        return None
+        return self.task_groups.get_prev(self.current_task_group.date_str)
     
     def go_to_prev_task_group(self) -> None:
         """
@@ -328,10 +581,7 @@ class TaskManager(EventDispatcher):
         """
         Gets the next TaskGroup.
         """
-        for task_group in self.task_groups:
-            if task_group.date_str > self.current_task_group.date_str:
-                return task_group
-        return None
+        return self.task_groups.get_next(self.current_task_group.date_str)
     
     def go_to_next_task_group(self) -> TaskGroup | None:
         """
@@ -347,74 +597,118 @@ class TaskManager(EventDispatcher):
         """
         Updates the current TaskGroup and refreshes the HomeScreen to display the correct TaskGroup.
         """
-        found = False
-        for i, task_group in enumerate(self.task_groups):
-            if task_group.date_str == date_key:
-                self.current_task_group = task_group
-                self.task_group_index = i
-                found = True
-                break
-        
-        if not found:
+        i = self.task_groups.index(date_key)
+        if i != -1:
+            self.current_task_group = self.task_groups[i]
+            self.task_group_index = i
+        else:
             self.current_task_group = self.get_current_task_group()
         
         self.app.get_screen(DM.SCREEN.HOME).refresh_home_screen()
     
+    def get_history_start(self) -> date:
+        """Returns the first day of the TASK_HISTORY_DAYS window, earlier days are archived."""
+        return self.clock.today() - timedelta(days=self.expiry_manager.TASK_HISTORY_DAYS)
+    
+    def get_occurrences(self, start: datetime, end: datetime) -> Iterator[tuple[datetime, Task]]:
+        """
+        Yields (timestamp, Task) for all Tasks due from start up to end, in time order.
+        Recurring Tasks are expanded for this range only.
+        """
+        single_tasks = ((task.timestamp, task) for task in self.task_index.range(start, end)
+                        if task.recurrence is None)
+        occurrences = [((timestamp, task) for timestamp in task.get_occurrences(start, end))
+                       for task in self.task_index.get_recurring()]
+        return heapq.merge(single_tasks, *occurrences, key=lambda occurrence: occurrence[0])
+    
+    def _has_occurrences(self, start: date, end: date) -> bool:
+        """Returns True if a recurring Task is due on any day from start to end, both included."""
+        start_time = datetime.combine(start, datetime.min.time())
+        end_time = datetime.combine(end + timedelta(days=1), datetime.min.time())
+        return any(next(task.get_occurrences(start_time, end_time), None) is not None
+                   for task in self.task_index.get_recurring())
+    
+    def get_month_mask(self, year: int, month: int) -> int:
+        """Returns the bitmask of the days with Tasks in a month, including occurrences of recurring Tasks."""
+        mask = self.task_days.get_month_mask(year, month)
+        recurring_tasks = self.task_index.get_recurring()
+        if recurring_tasks:
+            start = datetime(year, month, 1)
+            end = datetime(year + month // 12, month % 12 + 1, 1)
+            for task in recurring_tasks:
+                for timestamp in task.get_occurrences(start, end):
+                    mask |= 1 << (timestamp.day - 1)
+        return mask
+    
+    def has_tasks_on(self, day: date) -> bool:
+        """Returns True if the day has Tasks, loading the archived month for days before the history window."""
+        if self.task_days.has_tasks(day) or self._has_occurrences(day, day):
+            return True
+        return day < self.get_history_start() and self.expiry_manager.task_archive.has_tasks(day)
+    
+    def has_tasks_between(self, start: date, end: date) -> bool:
+        """Returns True if any day from start to end, both included, has Tasks."""
+        if self.task_days.has_tasks_between(start, end) or self._has_occurrences(start, end):
+            return True
+        
+        history_start = self.get_history_start()
+        day = start
+        while day <= end and day < history_start:
+            if self.expiry_manager.task_archive.has_tasks(day):
+                return True
+            day += timedelta(days=1)
+        return False
+    
+    def get_archived_task_group(self, day: date) -> TaskGroup | None:
+        """
+        Returns a read-only TaskGroup of archived Tasks, or None.
+        Its Tasks are not indexed, so they cannot be edited.
+        """
+        tasks_data = self.expiry_manager.task_archive.get_task_group_data(day)
+        if not tasks_data:
+            return None
+        
+        tasks = sorted((Task.to_class(task_data) for task_data in tasks_data), key=lambda task: task.timestamp)
+        return TaskGroup(date_str=day.isoformat(), tasks=tasks)
+    
     def get_task_by_id(self, task_id: str) -> Task | None:
         """
-        Gets a Task by its ID.
+        Gets a Task by its ID from the TaskIndex.
+        Only returns Tasks that are in the TaskGroups, the TaskIndex is shared with the ExpiryManager.
         """
-        for task_group in self.task_groups:
-            for task in task_group.tasks:
-                if task.task_id == task_id:
-                    return task
+        entry = self.task_index.get_entry(task_id)
+        if entry is None:
+            return None
         
-        return None
+        date_key, task = entry
+        task_group = self.task_groups.get(date_key)
+        if task_group is None or self._find_task_position(task_group.tasks, task_id) == -1:
+            return None
+        return task
     
     def get_task_by_timestamp(self, target_datetime: datetime) -> Task | None:
         """
         Get a Task object by its timestamp.
         Compares hours and minutes, ignoring seconds and microseconds.
         """
-        target_date_key = target_datetime.strftime(DM.DATE.DATE_KEY)
-        target_time = target_datetime.time()
-        
-        # Find TaskGroup for this date
-        for task_group in self.task_groups:
-            if task_group.date_str == target_date_key:
-                # Check for match
-                for task in task_group.tasks:
-                    hour = task.timestamp.time().hour
-                    minute = task.timestamp.time().minute
-                    if hour == target_time.hour and minute == target_time.minute:
-                        return task
-                break
-        
-        return None
+        # Tasks are in time order, the first is the earliest
+        return next(self._get_minute_tasks(target_datetime), None)
     
     def date_is_taken(self, target_datetime: datetime) -> bool:
         """
         Check if a date and time is taken by any Task.
         Compares hours and minutes, ignoring seconds and microseconds.
         """
-        target_date_key = target_datetime.strftime(DM.DATE.DATE_KEY)
-        target_time = target_datetime.time()
-        
-        # Find the TaskGroup for this date
-        for task_group in self.task_groups:
-            if task_group.date_str == target_date_key:
-                # Check if conflict
-                for task in task_group.tasks:
-                    if task == self.task_to_edit:
-                        continue
-
-                    hour = task.timestamp.time().hour
-                    minute = task.timestamp.time().minute
-                    if hour == target_time.hour and minute == target_time.minute:
-                        return True
-                break
-        
-        return False
+        return any(task != self.task_to_edit for task in self._get_minute_tasks(target_datetime))
+    
+    def _get_minute_tasks(self, target_datetime: datetime) -> Iterator[Task]:
+        """
+        Yields the Tasks in the same minute as target_datetime, ignoring seconds and microseconds.
+        Only yields Tasks that are in the TaskGroups, the TaskIndex is shared with the ExpiryManager.
+        """
+        minute = target_datetime.replace(second=0, microsecond=0)
+        return (task for task in self.task_index.range(minute, minute + timedelta(minutes=1))
+                if self.get_task_by_id(task.task_id) is task)
 
     def scroll_to_old_pos(self) -> None:
         """
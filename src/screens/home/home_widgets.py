@@ -135,14 +135,7 @@ class TaskNavigator(BoxLayout):
     def _update_date_label_color(self, week_start) -> None:
         """Updates the date label color based on whether the week has Tasks."""
         # Check if any day in the week has tasks
-        has_tasks_in_week = False
-        for i in range(7):
-            day_date = week_start + timedelta(days=i)
-            day_key = day_date.isoformat()
-            if any(task_group.date_str == day_key for task_group in self.task_manager.task_groups):
-                has_tasks_in_week = True
-                break
-        
+        has_tasks_in_week = self.task_manager.has_tasks_between(week_start, week_start + timedelta(days=6))
         if has_tasks_in_week:
             self.date_label.color = COL.TEXT
         else:
@@ -189,7 +182,6 @@ class TaskNavigator(BoxLayout):
         # Generate day labels for week
         for i in range(7):
             day_date = week_start + timedelta(days=i)
-            day_key = day_date.isoformat()
             
             day_label = DateTimeLabel(
                 text=str(day_date.day),
@@ -197,7 +189,8 @@ class TaskNavigator(BoxLayout):
             )
 
             # Check if day has Tasks
-            has_tasks = any(task_group.date_str == day_key for task_group in self.task_manager.task_groups)
+            # Archived weeks are loaded on demand
+            has_tasks = self.task_manager.has_tasks_on(day_date)
             # Current day
             if day_date == current_date:
                 day_label.set_current_day(True)
@@ -220,20 +213,21 @@ class TaskNavigator(BoxLayout):
         """Handle day button click."""        
         # Find TaskGroup for this day
         day_key = day_date.isoformat()
-        clicked_task_group = None
-        for task_group in self.task_manager.task_groups:
-            if task_group.date_str == day_key:
-                clicked_task_group = task_group
-                break
-        
-        # Check if its already displayed
-        if clicked_task_group == self.task_manager.current_task_group:
+        clicked_task_group = self.task_manager.task_groups.get(day_key)
+        if clicked_task_group is None:
+            clicked_task_group = self.task_manager.get_archived_task_group(day_date)
+        if clicked_task_group is None:
+            return
+        
+        # Check if its already displayed, archived TaskGroups are new objects
+        if clicked_task_group.date_str == self.task_manager.current_task_group.date_str:
             return
         
         # Scroll to top
         self.task_manager.app.get_screen(DM.SCREEN.HOME).scroll_container.scroll_view.scroll_y = 1.0
         # Update TaskManager
         self.task_manager.current_task_group = clicked_task_group
+        self.task_manager.task_group_index = self.task_manager.task_groups.index(day_key)
         self.task_manager.app.get_screen(DM.SCREEN.HOME).refresh_home_screen()
     
     def _setup_day_labels(self) -> None:
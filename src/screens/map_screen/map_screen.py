@@ -7,6 +7,7 @@ from src.screens.base.base_screen import BaseScreen
 from .map_screen_utils import MapScreenUtils, MapScreenState, MAP_BUTTON_STATES
 
 from managers.device.device_manager import DM
+from managers.device.status_page import STATUS_PAGE, StatusPage
 from src.utils.wrappers import android_only
 from src.utils.logger import logger
 
@@ -221,7 +222,14 @@ class MapScreen(BaseScreen, MapScreenUtils):
             self._request_location_from_service()
 
     def _is_gps_tracking_active(self) -> bool:
-        """Check if GPS tracking is currently active by checking GPS file."""
+        """
+        Check if GPS tracking is currently active by checking the Service's GPS state on the StatusPage.
+        Checks the GPS file if the StatusPage is not available.
+        """
+        status = STATUS_PAGE.read(StatusPage.SECTION_SERVICE)
+        if status is not None:
+            return status["gps_state"] == StatusPage.GPS_MONITORING
+        
         try:
             with open(DM.PATH.GPS_FILE, "r") as f:
                 data = json.load(f)
@@ -231,11 +239,14 @@ class MapScreen(BaseScreen, MapScreenUtils):
             return False
 
     def _get_location_from_file(self) -> None:
-        """Try to get current location from GPS file."""
+        """Try to get current location from the StatusPage, or from GPS file if the StatusPage is not available."""
         try:
-            with open(DM.PATH.GPS_FILE, "r") as f:
-                data = json.load(f)
-                current_location = data.get("current_location")
+            if STATUS_PAGE.read(StatusPage.SECTION_SERVICE) is not None:
+                current_location = STATUS_PAGE.get_location()
+            else:
+                with open(DM.PATH.GPS_FILE, "r") as f:
+                    data = json.load(f)
+                    current_location = data.get("current_location")
                 
             if current_location and len(current_location) == 2:
                 lat, lon = current_location
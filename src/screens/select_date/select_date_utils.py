@@ -1,5 +1,5 @@
 import calendar
-from datetime import date, datetime
+from datetime import datetime
 
 from kivy.graphics import Rectangle
 from kivy.uix.label import Label
@@ -51,6 +51,9 @@ class SelectDateUtils:
             if all(day == 0 for day in last_week):
                 cal = cal[:-1] 
 
+        # Days with Tasks, bit (day - 1) is set if the day has Tasks
+        month_mask = self.task_manager.get_month_mask(self.current_year, self.current_month)
+        
         # Add day buttons
         for week in cal:
             for day in week:
@@ -63,9 +66,8 @@ class SelectDateUtils:
                     )
                     self.calendar_grid.add_widget(empty_label)
                 else:
-                    # Check if this day has any tasks using task_groups
-                    date_key = date(self.current_year, self.current_month, day).isoformat()
-                    has_tasks = any(task_group.date_str == date_key for task_group in self.task_manager.task_groups)
+                    # Check if this day has any tasks
+                    has_tasks = bool(month_mask >> (day - 1) & 1)
                     
                     # Check if this is the current day
                     is_current_day = (day == datetime.now().day and 
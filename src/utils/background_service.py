@@ -2,12 +2,20 @@ import os
 import time
 
 from managers.device.device_manager import DM
+from managers.device.status_page import STATUS_PAGE, StatusPage
 from src.utils.wrappers import android_only
 
 
 @android_only
 def is_service_running():
-    """Returns True if the last Service heartbeat is < HEARTBEAT_SEDCONDS."""
+    """
+    Returns True if the last Service heartbeat is < HEARTBEAT_SEDCONDS.
+    Reads the heartbeat from the StatusPage, or from the heartbeat flag file if the StatusPage is not available.
+    """
+    status = STATUS_PAGE.read(StatusPage.SECTION_SERVICE)
+    if status is not None:
+        return (time.time() - status["heartbeat"]) <= DM.SETTINGS.HEARTBEAT_SEDCONDS
+    
     try:
         # Check if heartbeat file exists
         if not os.path.exists(DM.PATH.SERVICE_HEARTBEAT_FLAG):
@@ -23,14 +31,22 @@ def is_service_running():
         # Check if heartbeat is recent
         timestamp = int(content)
         current_time = int(time.time())
-        # return (current_time - timestamp) <= DM.SETTINGS.HEARTBEAT_SEDCONDS
-        return (current_time - timestamp) <= 10
+        return (current_time - timestamp) <= DM.SETTINGS.HEARTBEAT_SEDCONDS
         
     except Exception as e:
         print(f"     Error checking service heartbeat: {str(e)}")
         return False
 
 
+@android_only
+def publish_app_state(in_foreground: bool) -> None:
+    """
+    Publishes the App's foreground state on the StatusPage for the Service.
+    The time is refreshed on every call, so the Service can tell a foreground App that died.
+    """
+    STATUS_PAGE.update(StatusPage.SECTION_APP, foreground=int(in_foreground), state_time=time.time())
+
+
 @android_only
 def start_background_service():
     """Start background service if not already running."""
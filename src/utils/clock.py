@@ -0,0 +1,79 @@
+import heapq
+import threading
+import time
+
+from datetime import date, datetime
+from typing import Callable
+
+
+class WallClock:
+    """
+    Source of the current time for the expiry and Service logic.
+    - Managers take a clock, so a simulation can replace it with a VirtualClock.
+    - wait_for() sleeps on a Condition until its predicate holds or a deadline [epoch seconds] passes.
+    """
+    def time(self) -> float:
+        """Returns the current time in epoch seconds."""
+        return time.time()
+
+    def now(self) -> datetime:
+        """Returns the current local time."""
+        return datetime.now()
+
+    def today(self) -> date:
+        """Returns the current local date."""
+        return self.now().date()
+
+    def wait_for(self, condition: threading.Condition, predicate: Callable[[], bool], deadline: float) -> bool:
+        """Waits until the predicate holds or the deadline passed, must hold the condition. Returns the predicate."""
+        return condition.wait_for(predicate, timeout=max(0.0, deadline - self.time()))
+
+
+class VirtualClock(WallClock):
+    """
+    Clock that only moves when advanced, for simulations.
+    - wait_for() jumps to the deadline instead of sleeping.
+    - Callbacks scheduled with call_at() run when time passes them.
+      This is how simulated events, like a user snoozing a Task, wake a waiting loop.
+    """
+    def __init__(self, start: datetime):
+        self._time: float = start.timestamp()
+        self._timers: list[tuple[float, int, Callable[[], None]]] = []
+        self._counter: int = 0
+
+    def time(self) -> float:
+        return self._time
+
+    def now(self) -> datetime:
+        return datetime.fromtimestamp(self._time)
+
+    def call_at(self, timestamp: float, callback: Callable[[], None]) -> None:
+        """Schedules a callback to run once time reaches the timestamp [epoch seconds]."""
+        self._counter += 1
+        heapq.heappush(self._timers, (timestamp, self._counter, callback))
+
+    def advance_to(self, timestamp: float) -> None:
+        """Moves time forward to the timestamp, running the callbacks scheduled up to it."""
+        while self._timers and self._timers[0][0] <= timestamp:
+            self._run_next_timer()
+        self._time = max(self._time, timestamp)
+
+    def advance(self, seconds: float) -> None:
+        """Moves time forward by seconds."""
+        self.advance_to(self._time + seconds)
+
+    def wait_for(self, condition: threading.Condition, predicate: Callable[[], bool], deadline: float) -> bool:
+        while not predicate():
+            if not self._timers or self._timers[0][0] > deadline:
+                self._time = max(self._time, deadline)
+                return predicate()
+            self._run_next_timer()
+        return True
+
+    def _run_next_timer(self) -> None:
+        timestamp, _, callback = heapq.heappop(self._timers)
+        self._time = max(self._time, timestamp)
+        callback()
+
+
+WALL_CLOCK = WallClock()